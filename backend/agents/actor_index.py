@@ -0,0 +1,162 @@
+import os
+import logging
+import argparse
+import threading
+import numpy as np
+from agents.catalog import normalize_name
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # pure-Python fallback, much slower on large lists
+    from fuzzywuzzy import fuzz
+
+logger = logging.getLogger("actor_index")
+
+# Known people shared by the analyzer (names mentioned in free text) and the IR
+# agent (typo correction before the TMDB/catalog lookup). One name per line;
+# `python -m agents.actor_index export` extends it from the local catalog.
+ACTORS_FILE = os.getenv(
+    "ACTORS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "known_actors.txt"),
+)
+
+CANDIDATES = 50           # names scored in full per lookup, picked by trigram overlap
+TEXT_MIN_OVERLAP = 0.5    # share of a name's trigrams that must occur in the text
+
+
+def trigrams(s: str) -> set:
+    s = f" {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def load_names(path: str = ACTORS_FILE) -> list:
+    if not os.path.exists(path):
+        logger.warning(f"Actor list {path} not found, fuzzy name matching disabled.")
+        return []
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+
+
+#  Trigram index
+
+class ActorIndex:
+    """
+    Fuzzy person-name index. A trigram inverted index picks a few candidate
+    names per lookup; only those are scored with fuzz (rapidfuzz when
+    installed), so lookups stay fast with tens of thousands of names.
+    """
+
+    def __init__(self, names: list):
+        self.names = list(names)
+        self.norm = [normalize_name(n) for n in self.names]
+        postings = {}
+        sizes = []
+        for i, n in enumerate(self.norm):
+            grams = trigrams(n)
+            sizes.append(len(grams))
+            for g in grams:
+                postings.setdefault(g, []).append(i)
+        self._postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._sizes = np.array(sizes, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _overlap(self, grams: set) -> np.ndarray:
+        """Shared-trigram count for every name."""
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if not hits:
+            return np.zeros(len(self.names), dtype=np.int64)
+        return np.bincount(np.concatenate(hits), minlength=len(self.names))
+
+    def resolve(self, name: str, threshold: float = 70):
+        """Best known name for a (possibly misspelt or partial) name, or None below threshold."""
+        if not self.names:
+            return None
+        query = normalize_name(name)
+        counts = self._overlap(trigrams(query))
+        nonzero = np.count_nonzero(counts)
+        if not nonzero:
+            return None
+        top = min(CANDIDATES, nonzero)
+        cands = np.argpartition(-counts, top - 1)[:top]
+        cands = cands[np.lexsort((cands, -counts[cands]))]  # most overlap first, then list order
+
+        best, best_key = None, (threshold, -1)
+        for i in cands:
+            key = (fuzz.partial_ratio(query, self.norm[i]), fuzz.ratio(query, self.norm[i]))
+            if key[0] >= threshold and key > best_key:
+                best, best_key = self.names[i], key
+        return best
+
+    def find_in_text(self, text: str, threshold: float = 87) -> list:
+        """Known names that appear (fuzzily) in free text."""
+        if not self.names:
+            return []
+        low = normalize_name(text)
+        counts = self._overlap(trigrams(low))
+        cands = np.nonzero(counts / np.maximum(self._sizes, 1) >= TEXT_MIN_OVERLAP)[0]
+        return [self.names[i] for i in cands if fuzz.partial_ratio(self.norm[i], low) > threshold]
+
+    @staticmethod
+    def dedupe(names, threshold: float = 85) -> list:
+        """Drop names that are near-duplicates of an earlier one (in sorted order)."""
+        kept, kept_norm = [], []
+        for name in sorted(names):
+            n = normalize_name(name)
+            if not any(fuzz.ratio(n, k) > threshold for k in kept_norm):
+                kept.append(name)
+                kept_norm.append(n)
+        return kept
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_actor_index() -> ActorIndex:
+    """Shared ActorIndex built from ACTORS_FILE on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ActorIndex(load_names())
+                logger.info(f"✅ Loaded {len(_index)} known people from {ACTORS_FILE}")
+    return _index
+
+
+def reload_actor_index():
+    global _index
+    with _index_lock:
+        _index = ActorIndex(load_names())
+    return _index
+
+
+#  CLI: python -m agents.actor_index export --min-movies 3
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Manage the known-people list used for name matching")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="Add catalog cast members to the actor list")
+    export.add_argument("--db", default=None, help="Catalog DB (default: CATALOG_PATH)")
+    export.add_argument("--min-movies", type=int, default=3)
+    export.add_argument("--out", default=ACTORS_FILE)
+    match = sub.add_parser("match", help="Resolve a name against the list")
+    match.add_argument("name")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        from agents.catalog import MovieCatalog, CATALOG_PATH
+        names = load_names(args.out)
+        names += MovieCatalog(args.db or CATALOG_PATH).person_names(args.min_movies)
+        names = list(dict.fromkeys(names))
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write("# Known people for fuzzy name correction, one per line.\n"
+                    "# Extend from the catalog with: python -m agents.actor_index export\n")
+            f.write("\n".join(names) + "\n")
+        print(f"✅ Wrote {len(names)} names to {args.out}")
+    else:
+        print(get_actor_index().resolve(args.name))
@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import queue
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+from agents.metrics import track_cache, track_singleflight
+from agents.singleflight import SingleFlight
+
+logger = logging.getLogger("cache")
+
+
+#  Generic TTL + LRU cache
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with per-entry TTL and size-bounded LRU eviction.
+
+    If `path` is given, entries are also written through to a SQLite file so
+    they survive restarts and can be shared between workers. Values must be
+    JSON-serialisable when a disk backing is used. Disk I/O never runs under
+    the lock: writes are queued to a writer thread (one commit per drained
+    batch) and reads use a per-thread connection on the WAL-mode file.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, path: str = None, name: str = "cache"):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db = None  # writer connection, used only by the writer thread after setup
+        self._path = path
+        self._readers = threading.local()
+        self._writes = queue.Queue()  # (key, expires_at, json) or None for "clear"
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")  # readers don't wait for the writer
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+            )
+            self._db.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            self._db.commit()
+            threading.Thread(target=self._write_loop, name=f"{self.name}-cache-writer", daemon=True).start()
+            logger.info(f"{self.name}: using on-disk backing at {path}")
+        except Exception as e:
+            logger.error(f"{self.name}: could not open disk cache {path}: {e}")
+            self._db = None
+
+    def _read(self, key: str):
+        """(expires_at, value_json) from disk, or None."""
+        try:
+            conn = getattr(self._readers, "conn", None)
+            if conn is None:
+                conn = self._readers.conn = sqlite3.connect(self._path)
+            return conn.execute("SELECT expires_at, value FROM cache WHERE key = ?", (key,)).fetchone()
+        except Exception as e:
+            logger.warning(f"{self.name}: disk read failed for {key}: {e}")
+            return None
+
+    def _write_loop(self):
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < 256:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                for op in batch:
+                    if op is None:
+                        self._db.execute("DELETE FROM cache")
+                    else:
+                        self._db.execute("INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)", op)
+                self._db.commit()
+            except Exception as e:
+                logger.warning(f"{self.name}: disk write of {len(batch)} entries failed: {e}")
+            finally:
+                for _ in batch:
+                    self._writes.task_done()
+
+    def flush(self):
+        """Block until every queued disk write is committed."""
+        if self._db is not None:
+            self._writes.join()
+
+    def get(self, key: str, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > now:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._data[key]
+            if self._db is None:
+                self.misses += 1
+                return default
+
+        row = self._read(key)
+        if row and row[0] > now:
+            value = json.loads(row[1])
+            with self._lock:
+                self._store(key, value, row[0])
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value, ttl: float = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, value, expires_at)
+        if self._db is not None:
+            try:
+                # serialised now, so later changes to `value` don't reach the disk copy
+                self._writes.put((key, expires_at, json.dumps(value)))
+            except Exception as e:
+                logger.warning(f"{self.name}: disk write failed for {key}: {e}")
+
+    def _store(self, key, value, expires_at):
+        # caller holds the lock
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_set(self, key: str, loader, ttl: float = None):
+        """Return the cached value, or call `loader()` and cache its result (unless None)."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        value = loader()
+        if value is not None:
+            self.set(key, value, ttl)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+        if self._db is not None:
+            self._writes.put(None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+                "disk": self._db is not None,
+            }
+
+
+def make_key(endpoint: str, params: dict = None) -> str:
+    """Stable cache key from an endpoint path and its query params (API key excluded)."""
+    params = {k: v for k, v in (params or {}).items() if k != "api_key"}
+    return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+
+#  Shared TMDB response cache
+
+# Per-endpoint TTLs in seconds. Person IDs and runtimes practically never
+# change; search results and popular lists drift faster.
+TMDB_CACHE_TTLS = {
+    "search/person": 7 * 24 * 3600,
+    "person/movie_credits": 24 * 3600,
+    "search/movie": 6 * 3600,
+    "discover/movie": 6 * 3600,
+    "movie": 7 * 24 * 3600,
+    "movie/popular": 3600,
+    "trending/movie": 3600,
+}
+
+tmdb_cache = track_cache(TTLCache(
+    maxsize=int(os.getenv("TMDB_CACHE_SIZE", "4096")),
+    ttl=3600,
+    path=os.getenv("TMDB_CACHE_PATH"),
+    name="tmdb",
+))
+
+# Concurrent misses on the same key share one upstream request
+tmdb_flight = track_singleflight(SingleFlight("tmdb"))
+
+
+def tmdb_cached(endpoint: str, path: str, params: dict, fetch):
+    """
+    Return the TMDB response for `path` + `params` from the shared cache,
+    calling `fetch()` on a miss. `endpoint` is the path template used to pick
+    the TTL (e.g. "movie" for /movie/{id}).
+    """
+    key = make_key(path, params)
+    sentinel = object()
+    value = tmdb_cache.get(key, sentinel)
+    if value is not sentinel:
+        return value
+
+    def load():
+        value = fetch()
+        if value is not None:
+            tmdb_cache.set(key, value, ttl=TMDB_CACHE_TTLS.get(endpoint))
+        return value
+    return tmdb_flight.do(key, load)
+
+
+async def tmdb_cached_async(endpoint: str, path: str, params: dict, fetch):
+    """Async twin of tmdb_cached: `fetch` is a coroutine function."""
+    key = make_key(path, params)
+    sentinel = object()
+    value = tmdb_cache.get(key, sentinel)
+    if value is not sentinel:
+        return value
+
+    async def load():
+        value = await fetch()
+        if value is not None:
+            tmdb_cache.set(key, value, ttl=TMDB_CACHE_TTLS.get(endpoint))
+        return value
+    return await tmdb_flight.do_async(key, load)
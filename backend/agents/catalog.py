@@ -0,0 +1,288 @@
+import os
+import gzip
+import json
+import sqlite3
+import logging
+import argparse
+import threading
+import unicodedata
+from agents.ranking import with_genre_mask
+
+logger = logging.getLogger("catalog")
+
+CATALOG_PATH = os.getenv(
+    "CATALOG_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "catalog.db"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS movies (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    overview TEXT,
+    runtime INTEGER,
+    poster_path TEXT,
+    popularity REAL DEFAULT 0,
+    vote_average REAL DEFAULT 0,
+    release_date TEXT
+);
+-- inverted index genre_id -> movies
+CREATE TABLE IF NOT EXISTS movie_genres (
+    genre_id INTEGER NOT NULL,
+    movie_id INTEGER NOT NULL,
+    PRIMARY KEY (genre_id, movie_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS movie_genres_movie ON movie_genres (movie_id);
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_norm TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS people_name_norm ON people (name_norm);
+-- inverted index cast member -> movies, with billing order
+CREATE TABLE IF NOT EXISTS movie_cast (
+    person_id INTEGER NOT NULL,
+    movie_id INTEGER NOT NULL,
+    billing INTEGER NOT NULL,
+    character TEXT,
+    PRIMARY KEY (person_id, movie_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS movie_cast_movie ON movie_cast (movie_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+    title, overview, content='movies', content_rowid='id'
+);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase, accent-free, single-spaced form used for person lookups."""
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return " ".join(name.lower().replace(".", "").split())
+
+
+#  Ingestion
+
+def _open_dump(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def build_catalog(source: str, db_path: str = CATALOG_PATH, batch: int = 5000) -> int:
+    """
+    Build (or extend) the catalog from a JSONL export, optionally gzipped.
+
+    Each line is a TMDB movie object, ideally /movie/{id}?append_to_response=credits
+    (id, title, overview, runtime, poster_path, popularity, vote_average,
+    release_date, genres or genre_ids, credits.cast). Lines from the bare TMDB
+    daily ID export (id, original_title, popularity) are accepted too: new movies
+    are stored without genres or cast, known ones only get their popularity
+    updated. Genres and cast are replaced only by lines that carry them. Adult
+    titles are skipped. Returns the number of movies ingested.
+    """
+    db = sqlite3.connect(db_path)
+    db.executescript(SCHEMA)
+    count = 0
+    # per batch, keyed by movie id so a movie seen twice keeps only its last line
+    movies, id_only, genres, people, cast = {}, {}, {}, {}, {}
+
+    def flush():
+        # full lines replace the movie row; ID-export lines only refresh popularity
+        db.executemany("INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, ?, ?)", movies.values())
+        db.executemany(
+            "INSERT INTO movies (id, title, overview, popularity) VALUES (?, ?, '', ?) "
+            "ON CONFLICT(id) DO UPDATE SET popularity = excluded.popularity",
+            id_only.values(),
+        )
+        # genres / cast are replaced only for lines that carry them (one transaction per batch)
+        db.executemany("DELETE FROM movie_genres WHERE movie_id = ?", [(mid,) for mid in genres])
+        db.executemany("INSERT OR IGNORE INTO movie_genres VALUES (?, ?)",
+                       [(gid, mid) for mid, gids in genres.items() for gid in gids])
+        db.executemany("DELETE FROM movie_cast WHERE movie_id = ?", [(mid,) for mid in cast])
+        db.executemany("INSERT OR REPLACE INTO people VALUES (?, ?, ?)",
+                       [(pid, name, normalize_name(name)) for pid, name in people.items()])
+        db.executemany("INSERT OR REPLACE INTO movie_cast VALUES (?, ?, ?, ?)",
+                       [row for rows in cast.values() for row in rows])
+        db.commit()
+        movies.clear(), id_only.clear(), genres.clear(), people.clear(), cast.clear()
+
+    for m in _open_dump(source):
+        if m.get("adult") or not m.get("id"):
+            continue
+        title = m.get("title") or m.get("original_title")
+        if not title:
+            continue
+        mid = int(m["id"])
+        if "title" not in m:
+            # daily ID export line: keep whatever the catalog already knows about the movie
+            if mid not in movies:
+                id_only[mid] = (mid, title, m.get("popularity") or 0)
+        else:
+            id_only.pop(mid, None)
+            movies[mid] = (
+                mid, title, m.get("overview") or "", m.get("runtime"), m.get("poster_path"),
+                m.get("popularity") or 0, m.get("vote_average") or 0, m.get("release_date"),
+            )
+        if "genre_ids" in m or "genres" in m:
+            genres[mid] = m.get("genre_ids") or [g["id"] for g in m.get("genres") or []]
+        if "credits" in m:
+            cast[mid] = []
+            for c in (m.get("credits") or {}).get("cast", []):
+                if c.get("id") and c.get("name"):
+                    people[c["id"]] = c["name"]
+                    cast[mid].append((c["id"], mid, c.get("order", 999), c.get("character")))
+
+        count += 1
+        if count % batch == 0:
+            flush()
+            logger.info(f"Ingested {count} movies...")
+    flush()
+
+    db.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+    db.execute("ANALYZE")
+    db.commit()
+    db.close()
+    return count
+
+
+#  Read-side
+
+class MovieCatalog:
+    """Read-only, indexed view of the local catalog."""
+
+    def __init__(self, path: str = CATALOG_PATH):
+        self.path = path
+        self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _movies(self, rows, extra: dict = None):
+        """Rows -> TMDB-shaped movie dicts (with genre_ids and genre_mask) in row order."""
+        if not rows:
+            return []
+        ids = [r["id"] for r in rows]
+        genre_rows = self._query(
+            f"SELECT movie_id, genre_id FROM movie_genres WHERE movie_id IN ({','.join('?' * len(ids))})", ids
+        )
+        by_movie = {}
+        for g in genre_rows:
+            by_movie.setdefault(g["movie_id"], []).append(g["genre_id"])
+        movies = []
+        for r in rows:
+            m = {k: r[k] for k in r.keys()}
+            m["genre_ids"] = by_movie.get(r["id"], [])
+            movies.append(with_genre_mask(m))
+        return movies
+
+    def find_person(self, name: str):
+        rows = self._query(
+            "SELECT p.id FROM people p LEFT JOIN movie_cast c ON c.person_id = p.id "
+            "WHERE p.name_norm = ? GROUP BY p.id ORDER BY COUNT(c.movie_id) DESC LIMIT 1",
+            (normalize_name(name),),
+        )
+        return rows[0]["id"] if rows else None
+
+    def movies_for_person(self, person_id: int, genre_ids: list = None, max_billing: int = 15, limit: int = 50):
+        """A person's movies (billing < max_billing), optionally restricted to any of genre_ids."""
+        sql = (
+            "SELECT m.*, c.billing AS 'order', c.character FROM movie_cast c "
+            "JOIN movies m ON m.id = c.movie_id WHERE c.person_id = ? AND c.billing < ?"
+        )
+        params = [person_id, max_billing]
+        if genre_ids:
+            sql += (f" AND EXISTS (SELECT 1 FROM movie_genres g WHERE g.movie_id = m.id "
+                    f"AND g.genre_id IN ({','.join('?' * len(genre_ids))}))")
+            params += list(genre_ids)
+        sql += " ORDER BY m.popularity DESC LIMIT ?"
+        return self._movies(self._query(sql, params + [limit]))
+
+    def movies_for_genre(self, genre_id: int, limit: int = 15):
+        rows = self._query(
+            "SELECT m.* FROM movie_genres g JOIN movies m ON m.id = g.movie_id "
+            "WHERE g.genre_id = ? ORDER BY m.popularity DESC LIMIT ?",
+            (genre_id, limit),
+        )
+        return self._movies(rows)
+
+    def search(self, text: str, limit: int = 15):
+        """Full-text search over titles and overviews."""
+        query = " OR ".join(f'"{w}"' for w in text.replace('"', " ").split())
+        if not query:
+            return []
+        rows = self._query(
+            "SELECT m.* FROM movies_fts f JOIN movies m ON m.id = f.rowid "
+            "WHERE movies_fts MATCH ? ORDER BY f.rank LIMIT ?",
+            (query, limit),
+        )
+        return self._movies(rows)
+
+    def movies_by_ids(self, ids):
+        """Movies for the given IDs, in the order given (unknown IDs are skipped)."""
+        ids = list(ids)
+        if not ids:
+            return []
+        rows = self._query(f"SELECT * FROM movies WHERE id IN ({','.join('?' * len(ids))})", ids)
+        by_id = {r["id"]: r for r in rows}
+        return self._movies([by_id[i] for i in ids if i in by_id])
+
+    def popular(self, limit: int = 10):
+        return self._movies(self._query("SELECT * FROM movies ORDER BY popularity DESC LIMIT ?", (limit,)))
+
+    def person_names(self, min_movies: int = 1):
+        """Names of people with at least `min_movies` credited roles (for actor matching)."""
+        rows = self._query(
+            "SELECT p.name FROM people p JOIN movie_cast c ON c.person_id = p.id "
+            "GROUP BY p.id HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC",
+            (min_movies,),
+        )
+        return [r["name"] for r in rows]
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "movies": self._query("SELECT COUNT(*) AS n FROM movies")[0]["n"],
+            "people": self._query("SELECT COUNT(*) AS n FROM people")[0]["n"],
+        }
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog():
+    """Shared MovieCatalog for CATALOG_PATH, or None if it hasn't been built."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None and os.path.exists(CATALOG_PATH):
+                _catalog = MovieCatalog(CATALOG_PATH)
+                logger.info(f"✅ Loaded local movie catalog {CATALOG_PATH}")
+    return _catalog
+
+
+#  CLI: python -m agents.catalog build movies.jsonl.gz --db catalog.db
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the local MovieRazzi movie catalog")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Ingest a TMDB JSONL export (optionally .gz)")
+    build.add_argument("source")
+    build.add_argument("--db", default=CATALOG_PATH)
+    info = sub.add_parser("stats", help="Show catalog size")
+    info.add_argument("--db", default=CATALOG_PATH)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        n = build_catalog(args.source, args.db)
+        print(f"✅ Ingested {n} movies into {args.db}")
+    else:
+        print(json.dumps(MovieCatalog(args.db).stats(), indent=2))
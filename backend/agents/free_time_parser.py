@@ -0,0 +1,225 @@
+import re
+from datetime import datetime
+
+# Single-pass free-time parser. One precompiled pattern tokenises the whole text
+# into days, day ranges, day groups ("weekends"), relative days ("tomorrow"),
+# time windows ("7–10pm"), start/end times and durations; a small state machine
+# then binds the time information to the days it belongs to.
+#
+#   "3 hours on monday and 4 hours on friday after 6pm"
+#   "Sat 7–10pm, Sun 2-5pm"           "weekends after 8 for a couple of hours"
+#   "mon-thu from 19:30 to 22:00"      "tonight until midnight"
+
+DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+DEFAULT_DAY = "friday"
+DEFAULT_START = 18 * 60      # minutes after midnight
+DEFAULT_MINUTES = 120
+
+DAY_ALIASES = {
+    "mon": 0, "monday": 0, "mondays": 0,
+    "tue": 1, "tues": 1, "tuesday": 1, "tuesdays": 1,
+    "wed": 2, "weds": 2, "wednesday": 2, "wednesdays": 2,
+    "thu": 3, "thur": 3, "thurs": 3, "thursday": 3, "thursdays": 3,
+    "fri": 4, "friday": 4, "fridays": 4,
+    "sat": 5, "saturday": 5, "saturdays": 5,
+    "sun": 6, "sunday": 6, "sundays": 6,
+}
+DAY_GROUPS = {
+    "weekend": [5, 6], "weekends": [5, 6],
+    "weekday": [0, 1, 2, 3, 4], "weekdays": [0, 1, 2, 3, 4],
+    "weeknight": [0, 1, 2, 3, 4], "weeknights": [0, 1, 2, 3, 4],
+}
+RELATIVE_DAYS = {"today": 0, "tonight": 0, "tomorrow": 1, "day after tomorrow": 2}
+PARTS_OF_DAY = {"morning": 9 * 60, "afternoon": 13 * 60, "evening": 18 * 60}
+NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+                "couple": 2, "a couple": 2, "couple of": 2, "a couple of": 2, "few": 3, "a few": 3}
+
+_DAY = r"(?:%s)\b\.?" % "|".join(sorted(DAY_ALIASES, key=len, reverse=True))
+_CLOCK = r"(?:noon|midnight|\d{1,2}(?:[:.]\d{2})?(?:\s*[ap]\.?m\b\.?)?)"
+_DASH = r"(?:-|–|—|to|until|till|til)"
+_HOURS = r"(?:h|hrs?|hours?)(?![a-z])"
+_MINUTES = r"(?:m|mins?|minutes?)(?![a-z])"
+_NOT_DURATION = r"(?!\s*(?:%s|%s))" % (_HOURS, _MINUTES)
+
+TOKEN_RE = re.compile(
+    r"\b(?:"
+    rf"(?P<dayrange>{_DAY}\s*(?:-|–|—|to|through|thru|till|until)\s*{_DAY})"
+    r"|(?P<daygroup>weekends?|weekdays?|weeknights?)"
+    r"|(?P<everyday>every\s*day|daily|all\s+week)"
+    r"|(?P<relday>day\s+after\s+tomorrow|today|tonight|tomorrow)"
+    rf"|(?P<day>{_DAY})"
+    # durations
+    rf"|(?P<hhalf>\d+)\s+and\s+a\s+half\s+{_HOURS}"
+    r"|(?P<hourhalf>an?\s+hour\s+and\s+a\s+half)"
+    r"|(?P<halfhour>half\s+an\s+hour)"
+    rf"|(?P<wordh>(?:a\s+)?couple(?:\s+of)?|(?:a\s+)?few|an?|one|two|three|four|five|six)\s+{_HOURS}"
+    rf"|(?P<dh>\d+(?:\.\d+)?)\s*{_HOURS}(?:\s*(?:and\s+)?(?P<dhm>\d{{1,2}})\s*{_MINUTES}|(?P<dhm2>\d{{2}})(?![\d:]))?"
+    rf"|(?P<dm>\d+)\s*{_MINUTES}"
+    # times of day
+    rf"|between\s+(?P<bstart>{_CLOCK})\s*(?:and|-|–|—|to)\s*(?P<bend>{_CLOCK}){_NOT_DURATION}"
+    rf"|(?:from\s+)?(?P<wstart>{_CLOCK})\s*{_DASH}\s*(?P<wend>{_CLOCK}){_NOT_DURATION}"
+    rf"|(?:after|from|starting(?:\s+at)?|at|since)\s+(?P<start>{_CLOCK}){_NOT_DURATION}"
+    rf"|(?:until|till|til|before|by)\s+(?P<end>{_CLOCK}){_NOT_DURATION}"
+    r"|(?P<clock>\d{1,2}(?::\d{2})?\s*[ap]\.?m\b\.?|\d{1,2}:\d{2}|noon|midnight)"
+    r"|(?P<part>morning|afternoon|evening)"
+    r")"
+)
+_DAY_RE = re.compile(r"\b" + _DAY)
+_CLOCK_RE = re.compile(r"(\d{1,2})(?:[:.](\d{2}))?\s*(?:([ap])\.?m\.?)?")
+
+
+#  Clock times
+
+def _clock(text: str):
+    """'7pm' -> (19*60, True); '7' -> (7*60, False) with the meridiem still to infer."""
+    if text == "noon":
+        return 12 * 60, True
+    if text == "midnight":
+        return 0, True
+    m = _CLOCK_RE.match(text)
+    hour, minute, meridiem = int(m.group(1)), int(m.group(2) or 0), m.group(3)
+    if meridiem:
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
+        return hour * 60 + minute, True
+    # 24h clock (0, 12..23) is unambiguous
+    return hour * 60 + minute, hour == 0 or hour >= 12
+
+
+def _evening(minutes: int, explicit: bool) -> int:
+    """Bare 1-11 o'clock means pm: this is movie-night planning."""
+    return minutes if explicit or minutes >= 12 * 60 else minutes + 12 * 60
+
+
+def _window(start_text: str, end_text: str):
+    """(start, end) minutes after midnight; end > start (may run past midnight)."""
+    (start, s_exp), (end, e_exp) = _clock(start_text), _clock(end_text)
+    if e_exp and not s_exp:
+        # "7-10pm": the start takes the end's half of the day, unless that puts it after the end
+        start = start % (12 * 60) + (end // (12 * 60)) * 12 * 60
+        if start > end:
+            start = (start + 12 * 60) % (24 * 60)
+    elif s_exp and not e_exp:
+        end = end % (12 * 60) + (start // (12 * 60)) * 12 * 60
+        if end <= start:
+            end = (end + 12 * 60) % (24 * 60)
+    elif not s_exp and not e_exp:
+        start, end = _evening(start, False), _evening(end, False)
+    if end <= start:
+        end += 24 * 60
+    return start, end
+
+
+def _duration(m) -> int:
+    if m.group("hhalf"):
+        return int(m.group("hhalf")) * 60 + 30
+    if m.group("hourhalf"):
+        return 90
+    if m.group("halfhour"):
+        return 30
+    if m.group("wordh"):
+        return NUMBER_WORDS[" ".join(m.group("wordh").split())] * 60
+    if m.group("dh"):
+        return int(round(float(m.group("dh")) * 60)) + int(m.group("dhm") or m.group("dhm2") or 0)
+    return int(m.group("dm"))
+
+
+#  Grammar
+
+def _new_group():
+    return {"days": [], "duration": None, "start": None, "end": None, "closed": False}
+
+
+def parse_free_time(text: str, now: datetime = None):
+    """
+    Parse free-time text into slots:
+      {"day", "available_minutes", "start_hour", "start_time", "end_time"}
+    Times are "HH:MM"; a slot whose end_time is before its start_time runs
+    past midnight. Returns [] when nothing was recognised.
+    """
+    groups = [_new_group()]
+
+    def add_days(days):
+        g = groups[-1]
+        if g["days"] and g["closed"]:
+            g = _new_group()
+            groups.append(g)
+        g["days"].extend(d for d in days if d not in g["days"])
+
+    def set_time(**fields):
+        g = groups[-1]
+        if any(g[k] is not None for k in fields):
+            g = _new_group()
+            groups.append(g)
+        g.update(fields)
+        g["closed"] = bool(g["days"])
+
+    for m in TOKEN_RE.finditer(text.lower()):
+        kind = m.lastgroup
+        if kind == "dayrange":
+            first, last = (DAY_ALIASES[w.rstrip(".")] for w in _DAY_RE.findall(m.group(0)))
+            add_days([(first + i) % 7 for i in range((last - first) % 7 + 1)])
+        elif kind == "daygroup":
+            add_days(DAY_GROUPS[m.group(0)])
+        elif kind == "everyday":
+            add_days(range(7))
+        elif kind == "relday":
+            now = now or datetime.now()
+            add_days([(now.weekday() + RELATIVE_DAYS[" ".join(m.group(0).split())]) % 7])
+        elif kind == "day":
+            add_days([DAY_ALIASES[m.group(0).rstrip(".")]])
+        elif kind in ("bstart", "bend"):
+            start, end = _window(m.group("bstart"), m.group("bend"))
+            set_time(start=start, end=end)
+        elif kind in ("wstart", "wend"):
+            start, end = _window(m.group("wstart"), m.group("wend"))
+            set_time(start=start, end=end)
+        elif kind in ("start", "clock"):
+            set_time(start=_evening(*_clock(m.group(kind))))
+        elif kind == "end":
+            set_time(end=_evening(*_clock(m.group("end"))))
+        elif kind == "part":
+            if groups[-1]["start"] is None:
+                set_time(start=PARTS_OF_DAY[m.group("part")])
+        else:
+            set_time(duration=_duration(m))
+
+    if not any(g["days"] for g in groups):
+        timed = [g for g in groups if g["duration"] or g["start"] is not None or g["end"] is not None]
+        if not timed:
+            return []
+        timed[0]["days"] = [DAYS.index(DEFAULT_DAY)]
+
+    slots = []
+    for g in groups:
+        slot = _slot(g)
+        if slot:
+            slots.extend({"day": DAYS[d].capitalize(), **slot} for d in g["days"])
+    return slots
+
+
+def _slot(g):
+    if not g["days"]:
+        return None
+    start, end, duration = g["start"], g["end"], g["duration"]
+    if start is None:
+        start = end - duration if end is not None and duration else DEFAULT_START
+    if end is not None and end <= start:
+        end += 24 * 60
+    window = end - start if end is not None else None
+
+    if duration and window:
+        minutes = min(duration, window)
+    else:
+        minutes = duration or window or DEFAULT_MINUTES
+    minutes = int(round(minutes / 5) * 5)
+    if minutes <= 0 or minutes > 24 * 60:
+        return None
+    end = end if end is not None else start + minutes
+    start %= 24 * 60
+    return {
+        "available_minutes": minutes,
+        "start_hour": start // 60,
+        "start_time": f"{start // 60:02d}:{start % 60:02d}",
+        "end_time": f"{end % (24 * 60) // 60:02d}:{end % 60:02d}",
+    }
@@ -0,0 +1,86 @@
+import os
+import asyncio
+import logging
+import functools
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger("inference")
+
+# Dedicated executor for CPU-bound model work, so slow inference never competes
+# with the event loop or FastAPI's default threadpool. INFERENCE_MAX_IN_FLIGHT
+# caps queued + running jobs; callers that can't get a slot within
+# INFERENCE_QUEUE_TIMEOUT seconds are rejected (backpressure).
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+INFERENCE_MAX_IN_FLIGHT = int(os.getenv("INFERENCE_MAX_IN_FLIGHT", "32"))
+INFERENCE_QUEUE_TIMEOUT = float(os.getenv("INFERENCE_QUEUE_TIMEOUT", "5"))
+
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+
+# asyncio semaphores bind to the loop of their first contended waiter, and both
+# the server loop and tmdb.run_sync's loop (sync retrieval) run inference, so
+# each loop gets its own semaphore. The cap therefore applies per event loop.
+_slots = weakref.WeakKeyDictionary()  # loop -> asyncio.Semaphore
+_slots_lock = threading.Lock()
+_in_flight = 0
+
+
+def _loop_slots() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _slots_lock:
+        slots = _slots.get(loop)
+        if slots is None:
+            slots = _slots[loop] = asyncio.Semaphore(INFERENCE_MAX_IN_FLIGHT)
+        return slots
+
+
+def _count(delta: int):
+    global _in_flight
+    with _slots_lock:
+        _in_flight += delta
+
+
+class InferenceOverloaded(Exception):
+    """Raised when no inference slot frees up within INFERENCE_QUEUE_TIMEOUT."""
+
+
+@asynccontextmanager
+async def inference_slot():
+    slots = _loop_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=INFERENCE_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Inference queue full, rejecting request")
+        raise InferenceOverloaded(f"More than {INFERENCE_MAX_IN_FLIGHT} inference jobs in flight")
+    _count(1)
+    try:
+        yield
+    finally:
+        _count(-1)
+        slots.release()
+
+
+async def run_inference(fn, *args, **kwargs):
+    """Run blocking `fn(*args, **kwargs)` on the inference executor, within the in-flight limit."""
+    async with inference_slot():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(inference_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def run_batched(batcher, item):
+    """
+    Await a MicroBatcher result within the in-flight limit. The batcher has its
+    own worker thread, so no executor thread is held while waiting.
+    """
+    async with inference_slot():
+        return await asyncio.wrap_future(batcher.submit(item))
+
+
+def inference_stats() -> dict:
+    return {
+        "workers": INFERENCE_WORKERS,
+        "max_in_flight": INFERENCE_MAX_IN_FLIGHT,
+        "in_flight": _in_flight,
+    }
@@ -1,17 +1,61 @@
 import os
+import time
+import asyncio
 import logging
-import requests
-from fuzzywuzzy import fuzz
-from dotenv import load_dotenv
+import threading
+from agents.tmdb_client import tmdb, TMDB_API_KEY, count_calls
+from agents.catalog import get_catalog
+from agents.actor_index import get_actor_index
+from agents.ranking import filter_by_genre_ids, rank_movies
+from agents.semantic_index import get_semantic_index, semantic_search
+from agents.popular_pool import get_popular_pool
+from agents.inference import run_inference
+from agents.metrics import timed, observe_stage, observe_tmdb_calls
 
 
 #  Load API key and setup
 
-load_dotenv()
 logger = logging.getLogger("ir_agent")
 
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-TMDB_BASE_URL = "https://api.themoviedb.org/3"
+# Runtime enrichment: default runtime, max parallel /movie/{id} calls and the
+# overall deadline (seconds) for one candidate set.
+DEFAULT_RUNTIME = 120
+RUNTIME_MAX_CONCURRENCY = int(os.getenv("TMDB_RUNTIME_MAX_CONCURRENCY", "8"))
+RUNTIME_DEADLINE = float(os.getenv("TMDB_RUNTIME_DEADLINE", "5"))
+
+# Per-branch timeout (seconds) for the people/genre fan-out in retrieve_movies
+BRANCH_TIMEOUT = float(os.getenv("RETRIEVAL_BRANCH_TIMEOUT", "4"))
+
+# Paginated lists (search, discover, popular): pages fetched beyond the first,
+# how many are in flight at once, and the time budget (seconds) for one list.
+PAGINATION_MAX_PAGES = int(os.getenv("TMDB_MAX_PAGES", "5"))
+PAGINATION_CONCURRENCY = int(os.getenv("TMDB_PAGE_CONCURRENCY", "2"))
+PAGINATION_DEADLINE = float(os.getenv("TMDB_PAGINATION_DEADLINE", "3"))
+
+# "tmdb" (live search), "discover" (live, filtered server-side by /discover/movie)
+# or "catalog" (local snapshot built with `python -m agents.catalog build`)
+RETRIEVAL_BACKEND = os.getenv("RETRIEVAL_BACKEND", "tmdb")
+
+# Discover mode: one /discover/movie call per actor (with_cast + with_genres +
+# runtime bounds) and one for all genres together, instead of movie_credits and
+# a text search per genre. Candidates still need their /movie/{id} runtime call
+# like the search backend, so the saving is limited to the list calls
+# (benchmarks/bench_retrieval_calls.py has the numbers).
+DISCOVER_MIN_RUNTIME = int(os.getenv("DISCOVER_MIN_RUNTIME", "40"))
+DISCOVER_RUNTIME_SLACK = int(os.getenv("DISCOVER_RUNTIME_SLACK", "30"))
+
+# Semantic branch: nearest overviews to the user's own words, blended with the
+# actor/genre results. Only active once `python -m agents.semantic_index build` has run.
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "10"))
+SEMANTIC_MIN_SCORE = float(os.getenv("SEMANTIC_MIN_SCORE", "0.3"))
+SEMANTIC_REASON = "Its story is close to what you described."
+
+# TMDB genre IDs for the analyzer's genre labels
+GENRE_IDS = {
+    "action": 28, "drama": 18, "sci-fi": 878, "thriller": 53,
+    "comedy": 35, "fantasy": 14, "animation": 16, "horror": 27,
+    "romance": 10749, "adventure": 12
+}
 
 if TMDB_API_KEY:
     print("TMDB_API_KEY loaded successfully inside ir_agent.py")
@@ -19,39 +63,21 @@ else:
     logger.error("TMDB_API_KEY not found. Check your .env file!")
 
 
-#  Known actor list for fuzzy name correction
-
-KNOWN_ACTORS = [
-    "Tom Holland", "Henry Cavill", "Emma Stone", "Ryan Gosling",
-    "Chris Hemsworth", "Robert Downey Jr", "Scarlett Johansson",
-    "Zendaya", "Chris Evans", "Tom Cruise", "Dwayne Johnson",
-    "Margot Robbie", "Hugh Jackman", "Gal Gadot", "Ryan Reynolds",
-    "Benedict Cumberbatch", "Vin Diesel", "Mark Ruffalo", "Natalie Portman",
-    "Chris Pratt", "Amy Adams", "Anne Hathaway", "Leonardo DiCaprio"
-]
-
-
 #  Helper Functions
+#
+# TMDB lookups are async (they run on the caller's event loop through the shared
+# TMDB client); each has a sync wrapper for non-async callers.
 
 def correct_name(name: str) -> str:
-    """Return best fuzzy match to known actors."""
-    best, score = name, 0
-    for known in KNOWN_ACTORS:
-        s = fuzz.partial_ratio(name.lower(), known.lower())
-        if s > score:
-            best, score = known, s
-    return best if score >= 70 else name
+    """Return best fuzzy match to known actors (see agents/actor_index.py)."""
+    return get_actor_index().resolve(name, threshold=70) or name
 
 
-def search_person(name: str):
+@timed("person_search")
+async def search_person_async(name: str):
     """Search TMDB for an actor and return their ID."""
     try:
-        res = requests.get(
-            f"{TMDB_BASE_URL}/search/person",
-            params={"api_key": TMDB_API_KEY, "query": name, "language": "en-US"},
-            timeout=10,
-        )
-        data = res.json()
+        data = await tmdb.aget_json("search/person", "search/person", {"query": name, "language": "en-US"})
         if data.get("results"):
             pid = data["results"][0]["id"]
             logger.info(f"Found TMDB person: {name} (id={pid})")
@@ -61,15 +87,17 @@ def search_person(name: str):
     return None
 
 
-def get_movies_by_person(person_id: int):
+def search_person(name: str):
+    return tmdb.run_sync(search_person_async(name))
+
+
+@timed("credits")
+async def get_movies_by_person_async(person_id: int):
     """Return top movies for a given person_id (filtering out cameos, voice, etc.)."""
     try:
-        res = requests.get(
-            f"{TMDB_BASE_URL}/person/{person_id}/movie_credits",
-            params={"api_key": TMDB_API_KEY, "language": "en-US"},
-            timeout=10,
+        data = await tmdb.aget_json(
+            "person/movie_credits", f"person/{person_id}/movie_credits", {"language": "en-US"}
         )
-        data = res.json()
         cast = data.get("cast", [])
 
         # Filter: remove uncredited, voice, archive roles, and keep only major roles
@@ -85,158 +113,559 @@ def get_movies_by_person(person_id: int):
         return []
 
 
-def search_movies_by_keyword(keyword: str):
-    """Keyword or genre search fallback."""
+def get_movies_by_person(person_id: int):
+    return tmdb.run_sync(get_movies_by_person_async(person_id))
+
+
+#  Paginated TMDB lists
+
+async def iter_pages_async(endpoint: str, path: str, params: dict, max_pages: int = None,
+                           concurrency: int = None, deadline: float = None):
+    """
+    Async iterator over the movies of a paginated TMDB list, in page order.
+
+    Page 1 is fetched alone (it tells us total_pages); after that up to
+    `concurrency` later pages are in flight while the caller consumes the
+    current one. Stops at `max_pages`, the last page, a failed page or when
+    `deadline` seconds have passed. Breaking out of the loop (or aclose())
+    cancels any pages still in flight.
+    """
+    max_pages = max_pages or PAGINATION_MAX_PAGES
+    concurrency = concurrency or PAGINATION_CONCURRENCY
+    loop = asyncio.get_running_loop()
+    end = loop.time() + (PAGINATION_DEADLINE if deadline is None else deadline)
+
+    def fetch(page: int):
+        return asyncio.ensure_future(tmdb.aget_json(endpoint, path, {**params, "page": page}))
+
+    pending = {1: fetch(1)}
+    last_page, page = max_pages, 1
     try:
-        res = requests.get(
-            f"{TMDB_BASE_URL}/search/movie",
-            params={
-                "api_key": TMDB_API_KEY,
-                "query": keyword,
-                "language": "en-US",
-                "page": 1,
-                "include_adult": False,
-            },
-            timeout=10,
-        )
-        return res.json().get("results", [])
+        while page <= last_page:
+            try:
+                data = await asyncio.wait_for(pending[page], max(0.0, end - loop.time()))
+            except asyncio.TimeoutError:
+                logger.info(f"{endpoint}: pagination deadline hit at page {page}")
+                return
+            except Exception as e:
+                logger.warning(f"{endpoint}: page {page} failed: {e}")
+                return
+            del pending[page]
+            if page == 1:
+                last_page = min(max_pages, data.get("total_pages") or 1)
+            # keep the look-ahead window full while this page is consumed
+            for nxt in range(page + 1, min(page + concurrency, last_page) + 1):
+                if nxt not in pending:
+                    pending[nxt] = fetch(nxt)
+            for movie in data.get("results", []):
+                yield movie
+            page += 1
+    finally:
+        for task in pending.values():
+            task.cancel()
+
+
+async def collect_pages_async(endpoint: str, path: str, params: dict, want: int, accept=None, seen=None, **limits):
+    """
+    Up to `want` movies from successive pages that pass `accept(movie)` and
+    aren't in `seen`; stops fetching as soon as it has them (see iter_pages_async).
+    """
+    seen = set(seen or ())
+    picked = []
+    pages = iter_pages_async(endpoint, path, params, **limits)
+    try:
+        async for m in pages:
+            mid = m.get("id")
+            if not mid or mid in seen or (accept and not accept(m)):
+                continue
+            seen.add(mid)
+            picked.append(m)
+            if len(picked) >= want:
+                break
+    finally:
+        await pages.aclose()
+    return picked
+
+
+@timed("keyword_search")
+async def search_movies_by_keyword_async(keyword: str, limit: int = 20, accept=None):
+    """Keyword or genre search fallback: up to `limit` results passing `accept`, across pages."""
+    try:
+        return await collect_pages_async("search/movie", "search/movie", {
+            "query": keyword,
+            "language": "en-US",
+            "include_adult": "false",
+        }, want=limit, accept=accept)
     except Exception as e:
         logger.error(f"Keyword search failed: {e}")
         return []
 
 
+def search_movies_by_keyword(keyword: str, limit: int = 20, accept=None):
+    return tmdb.run_sync(search_movies_by_keyword_async(keyword, limit, accept))
+
+
+def discover_params(genres=None, person_id: int = None, target_runtime: float = None) -> dict:
+    """/discover/movie filters: any of the genres, the person in the cast, a runtime that fits."""
+    params = {
+        "language": "en-US",
+        "sort_by": "popularity.desc",
+        "include_adult": "false",
+        "with_runtime.gte": DISCOVER_MIN_RUNTIME,
+    }
+    ids = genre_ids_for(genres or [])
+    if ids:
+        params["with_genres"] = "|".join(str(i) for i in ids)
+    if person_id:
+        params["with_cast"] = person_id
+    if target_runtime:
+        params["with_runtime.lte"] = int(target_runtime) + DISCOVER_RUNTIME_SLACK
+    return params
+
+
+@timed("discover")
+async def discover_movies_async(params: dict, limit: int = 20):
+    """Up to `limit` movies matching `params` (see discover_params), most popular first."""
+    try:
+        return await collect_pages_async("discover/movie", "discover/movie", params, want=limit)
+    except Exception as e:
+        logger.error(f"Discover failed: {e}")
+        return []
+
+
+def discover_movies(params: dict, limit: int = 20):
+    return tmdb.run_sync(discover_movies_async(params, limit))
+
+
 def filter_movies_by_genre(movies, genres):
     """Filter movie list by detected genre names."""
-    genre_map = {
-        "action": 28, "drama": 18, "sci-fi": 878, "thriller": 53,
-        "comedy": 35, "fantasy": 14, "animation": 16, "horror": 27,
-        "romance": 10749, "adventure": 12
-    }
+    return filter_by_genre_ids(movies, genre_ids_for(genres))
 
-    genre_ids = [genre_map[g] for g in genres if g in genre_map]
-    if not genre_ids:
-        return movies
 
-    filtered = []
-    for m in movies:
-        m_genres = m.get("genre_ids", [])
-        if any(gid in genre_ids for gid in m_genres):
-            filtered.append(m)
-    return filtered
+def genre_ids_for(genres):
+    return [GENRE_IDS[g] for g in genres if g in GENRE_IDS]
 
 
 
 #  Add runtime to movies
 
+async def fetch_runtime_async(movie_id: int) -> int:
+    """Fetch a movie's runtime in minutes, falling back to DEFAULT_RUNTIME."""
+    try:
+        data = await tmdb.aget_json("movie", f"movie/{movie_id}", {"language": "en-US"})
+        return data.get("runtime") or DEFAULT_RUNTIME
+    except Exception as e:
+        logger.warning(f"Runtime fetch failed for movie {movie_id}: {e}")
+    return DEFAULT_RUNTIME
+
+
 def add_runtime(movie):
     """Fetch movie runtime and attach it to the dict."""
+    movie["runtime"] = tmdb.run_sync(fetch_runtime_async(movie.get("id")))
+    return movie
+
+
+async def iter_runtimes_async(movies, max_concurrency: int = None, deadline: float = None):
+    """
+    Attach runtimes to a candidate set concurrently, yielding (index, movie)
+    as each one arrives. Movies that already carry a runtime (e.g. from the
+    popular pool) are yielded without a call.
+
+    At most `max_concurrency` requests are in flight at once. Movies whose
+    runtime has not arrived within `deadline` seconds get DEFAULT_RUNTIME and
+    are yielded last. Movies are updated in place.
+    """
+    if not movies:
+        return
+    limit = asyncio.Semaphore(max_concurrency or RUNTIME_MAX_CONCURRENCY)
+    deadline = RUNTIME_DEADLINE if deadline is None else deadline
+
+    async def fetch(i, movie):
+        if movie.get("runtime"):
+            return i
+        async with limit:
+            movie["runtime"] = await fetch_runtime_async(movie.get("id"))
+        return i
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    end = loop.time() + deadline
+    pending = {asyncio.ensure_future(fetch(i, m)): i for i, m in enumerate(movies)}
     try:
-        res = requests.get(
-            f"{TMDB_BASE_URL}/movie/{movie['id']}",
-            params={"api_key": TMDB_API_KEY, "language": "en-US"},
-            timeout=10,
+        while pending:
+            done, _ = await asyncio.wait(pending, timeout=max(0.0, end - loop.time()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                i = pending.pop(task)
+                yield i, movies[i]
+    finally:
+        for task in pending:
+            task.cancel()
+        observe_stage("runtime_enrichment", time.perf_counter() - started)
+
+    if pending:
+        logger.warning(f"Runtime enrichment deadline hit: {len(pending)}/{len(movies)} movies use default runtime.")
+    for i in sorted(pending.values()):
+        movies[i]["runtime"] = DEFAULT_RUNTIME
+        yield i, movies[i]
+
+
+async def add_runtimes_async(movies, max_concurrency: int = None, deadline: float = None):
+    """
+    Attach runtimes to a whole candidate set concurrently (see iter_runtimes_async).
+    The list is updated in place, so result order is unchanged.
+    """
+    async for _ in iter_runtimes_async(movies, max_concurrency, deadline):
+        pass
+    return movies
+
+
+def add_runtimes(movies, max_concurrency: int = None, deadline: float = None):
+    return tmdb.run_sync(add_runtimes_async(movies, max_concurrency, deadline))
+
+
+def format_movie(movie, reason: str):
+    """Shape an enriched TMDB movie dict into the API result format."""
+    result = {
+        "id": movie["id"],
+        "title": movie["title"],
+        "runtime": movie.get("runtime", DEFAULT_RUNTIME),
+        "overview": movie.get("overview", ""),
+        "poster_path": (
+            f"https://image.tmdb.org/t/p/w500{movie['poster_path']}"
+            if movie.get("poster_path") else None
+        ),
+        "reason": reason,
+        "score": movie.get("score"),
+        "factors": movie.get("factors"),
+    }
+    return result
+
+
+
+#  Concurrent fan-out
+
+async def fan_out(branches: dict, timeout: float = None):
+    """
+    Run named branch coroutines concurrently, each under its own timeout.
+    Returns results in the same order as `branches`; a branch that fails or
+    times out yields None instead of stalling the others.
+    """
+    timeout = BRANCH_TIMEOUT if timeout is None else timeout
+
+    async def guarded(label, coro):
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Retrieval branch '{label}' timed out after {timeout}s")
+        except Exception as e:
+            logger.error(f"Retrieval branch '{label}' failed: {e}")
+        return None
+
+    return await asyncio.gather(*(guarded(label, coro) for label, coro in branches.items()))
+
+
+async def person_branch(person: str, genres: list, target_runtime: float = None):
+    """Resolve one mentioned person to (corrected name, their top 15 genre-filtered movies)."""
+    corrected = correct_name(person)
+    pid = await search_person_async(corrected)
+    if not pid:
+        return corrected, []
+
+    actor_movies = await get_movies_by_person_async(pid)
+    if genres:
+        actor_movies = filter_movies_by_genre(actor_movies, genres)
+    return corrected, rank_movies(actor_movies, genre_ids_for(genres), 15, target_runtime)
+
+
+async def genre_branch(genre: str, target_runtime: float = None):
+    """Top 15 keyword-search results tagged with the genre (reading further pages if needed)."""
+    gid = GENRE_IDS.get(genre)
+    accept = (lambda m: gid in (m.get("genre_ids") or [])) if gid else None
+    movies = await search_movies_by_keyword_async(genre, limit=15, accept=accept)
+    return rank_movies(movies, genre_ids_for([genre]), 15, target_runtime)
+
+
+async def person_discover_branch(person: str, genres: list, target_runtime: float = None):
+    """Discover-mode person_branch: the cast and genre filtering happen server-side."""
+    corrected = correct_name(person)
+    pid = await search_person_async(corrected)
+    if not pid:
+        return corrected, []
+
+    movies = await discover_movies_async(discover_params(genres, pid, target_runtime), limit=15)
+    return corrected, rank_movies(movies, genre_ids_for(genres), 15, target_runtime)
+
+
+async def genres_discover_branch(genres: list, target_runtime: float = None):
+    """
+    Discover-mode genre lookup: one call for all genres instead of a text
+    search per genre. Returns {genre: ranked movies}, each movie credited to
+    the first of the user's genres it has.
+    """
+    ids = genre_ids_for(genres)
+    if not ids:
+        return {}
+    by_genre = {g: [] for g in genres if g in GENRE_IDS}
+    movies = await discover_movies_async(discover_params(genres, None, target_runtime), limit=15 * len(by_genre))
+    for m in rank_movies(movies, ids, 15 * len(by_genre), target_runtime):
+        movie_ids = set(m.get("genre_ids") or [])
+        genre = next((g for g in by_genre if GENRE_IDS[g] in movie_ids), next(iter(by_genre)))
+        by_genre[genre].append(m)
+    return by_genre
+
+
+@timed("semantic_search")
+async def semantic_branch(text: str, genres: list, target_runtime: float = None):
+    """Nearest catalog overviews to the user's text, hydrated and ranked (similarity is a ranking factor)."""
+    hits = await run_inference(semantic_search, text, SEMANTIC_TOP_K)
+    similarity = {mid: s for mid, s in hits if s >= SEMANTIC_MIN_SCORE}
+    if not similarity:
+        return []
+
+    catalog = get_catalog()
+    if catalog:
+        movies = catalog.movies_by_ids(similarity)
+    else:
+        details = await asyncio.gather(
+            *(tmdb.aget_json("movie", f"movie/{mid}", {"language": "en-US"}) for mid in similarity),
+            return_exceptions=True,
         )
-        if res.ok:
-            data = res.json()
-            movie["runtime"] = data.get("runtime", 120)
-        else:
-            movie["runtime"] = 120
-    except Exception as e:
-        logger.warning(f"Runtime fetch failed for movie {movie.get('id')}: {e}")
-        movie["runtime"] = 120
-    return movie
+        movies = []
+        for d in details:
+            if isinstance(d, dict) and d.get("id"):
+                movies.append({**d, "genre_ids": [g["id"] for g in d.get("genres", [])]})
+    for m in movies:
+        m["similarity"] = similarity[m["id"]]
+    return rank_movies(movies, genre_ids_for(genres), SEMANTIC_TOP_K, target_runtime)
+
+
+def semantic_enabled(preference_data: dict) -> bool:
+    index = get_semantic_index()
+    return bool(preference_data.get("input_text")) and index is not None and len(index) > 0
+
+
+
+#  Local catalog backend
+
+@timed("catalog_retrieve")
+def retrieve_from_catalog(preference_data: dict, catalog=None, target_runtime: float = None,
+                          semantic_movies: list = None):
+    """
+    Same branches as the TMDB path (actor + genre, genre only, popular), served
+    entirely from the local catalog's cast/genre indexes: no network calls.
+    `semantic_movies` (already ranked semantic-index hits) are blended in after
+    the actor results.
+    """
+    catalog = catalog or get_catalog()
+    genres = preference_data.get("detected_genres", [])
+    people = preference_data.get("entities", {}).get("people", [])
+    genre_ids = genre_ids_for(genres)
+    candidates, seen = [], set()
+
+    def add(movies, reason, top_k=15, ids=genre_ids):
+        for m in rank_movies(movies, ids, top_k, target_runtime):
+            if m["id"] in seen:
+                continue
+            seen.add(m["id"])
+            m["runtime"] = m.get("runtime") or DEFAULT_RUNTIME
+            candidates.append((m, reason))
+
+    for person in dict.fromkeys(people):
+        corrected = correct_name(person)
+        pid = catalog.find_person(corrected)
+        if pid:
+            add(catalog.movies_for_person(pid, genre_ids, limit=100),
+                f"Stars {corrected} and matches your interest in {', '.join(genres) or 'movies'}.")
+
+    actor_hits = len(candidates)
+    if semantic_movies:
+        add(semantic_movies, SEMANTIC_REASON)
+
+    if not actor_hits:
+        for g in dict.fromkeys(genres):
+            if g in GENRE_IDS:
+                add(catalog.movies_for_genre(GENRE_IDS[g], limit=100), f"Matches your preference for {g} movies.",
+                    ids=[GENRE_IDS[g]])
+
+    if not candidates:
+        add(catalog.popular(limit=50), "Popular fallback movie.", top_k=10)
+
+    logger.info(f" Retrieved {len(candidates)} movies from local catalog.")
+    return [format_movie(m, reason) for m, reason in candidates]
 
 
 
 #  Main Retrieval Logic
 
-def retrieve_movies(preference_data: dict):
+@timed("candidates")
+async def collect_candidates_async(preference_data: dict, target_runtime: float = None, semantic_task=None,
+                                   discover: bool = False):
+    """
+    Ranked (movie, reason) pairs from the TMDB branches, before runtime
+    enrichment. `discover` uses the /discover/movie branches (see DISCOVER_*).
+    """
     genres = preference_data.get("detected_genres", [])
     people = preference_data.get("entities", {}).get("people", [])
-    results, seen = [], set()
+    candidates, seen = [], set()
 
     logger.info(f"Retrieving for genres={genres}, people={people}")
 
+    # All people are looked up at once. Genre results are only used when no
+    # actor matched, so that branch starts after the people lookup misses: a
+    # speculative start would keep its TMDB calls running after a cancel (they
+    # are shielded by singleflight) and spend rate-limit budget for nothing.
+    by_person = person_discover_branch if discover else person_branch
+    people_task = asyncio.ensure_future(
+        fan_out({f"person:{p}": by_person(p, genres, target_runtime) for p in dict.fromkeys(people)})
+    )
+
+    async def by_genre():
+        pool = get_popular_pool()
+        pooled = {g: pool.genre(GENRE_IDS[g]) for g in dict.fromkeys(genres) if g in GENRE_IDS} if pool else {}
+        if pooled and all(movies is not None for movies in pooled.values()):
+            # prefetched per-genre top lists, runtimes included: no TMDB calls
+            return {g: rank_movies(movies, [GENRE_IDS[g]], 15, target_runtime) for g, movies in pooled.items()}
+        if discover:
+            return (await fan_out({"genres": genres_discover_branch(list(dict.fromkeys(genres)), target_runtime)}))[0] or {}
+        unique = list(dict.fromkeys(genres))
+        return dict(zip(unique, await fan_out({f"genre:{g}": genre_branch(g, target_runtime) for g in unique})))
+
     #Combined actor + genre logic (this is the highest priority)
-    for person in people:
-        corrected = correct_name(person)
-        pid = search_person(corrected)
-        if not pid:
+    for branch in await people_task:
+        if not branch:
             continue
-
-        actor_movies = get_movies_by_person(pid)
-        if genres:
-            actor_movies = filter_movies_by_genre(actor_movies, genres)
-
-        for m in actor_movies[:15]:
+        corrected, actor_movies = branch
+        for m in actor_movies:
             mid = m.get("id")
             title = m.get("title")
             if not mid or mid in seen or not title:
                 continue
             seen.add(mid)
-            enriched = add_runtime(m)
-            results.append({
-                "id": enriched["id"],
-                "title": enriched["title"],
-                "runtime": enriched.get("runtime", 120),
-                "overview": enriched.get("overview", ""),
-                "poster_path": (
-                    f"https://image.tmdb.org/t/p/w500{enriched['poster_path']}"
-                    if enriched.get("poster_path") else None
-                ),
-                "reason": f"Stars {corrected} and matches your interest in {', '.join(genres) or 'movies'}."
-            })
+            candidates.append((m, f"Stars {corrected} and matches your interest in {', '.join(genres) or 'movies'}."))
+
+    actor_hits = len(candidates)
+    genre_task = None if actor_hits else asyncio.ensure_future(by_genre())
+
+    # Semantic hits are blended in right after the actor matches
+    if semantic_task:
+        for m in (await semantic_task)[0] or []:
+            if m["id"] in seen:
+                continue
+            seen.add(m["id"])
+            candidates.append((m, SEMANTIC_REASON))
 
     # If no actor-based results, search by genres only
-    if not results and genres:
-        for g in genres:
-            genre_movies = search_movies_by_keyword(g)
-            for m in genre_movies[:15]:
+    if genre_task:
+        for g, genre_movies in (await genre_task).items():
+            for m in genre_movies or []:
                 mid = m.get("id")
                 if not mid or mid in seen:
                     continue
                 seen.add(mid)
-                enriched = add_runtime(m)
-                results.append({
-                    "id": enriched["id"],
-                    "title": enriched["title"],
-                    "runtime": enriched.get("runtime", 120),
-                    "overview": enriched.get("overview", ""),
-                    "poster_path": (
-                        f"https://image.tmdb.org/t/p/w500{enriched['poster_path']}"
-                        if enriched.get("poster_path") else None
-                    ),
-                    "reason": f"Matches your preference for {g} movies."
-                })
-
+                candidates.append((m, f"Matches your preference for {g} movies."))
     # Popular fallback - no genres or people detected
-    if not results:
+    if not candidates:
         logger.warning("No direct matches, fetching popular fallback movies.")
         try:
-            res = requests.get(
-                f"{TMDB_BASE_URL}/movie/popular",
-                params={"api_key": TMDB_API_KEY, "language": "en-US", "page": 1},
-                timeout=10,
-            )
-            for m in res.json().get("results", [])[:10]:
+            pool = get_popular_pool()
+            if pool:
+                popular = pool.fallback()
+            elif discover:
+                popular = await discover_movies_async(discover_params(target_runtime=target_runtime), limit=10)
+            else:
+                popular = await collect_pages_async("movie/popular", "movie/popular", {"language": "en-US"}, want=10)
+            for m in rank_movies(popular, top_k=10, target_runtime=target_runtime):
                 mid = m.get("id")
                 if not mid or mid in seen:
                     continue
                 seen.add(mid)
-                enriched = add_runtime(m)
-                results.append({
-                    "id": enriched["id"],
-                    "title": enriched["title"],
-                    "runtime": enriched.get("runtime", 120),
-                    "overview": enriched.get("overview", ""),
-                    "poster_path": (
-                        f"https://image.tmdb.org/t/p/w500{enriched['poster_path']}"
-                        if enriched.get("poster_path") else None
-                    ),
-                    "reason": "Popular fallback movie."
-                })
+                candidates.append((m, "Popular fallback movie."))
         except Exception as e:
             logger.error(f"Popular fallback failed: {e}")
 
-    logger.info(f" Retrieved {len(results)} refined movies (with runtime).")
-    return results
\ No newline at end of file
+    return candidates
+
+
+#  TMDB calls per retrieval, by backend
+
+_call_stats = {}  # backend -> {"requests", "calls", "upstream"}
+_call_stats_lock = threading.Lock()
+
+
+def record_calls(backend: str, counter: dict):
+    with _call_stats_lock:
+        totals = _call_stats.setdefault(backend, {"requests": 0, "calls": 0, "upstream": 0})
+        totals["requests"] += 1
+        totals["calls"] += counter["calls"]
+        totals["upstream"] += counter["upstream"]
+    observe_tmdb_calls(backend, counter["calls"], counter["upstream"])
+
+
+def retrieval_stats() -> dict:
+    """Average TMDB lookups (all / upstream, i.e. not served by the cache) per retrieval, by backend."""
+    with _call_stats_lock:
+        return {
+            backend: {**t, "calls_per_request": round(t["calls"] / t["requests"], 2),
+                      "upstream_per_request": round(t["upstream"] / t["requests"], 2)}
+            for backend, t in _call_stats.items()
+        }
+
+
+async def retrieve_movies_stream(preference_data: dict, target_runtime: float = None, backend: str = None):
+    """
+    Async generator behind retrieve_movies_async: yields (rank, movie) for each
+    result as soon as its runtime is known, so callers can stream results
+    instead of waiting for the slowest TMDB call. `rank` is the movie's
+    position in the final, ranked list. `backend` overrides RETRIEVAL_BACKEND.
+    """
+    backend = backend or RETRIEVAL_BACKEND
+    genres = preference_data.get("detected_genres", [])
+    started = time.perf_counter()
+    returned = 0
+
+    with count_calls() as calls:
+        try:
+            semantic_task = None
+            if semantic_enabled(preference_data):
+                semantic_task = asyncio.ensure_future(
+                    fan_out({"semantic": semantic_branch(preference_data["input_text"], genres, target_runtime)})
+                )
+
+            if backend == "catalog":
+                catalog = get_catalog()
+                if catalog:
+                    semantic_movies = (await semantic_task)[0] if semantic_task else None
+                    for rank, movie in enumerate(retrieve_from_catalog(preference_data, catalog, target_runtime, semantic_movies)):
+                        returned += 1
+                        yield rank, movie
+                    return
+                logger.warning("RETRIEVAL_BACKEND=catalog but no catalog found, using TMDB.")
+
+            discover = backend == "discover"
+            candidates = await collect_candidates_async(preference_data, target_runtime, semantic_task, discover)
+            async for rank, m in iter_runtimes_async([m for m, _ in candidates]):
+                returned += 1
+                yield rank, format_movie(m, candidates[rank][1])
+        finally:
+            # includes time the consumer spends between items, i.e. what a streaming client sees
+            observe_stage("retrieve", time.perf_counter() - started)
+            # recorded here so /orchestrate/stream shows up in retrieval_stats too
+            record_calls(backend, calls)
+            logger.info(f" Retrieved {returned} refined movies (with runtime) using {calls['calls']} TMDB lookups "
+                        f"({calls['upstream']} upstream).")
+
+
+async def retrieve_movies_async(preference_data: dict, target_runtime: float = None, backend: str = None):
+    """
+    Retrieve ranked movies for the analyzer output. `target_runtime` (minutes),
+    when known, lets the ranking favour movies that fit the user's free time.
+    """
+    by_rank = {rank: movie async for rank, movie in retrieve_movies_stream(preference_data, target_runtime, backend)}
+    return [by_rank[rank] for rank in sorted(by_rank)]
+
+
+def retrieve_movies(preference_data: dict, target_runtime: float = None, backend: str = None):
+    return tmdb.run_sync(retrieve_movies_async(preference_data, target_runtime, backend))
@@ -0,0 +1,190 @@
+import os
+import time
+import inspect
+import logging
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from prometheus_client import Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+logger = logging.getLogger("metrics")
+
+# Pipeline instrumentation: per-stage and per-TMDB-endpoint latency histograms,
+# cache hit ratios and model batch sizes, exported in Prometheus format at
+# /metrics. With OTEL_TRACING=1 (and opentelemetry-sdk installed) every stage
+# is also an OpenTelemetry span; see enable_tracing().
+
+STAGE_SECONDS = Histogram(
+    "movierazzi_stage_seconds", "Time spent per pipeline stage", ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+TMDB_SECONDS = Histogram(
+    "movierazzi_tmdb_request_seconds", "TMDB HTTP request latency (retries included)", ["endpoint", "outcome"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+TMDB_CALLS = Histogram(
+    "movierazzi_tmdb_calls_per_retrieve", "TMDB lookups per retrieval (upstream = not served by cache)", ["backend", "kind"],
+    buckets=(1, 2, 5, 10, 20, 30, 50, 75, 100, 200),
+)
+BATCH_SIZE = Histogram(
+    "movierazzi_batch_size", "Items per model batch", ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+
+
+#  Tracing (optional)
+
+_tracer = None
+
+
+def enable_tracing(exporter=None):
+    """
+    Turn stages into OpenTelemetry spans. With no exporter an in-memory one is
+    installed and returned, so tests can inspect `exporter.get_finished_spans()`.
+    """
+    global _tracer
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    if exporter is None:
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    _tracer = provider.get_tracer("movierazzi")
+    return exporter
+
+
+def disable_tracing():
+    global _tracer
+    _tracer = None
+
+
+if os.getenv("OTEL_TRACING", "0") == "1":
+    try:
+        enable_tracing()
+        logger.info("OpenTelemetry tracing enabled (in-memory exporter)")
+    except ImportError:
+        logger.warning("OTEL_TRACING=1 but opentelemetry-sdk is not installed")
+
+
+#  Stage timing
+
+@contextmanager
+def stage(name: str, **attributes):
+    """Time a block as pipeline stage `name` (and trace it when tracing is on)."""
+    span = _tracer.start_as_current_span(name, attributes=attributes) if _tracer else nullcontext()
+    start = time.perf_counter()
+    try:
+        with span:
+            yield
+    finally:
+        STAGE_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+
+def timed(name: str):
+    """Decorator form of stage() for sync and async functions."""
+    def wrap(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with stage(name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return wrap
+
+
+def observe_stage(name: str, seconds: float):
+    STAGE_SECONDS.labels(name).observe(seconds)
+
+
+@contextmanager
+def tmdb_request(endpoint: str):
+    """Time one uncached TMDB call (all retries) under its endpoint template."""
+    span = _tracer.start_as_current_span(f"tmdb {endpoint}") if _tracer else nullcontext()
+    start, outcome = time.perf_counter(), "error"
+    try:
+        with span:
+            yield
+        outcome = "ok"
+    finally:
+        TMDB_SECONDS.labels(endpoint, outcome).observe(time.perf_counter() - start)
+
+
+def observe_tmdb_calls(backend: str, calls: int, upstream: int):
+    TMDB_CALLS.labels(backend, "calls").observe(calls)
+    TMDB_CALLS.labels(backend, "upstream").observe(upstream)
+
+
+def observe_batch(batcher: str, size: int):
+    BATCH_SIZE.labels(batcher).observe(size)
+
+
+#  Cache hit ratios (read from the caches' own counters at scrape time)
+
+_caches = []
+_caches_lock = threading.Lock()
+
+
+def track_cache(cache):
+    with _caches_lock:
+        _caches.append(cache)
+    return cache
+
+
+class _CacheCollector:
+    def collect(self):
+        hits = CounterMetricFamily("movierazzi_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("movierazzi_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("movierazzi_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        size = GaugeMetricFamily("movierazzi_cache_entries", "Entries held in memory", labels=["cache"])
+        with _caches_lock:
+            caches = list(_caches)
+        for cache in caches:
+            s = cache.stats()
+            hits.add_metric([s["name"]], s["hits"])
+            misses.add_metric([s["name"]], s["misses"])
+            ratio.add_metric([s["name"]], s["hit_ratio"])
+            size.add_metric([s["name"]], s["size"])
+        yield from (hits, misses, ratio, size)
+
+
+REGISTRY.register(_CacheCollector())
+
+
+#  Request coalescing (agents/singleflight.py)
+
+_flights = []
+
+
+def track_singleflight(group):
+    with _caches_lock:
+        _flights.append(group)
+    return group
+
+
+class _SingleFlightCollector:
+    def collect(self):
+        runs = CounterMetricFamily("movierazzi_singleflight_executions", "Computations actually run", labels=["group"])
+        shared = CounterMetricFamily("movierazzi_singleflight_coalesced", "Calls served by another caller's in-flight computation", labels=["group"])
+        with _caches_lock:
+            groups = list(_flights)
+        for group in groups:
+            s = group.stats()
+            runs.add_metric([s["name"]], s["executions"])
+            shared.add_metric([s["name"]], s["coalesced"])
+        yield from (runs, shared)
+
+
+REGISTRY.register(_SingleFlightCollector())
+
+
+def render_metrics():
+    """(body, content type) for the /metrics endpoint."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,85 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger("model_registry")
+
+
+#  Lazy model registry
+
+class ModelRegistry:
+    """
+    Named, lazily-loaded models.
+
+    Agents register a loader per model at import time (cheap); the model is
+    only built on the first `get()` or by `warm_up()`. Each model loads at most
+    once, even when several request threads ask for it at the same time.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._info = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._warmup_thread = None
+
+    def register(self, name: str, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+            self._info[name] = {"loaded": False, "load_seconds": None, "error": None}
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str):
+        """Return the model, loading it on first use. Loader errors propagate."""
+        if name in self._models:
+            return self._models[name]
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            start = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._info[name]["error"] = str(e)
+                logger.error(f"⚠️ Failed to load model '{name}': {e}")
+                raise
+            elapsed = round(time.perf_counter() - start, 2)
+            self._models[name] = model
+            self._info[name].update(loaded=True, load_seconds=elapsed, error=None)
+            logger.info(f"✅ Model '{name}' ready in {elapsed}s")
+            return model
+
+    def warm_up(self, names: list = None, background: bool = True):
+        """Load the given (default: all) models, optionally in a daemon thread."""
+        names = list(names or self._loaders)
+
+        def load_all():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception:
+                    pass  # already logged and recorded in status()
+
+        if not background:
+            load_all()
+            return None
+        self._warmup_thread = threading.Thread(target=load_all, name="model-warmup", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
+
+    @property
+    def warming_up(self) -> bool:
+        return self._warmup_thread is not None and self._warmup_thread.is_alive()
+
+    def all_loaded(self) -> bool:
+        return all(name in self._models for name in self._loaders)
+
+    def status(self) -> dict:
+        return {name: dict(info) for name, info in self._info.items()}
+
+
+registry = ModelRegistry()
@@ -0,0 +1,121 @@
+import os
+import logging
+import numpy as np
+
+logger = logging.getLogger("onnx_models")
+
+# ONNX Runtime serving for the analyzer's sequence-classification models.
+# Models are produced by model-tune/export_onnx.py: each directory holds
+# model.onnx, the dynamically int8-quantized model.int8.onnx, and the
+# tokenizer/config files.
+
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", "0"))  # 0 = let ONNX Runtime decide
+
+
+def _softmax(x, axis=-1):
+    e = np.exp(x - x.max(axis=axis, keepdims=True))
+    return e / e.sum(axis=axis, keepdims=True)
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+class OnnxSequenceClassifier:
+    """Tokenizer + ONNX Runtime session returning raw logits."""
+
+    def __init__(self, model_dir: str, quantized: bool = True, max_length: int = 512):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        path = os.path.join(model_dir, "model.int8.onnx" if quantized else "model.onnx")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found, run model-tune/export_onnx.py first")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ONNX_THREADS:
+            options.intra_op_num_threads = ONNX_THREADS
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.config = AutoConfig.from_pretrained(model_dir)
+        self.max_length = max_length
+        logger.info(f"✅ Loaded ONNX model {path}")
+
+    def logits(self, texts: list, text_pairs: list = None):
+        enc = self.tokenizer(
+            texts, text_pairs, padding=True, truncation=True,
+            max_length=self.max_length, return_tensors="np",
+        )
+        feed = {k: v.astype(np.int64) for k, v in enc.items() if k in self.input_names}
+        return self.session.run(None, feed)[0]
+
+
+class OnnxTextClassificationPipeline:
+    """Drop-in for the transformers sentiment pipeline: [{"label", "score"}] per text."""
+
+    def __init__(self, model_dir: str, quantized: bool = True):
+        self.model = OnnxSequenceClassifier(model_dir, quantized)
+
+    def __call__(self, texts, batch_size: int = None):
+        if isinstance(texts, str):
+            texts = [texts]
+        probs = _softmax(self.model.logits(texts))
+        best = probs.argmax(axis=-1)
+        id2label = self.model.config.id2label
+        return [{"label": id2label[int(i)], "score": float(p[i])} for p, i in zip(probs, best)]
+
+
+class OnnxFineTunedGenreClassifier:
+    """ONNX version of the fine-tuned multi-label DistilBERT genre model."""
+    name = "finetuned"
+    threshold = 0.5
+
+    def __init__(self, model_dir: str, labels: list, quantized: bool = True):
+        self.model = OnnxSequenceClassifier(model_dir, quantized, max_length=128)
+        self.labels = labels
+
+    def predict(self, texts: list):
+        scores = _sigmoid(self.model.logits(texts))
+        results = []
+        for row in scores:
+            order = np.argsort(-row)
+            results.append({
+                "labels": [self.labels[i] for i in order],
+                "scores": [float(row[i]) for i in order],
+            })
+        return results
+
+
+class OnnxZeroShotGenreClassifier:
+    """
+    ONNX version of the BART-MNLI zero-shot classifier. Scores each
+    (text, "This example is {label}.") pair the same way the transformers
+    pipeline does with multi_label=True: softmax over contradiction/entailment.
+    """
+    name = "zero-shot"
+    threshold = 0.25
+    hypothesis_template = "This example is {}."
+
+    def __init__(self, model_dir: str, labels: list, quantized: bool = True):
+        self.model = OnnxSequenceClassifier(model_dir, quantized)
+        self.labels = labels
+        label2id = {k.lower(): v for k, v in self.model.config.label2id.items()}
+        self.entail_id = next(v for k, v in label2id.items() if k.startswith("entail"))
+        self.contra_id = next(v for k, v in label2id.items() if k.startswith("contra"))
+
+    def predict(self, texts: list):
+        hypotheses = [self.hypothesis_template.format(label) for label in self.labels]
+        premises = [t for t in texts for _ in hypotheses]
+        logits = self.model.logits(premises, hypotheses * len(texts))
+        pair = logits[:, [self.contra_id, self.entail_id]]
+        scores = _softmax(pair)[:, 1].reshape(len(texts), len(self.labels))
+        results = []
+        for row in scores:
+            order = np.argsort(-row)
+            results.append({
+                "labels": [self.labels[i] for i in order],
+                "scores": [float(row[i]) for i in order],
+            })
+        return results
@@ -1,10 +1,27 @@
 
-from agents.preference_analyzer import analyze_preferences
-from agents.ir_agent import retrieve_movies
-from agents.shedule_creator_agent import create_schedule
+import os
+import time
+from agents.metrics import timed, observe_stage
+from agents.preference_analyzer import analyze_preferences, analyze_preferences_async
+from agents.ir_agent import retrieve_movies, retrieve_movies_async, retrieve_movies_stream
+from agents.shedule_creator_agent import create_schedule, create_schedule_async, parse_user_free_time
+from agents.inference import InferenceOverloaded
 
+# Analysis profile for orchestration when the request doesn't pick one; unset
+# means ANALYSIS_PROFILE. Retrieval never reads sentiment, so deployments that
+# don't show it can set "standard" (see ANALYSIS_PROFILES).
+ORCHESTRATE_PROFILE = os.getenv("ORCHESTRATE_PROFILE") or None
 
-def orchestrate_user_request(user_input: str, schedule_text: str = None):
+
+def target_runtime(schedule_text: str = None):
+    """Longest free slot in minutes, used by retrieval to rank movies that fit."""
+    if not schedule_text:
+        return None
+    return max((s["available_minutes"] for s in parse_user_free_time(schedule_text)), default=None)
+
+
+@timed("orchestrate")
+def orchestrate_user_request(user_input: str, schedule_text: str = None, profile: str = None):
     """
     Orchestrates the entire flow:
     - Analyze preferences
@@ -12,11 +29,11 @@ def orchestrate_user_request(user_input: str, schedule_text: str = None):
     - Optionally generate schedule (if schedule_text provided)
     """
     try:
-        analysis = analyze_preferences(user_input)
+        analysis = analyze_preferences(user_input, profile or ORCHESTRATE_PROFILE)
         if "error" in analysis:
             return {"error": analysis["error"]}
 
-        movies = retrieve_movies(analysis)
+        movies = retrieve_movies(analysis, target_runtime(schedule_text))
 
         schedule = None
         if schedule_text and movies:
@@ -28,3 +45,64 @@ def orchestrate_user_request(user_input: str, schedule_text: str = None):
         return {"error": f"Orchestrator failed: {str(e)}"}
 
 
+
+
+@timed("orchestrate")
+async def orchestrate_user_request_async(user_input: str, schedule_text: str = None, profile: str = None):
+    """Async orchestrate_user_request: inference off the event loop, TMDB I/O non-blocking."""
+    try:
+        analysis = await analyze_preferences_async(user_input, profile or ORCHESTRATE_PROFILE)
+        if "error" in analysis:
+            return {"error": analysis["error"]}
+
+        movies = await retrieve_movies_async(analysis, target_runtime(schedule_text))
+
+        schedule = None
+        if schedule_text and movies:
+            # every retrieved movie already carries a runtime, so this never hits TMDB
+            schedule = await create_schedule_async(movies, schedule_text)
+
+        return {"analysis": analysis, "movies": movies, "schedule": schedule}
+
+    except InferenceOverloaded:
+        raise
+    except Exception as e:
+        return {"error": f"Orchestrator failed: {str(e)}"}
+
+
+async def orchestrate_user_request_stream(user_input: str, schedule_text: str = None, profile: str = None):
+    """
+    Streaming orchestrate_user_request. Yields one event dict per step:
+      {"event": "analysis", "analysis": ...}         as soon as analysis is done
+      {"event": "movie", "rank": i, "movie": ...}    per movie, as its runtime resolves
+      {"event": "schedule", "schedule": ...}         once all movies are in
+      {"event": "done", "total_movies": n}
+    or {"event": "error", "error": ...}. InferenceOverloaded is raised before
+    the first event, so callers can still answer 503.
+    """
+    started = time.perf_counter()
+    try:
+        analysis = await analyze_preferences_async(user_input, profile or ORCHESTRATE_PROFILE)
+        if "error" in analysis:
+            yield {"event": "error", "error": analysis["error"]}
+            return
+        yield {"event": "analysis", "analysis": analysis}
+
+        by_rank = {}
+        async for rank, movie in retrieve_movies_stream(analysis, target_runtime(schedule_text)):
+            by_rank[rank] = movie
+            yield {"event": "movie", "rank": rank, "movie": movie}
+        movies = [by_rank[rank] for rank in sorted(by_rank)]
+
+        schedule = None
+        if schedule_text and movies:
+            schedule = await create_schedule_async(movies, schedule_text)
+        yield {"event": "schedule", "schedule": schedule}
+        yield {"event": "done", "total_movies": len(movies)}
+
+    except InferenceOverloaded:
+        raise
+    except Exception as e:
+        yield {"event": "error", "error": f"Orchestrator failed: {str(e)}"}
+    finally:
+        observe_stage("orchestrate", time.perf_counter() - started)
@@ -0,0 +1,153 @@
+import os
+import time
+import asyncio
+import logging
+from types import MappingProxyType
+from agents.tmdb_client import tmdb, TMDB_API_KEY
+from agents.ranking import with_genre_mask
+
+logger = logging.getLogger("popular_pool")
+
+# Popular / trending / per-genre top lists, prefetched off the request path with
+# runtimes attached. The fallback and genre-only retrieval branches read the
+# current snapshot instead of calling TMDB. A refresh builds a whole new
+# snapshot and swaps it in with one assignment; readers holding the old one
+# keep a consistent view, and a failed refresh leaves the old one in place.
+POPULAR_POOL_ENABLED = os.getenv("POPULAR_POOL", "1") == "1"
+POPULAR_POOL_REFRESH_S = float(os.getenv("POPULAR_POOL_REFRESH_S", "3600"))
+POPULAR_POOL_PAGES = int(os.getenv("POPULAR_POOL_PAGES", "2"))      # /movie/popular pages (20 movies each)
+POPULAR_POOL_RUNTIME_DEADLINE = float(os.getenv("POPULAR_POOL_RUNTIME_DEADLINE", "60"))
+# After a failed refresh, retry after 5s, 10s, 20s ... up to the cap, instead of
+# waiting a full refresh interval (possibly with no snapshot at all)
+POPULAR_POOL_RETRY_S = float(os.getenv("POPULAR_POOL_RETRY_S", "5"))
+POPULAR_POOL_RETRY_MAX_S = float(os.getenv("POPULAR_POOL_RETRY_MAX_S", "300"))
+
+
+class PopularPool:
+    """Immutable snapshot: tuples of read-only movie mappings, each with a runtime and a genre_mask."""
+
+    def __init__(self, popular, trending, by_genre: dict):
+        freeze = lambda movies: tuple(MappingProxyType(with_genre_mask(m)) for m in movies)
+        self.popular = freeze(popular)
+        self.trending = freeze(trending)
+        self.by_genre = MappingProxyType({gid: freeze(ms) for gid, ms in by_genre.items()})
+        self.built_at = time.time()
+
+    def genre(self, genre_id: int):
+        """Top movies for a TMDB genre id, or None if that genre isn't pooled."""
+        return self.by_genre.get(genre_id)
+
+    def fallback(self):
+        """Popular then trending movies, without duplicates."""
+        seen, movies = set(), []
+        for m in self.popular + self.trending:
+            if m["id"] not in seen:
+                seen.add(m["id"])
+                movies.append(m)
+        return movies
+
+    def stats(self) -> dict:
+        return {
+            "popular": len(self.popular),
+            "trending": len(self.trending),
+            "genres": {gid: len(ms) for gid, ms in self.by_genre.items()},
+            "age_s": round(time.time() - self.built_at, 1),
+        }
+
+
+_pool = None
+_refresher = None
+
+
+def get_popular_pool():
+    """Current PopularPool snapshot, or None before the first successful refresh."""
+    return _pool
+
+
+async def _results(endpoint: str, path: str, params: dict):
+    data = await tmdb.aget_json(endpoint, path, {"language": "en-US", **params})
+    return [m for m in data.get("results", []) if m.get("id") and m.get("title")]
+
+
+async def build_pool(genre_ids) -> PopularPool:
+    """Fetch every list concurrently, then attach runtimes to each distinct movie once."""
+    from agents.ir_agent import add_runtimes_async  # ir_agent reads the pool, so import lazily
+
+    genre_ids = sorted(set(genre_ids))
+    lists = await asyncio.gather(
+        *(_results("movie/popular", "movie/popular", {"page": p}) for p in range(1, POPULAR_POOL_PAGES + 1)),
+        _results("trending/movie", "trending/movie/week", {}),
+        *(_results("discover/movie", "discover/movie", {
+            "with_genres": gid, "sort_by": "popularity.desc", "vote_count.gte": 100, "include_adult": "false",
+        }) for gid in genre_ids),
+    )
+    popular = [m for page in lists[:POPULAR_POOL_PAGES] for m in page]
+    trending = lists[POPULAR_POOL_PAGES]
+    by_genre = dict(zip(genre_ids, lists[POPULAR_POOL_PAGES + 1:]))
+
+    unique = {}
+    for movies in [popular, trending, *by_genre.values()]:
+        for m in movies:
+            unique.setdefault(m["id"], dict(m))
+    await add_runtimes_async(list(unique.values()), deadline=POPULAR_POOL_RUNTIME_DEADLINE)
+
+    attach = lambda movies: [unique[m["id"]] for m in movies]
+    return PopularPool(attach(popular), attach(trending), {gid: attach(ms) for gid, ms in by_genre.items()})
+
+
+async def refresh_pool(genre_ids=None):
+    """Build a new snapshot and swap it in; keeps the old one if the build fails."""
+    global _pool
+    if genre_ids is None:
+        from agents.ir_agent import GENRE_IDS
+        genre_ids = GENRE_IDS.values()
+    start = time.perf_counter()
+    try:
+        pool = await build_pool(genre_ids)
+    except Exception as e:
+        logger.error(f"Popular pool refresh failed, keeping previous snapshot: {e}")
+        return _pool
+    _pool = pool
+    logger.info(f"✅ Popular pool refreshed in {time.perf_counter() - start:.1f}s: {pool.stats()}")
+    return pool
+
+
+async def _refresh_forever(interval: float):
+    failures = 0
+    while True:
+        previous = _pool
+        pool = await refresh_pool()
+        if pool is not None and pool is not previous:
+            failures = 0
+            await asyncio.sleep(interval)
+            continue
+        delay = min(POPULAR_POOL_RETRY_S * 2 ** failures, POPULAR_POOL_RETRY_MAX_S, interval)
+        failures += 1
+        logger.warning(f"Retrying popular pool refresh in {delay:.0f}s")
+        await asyncio.sleep(delay)
+
+
+def start_popular_pool(interval: float = None):
+    """Start the refresher on the running event loop (no-op if disabled or without a TMDB key)."""
+    global _refresher
+    if not POPULAR_POOL_ENABLED or not TMDB_API_KEY:
+        logger.info("Popular pool disabled.")
+        return None
+    if _refresher is None or _refresher.done():
+        _refresher = asyncio.ensure_future(_refresh_forever(interval or POPULAR_POOL_REFRESH_S))
+    return _refresher
+
+
+async def stop_popular_pool():
+    global _refresher
+    if _refresher is not None:
+        _refresher.cancel()
+        try:
+            await _refresher
+        except asyncio.CancelledError:
+            pass
+        _refresher = None
+
+
+def pool_stats():
+    return _pool.stats() if _pool else None
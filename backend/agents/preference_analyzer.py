@@ -1,54 +1,217 @@
-import os, logging, re
-from fuzzywuzzy import fuzz
-import spacy
-import torch
-from transformers import pipeline
+import os, logging, re, copy, time, asyncio
+from agents.actor_index import get_actor_index
+from agents.batching import MicroBatcher
+from agents.cache import TTLCache
+from agents.inference import run_inference, run_batched
+from agents.metrics import timed, track_cache, track_singleflight
+from agents.model_registry import registry
+from agents.singleflight import SingleFlight
 
 logger = logging.getLogger("preference_agent")
 
+# Micro-batching of concurrent analyze requests (see analyze_preferences)
+BATCHING_ENABLED = os.getenv("ANALYZER_BATCHING", "1") == "1"
+BATCH_MAX_SIZE = int(os.getenv("ANALYZER_BATCH_MAX_SIZE", "16"))
+BATCH_MAX_WAIT_MS = float(os.getenv("ANALYZER_BATCH_MAX_WAIT_MS", "5"))
+
+# Memoized analysis results, keyed on normalized input text
+analysis_cache = track_cache(TTLCache(
+    maxsize=int(os.getenv("ANALYSIS_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("ANALYSIS_CACHE_TTL", "3600")),
+    name="analysis",
+))
+
+# Identical inputs arriving together share one model pass (keyed like the cache)
+analysis_flight = track_singleflight(SingleFlight("analysis"))
+
+# Models are loaded lazily through the model registry (first use or warm-up),
+# so importing this module stays cheap. spaCy, torch and transformers are only
+# imported inside the loaders.
+
+def _device():
+    import torch
+    return 0 if torch.cuda.is_available() else -1
+
+
+# "torch" (transformers pipelines) or "onnx" (ONNX Runtime, see agents/onnx_models.py).
+# ONNX models come from model-tune/export_onnx.py; int8-quantized unless ONNX_QUANTIZED=0.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_MODEL_DIR = os.getenv(
+    "ONNX_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model-tune", "onnx"),
+)
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "1") == "1"
+
+
+# How person names are found:
+#   "full"      - whole spaCy pipeline, PERSON entities plus a fuzzy scan of the
+#                 text for every known actor (the original behaviour)
+#   "ner"       - spaCy with everything but NER excluded, plus an EntityRuler
+#                 gazetteer of the known actors in front of it
+#   "gazetteer" - the EntityRuler alone on a blank tokenizer: no statistical
+#                 model, only known actors (case-insensitive, exact) are found
+NER_MODE = os.getenv("NER_MODE", "full")
+NER_MODES = ("full", "ner", "gazetteer")
+
+# Components the "ner" mode drops; the transformer stays since trf NER listens to it
+NER_EXCLUDE = ["tok2vec", "tagger", "morphologizer", "parser", "senter", "attribute_ruler", "lemmatizer"]
+
+
+def add_actor_ruler(nlp, before: str = None):
+    """EntityRuler with one lowercase phrase pattern per known actor (ent_id = canonical name)."""
+    ruler = nlp.add_pipe("entity_ruler", before=before, config={"phrase_matcher_attr": "LOWER"})
+    ruler.add_patterns([{"label": "PERSON", "pattern": name, "id": name} for name in get_actor_index().names])
+    return nlp
+
+
 #Named Entity Recognition(NER) for detecting actor/person names
-try:
-    nlp = spacy.load("en_core_web_trf")
-    logger.info("✅ Loaded SpaCy transformer model (en_core_web_trf)")
-except Exception:
-    nlp = spacy.load("en_core_web_sm")
-    logger.warning("⚠️ Using fallback SpaCy small model (en_core_web_sm)")
+def load_nlp(mode: str = None):
+    import spacy
+    mode = mode or NER_MODE
+    if mode not in NER_MODES:
+        raise ValueError(f"Unknown NER_MODE '{mode}' (expected one of {', '.join(NER_MODES)})")
+    if mode == "gazetteer":
+        logger.info("✅ Using gazetteer-only entity extraction (blank spaCy + EntityRuler)")
+        return add_actor_ruler(spacy.blank("en"))
+
+    exclude = NER_EXCLUDE if mode == "ner" else []
+    try:
+        nlp = spacy.load("en_core_web_trf", exclude=exclude)
+        logger.info(f"✅ Loaded SpaCy transformer model (en_core_web_trf), pipes: {nlp.pipe_names}")
+    except Exception:
+        nlp = spacy.load("en_core_web_sm", exclude=exclude)
+        logger.warning(f"⚠️ Using fallback SpaCy small model (en_core_web_sm), pipes: {nlp.pipe_names}")
+    if mode == "ner":
+        add_actor_ruler(nlp, before="ner")
+    return nlp
+
 
 #Sentiment analysis component
-sentiment_pipe = pipeline(
-    "sentiment-analysis",
-    model="distilbert-base-uncased-finetuned-sst-2-english",
-    device=0 if torch.cuda.is_available() else -1,
-)
+def load_sentiment_pipe():
+    if INFERENCE_BACKEND == "onnx":
+        try:
+            from agents.onnx_models import OnnxTextClassificationPipeline
+            return OnnxTextClassificationPipeline(os.path.join(ONNX_MODEL_DIR, "sentiment"), ONNX_QUANTIZED)
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX sentiment model unavailable ({e}), using PyTorch")
+
+    from transformers import pipeline
+    return pipeline(
+        "sentiment-analysis",
+        model="distilbert-base-uncased-finetuned-sst-2-english",
+        device=_device(),
+    )
 
-#Genre classification using zero-shot learning
+#Genre classification (pluggable backend)
 GENRES = [
     "action", "romance", "comedy", "drama", "thriller", "horror",
     "fantasy", "sci-fi", "animation", "adventure"
 ]
 
-# Load the BART zero-shot model
-try:
-    genre_pipe = pipeline(
-        "zero-shot-classification",
-        model="facebook/bart-large-mnli",
-        device=0 if torch.cuda.is_available() else -1,
-    )
-    logger.info("✅ Loaded zero-shot genre classifier (facebook/bart-large-mnli)")
-except Exception as e:
-    logger.error(f"⚠️ Could not load genre classifier: {e}")
-    genre_pipe = None
-
-#Known actors for fuzzy correction
-KNOWN_ACTORS = [
-    "Tom Holland", "Zendaya", "Dwayne Johnson", "Chris Hemsworth",
-    "Robert Downey Jr", "Scarlett Johansson", "Emma Stone", "Ryan Gosling",
-    "Chris Evans", "Tom Cruise", "Margot Robbie", "Hugh Jackman", "Gal Gadot",
-    "Ryan Reynolds", "Benedict Cumberbatch", "Vin Diesel", "Mark Ruffalo",
-    "Matthew Perry", "Leonardo DiCaprio", "Natalie Portman", "Anne Hathaway",
-    "Florence Pugh", "Cillian Murphy", "Timothée Chalamet", "Will Smith",
-    "Brad Pitt", "Angelina Jolie", "Keanu Reeves", "Henry Cavill"
-]
+# "zero-shot" (BART-large-MNLI, one NLI pass per label) or
+# "finetuned" (multi-label DistilBERT from model-tune/train_genre_model.py, one pass)
+GENRE_BACKEND = os.getenv("GENRE_BACKEND", "zero-shot")
+GENRE_MODEL_DIR = os.getenv(
+    "GENRE_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "model-tune", "genre_model"),
+)
+
+
+class ZeroShotGenreClassifier:
+    """Zero-shot genre scores from facebook/bart-large-mnli."""
+    name = "zero-shot"
+    threshold = 0.25
+
+    def __init__(self, model: str = "facebook/bart-large-mnli"):
+        from transformers import pipeline
+        self.pipe = pipeline(
+            "zero-shot-classification",
+            model=model,
+            device=_device(),
+        )
+
+    def predict(self, texts: list):
+        """Return one {"labels": [...], "scores": [...]} dict per text."""
+        results = self.pipe(texts, candidate_labels=GENRES, multi_label=True, batch_size=len(texts))
+        # a single input comes back as a dict rather than a list
+        return [results] if isinstance(results, dict) else results
+
+
+class FineTunedGenreClassifier:
+    """Multi-label genre scores (sigmoid) from the fine-tuned DistilBERT model."""
+    name = "finetuned"
+    threshold = 0.5  # same cut-off the training script evaluates with
+
+    def __init__(self, model_dir: str = GENRE_MODEL_DIR):
+        from transformers import pipeline
+        self.pipe = pipeline(
+            "text-classification",
+            model=model_dir,
+            tokenizer=model_dir,
+            top_k=None,
+            function_to_apply="sigmoid",
+            device=_device(),
+        )
+
+    def _label(self, raw: str) -> str:
+        # the training script doesn't set id2label, so labels come back as LABEL_<i>
+        if raw.startswith("LABEL_"):
+            return GENRES[int(raw.split("_", 1)[1])]
+        return raw.lower()
+
+    def predict(self, texts: list):
+        """Return one {"labels": [...], "scores": [...]} dict per text."""
+        outputs = self.pipe(texts, batch_size=len(texts), truncation=True)
+        results = []
+        for scores in outputs:
+            scores = sorted(scores, key=lambda x: x["score"], reverse=True)
+            results.append({
+                "labels": [self._label(s["label"]) for s in scores],
+                "scores": [s["score"] for s in scores],
+            })
+        return results
+
+
+GENRE_BACKENDS = {
+    ZeroShotGenreClassifier.name: ZeroShotGenreClassifier,
+    FineTunedGenreClassifier.name: FineTunedGenreClassifier,
+}
+
+
+def build_genre_classifier(name: str, inference_backend: str = None):
+    """Instantiate genre backend `name` on PyTorch or, if configured and exported, ONNX Runtime."""
+    if (inference_backend or INFERENCE_BACKEND) == "onnx":
+        try:
+            from agents.onnx_models import OnnxZeroShotGenreClassifier, OnnxFineTunedGenreClassifier
+            cls = {
+                "zero-shot": OnnxZeroShotGenreClassifier,
+                "finetuned": OnnxFineTunedGenreClassifier,
+            }[name]
+            return cls(os.path.join(ONNX_MODEL_DIR, f"genre-{name}"), GENRES, ONNX_QUANTIZED)
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX genre model '{name}' unavailable ({e}), using PyTorch")
+    return GENRE_BACKENDS[name]()
+
+
+def load_genre_classifier(backend: str = GENRE_BACKEND):
+    """Load the configured genre backend, falling back to zero-shot, then to keywords only (None)."""
+    for name in dict.fromkeys([backend, ZeroShotGenreClassifier.name]):
+        if name not in GENRE_BACKENDS:
+            logger.error(f"⚠️ Unknown genre backend '{name}'")
+            continue
+        try:
+            classifier = build_genre_classifier(name)
+            logger.info(f"✅ Loaded genre classifier backend: {name}")
+            return classifier
+        except Exception as e:
+            logger.error(f"⚠️ Could not load genre classifier '{name}': {e}")
+    return None
+
+
+registry.register("ner", load_nlp)
+registry.register("gazetteer", lambda: load_nlp("gazetteer"))
+registry.register("sentiment", load_sentiment_pipe)
+registry.register("genre", load_genre_classifier)
 
 #Keyword-based fallback system
 GENRE_KEYWORDS = {
@@ -70,39 +233,49 @@ ADULT_KEYWORDS = [
 ]
 
 #Actor name extraction
-def extract_entities(text: str):
-    doc = nlp(text)
-    people = {ent.text.strip() for ent in doc.ents if ent.label_ == "PERSON"}
+def _people_from_doc(doc, text: str, mode: str = None):
+    # gazetteer hits carry the canonical actor name as ent_id
+    people = {(ent.ent_id_ or ent.text).strip() for ent in doc.ents if ent.label_ == "PERSON"}
 
-    # fuzzy match to known actors
-    for actor in KNOWN_ACTORS:
-        if fuzz.partial_ratio(actor.lower(), text.lower()) > 87:
-            people.add(actor)
+    # fuzzy match to known actors (shared list, see agents/actor_index.py);
+    # the ruler-based modes already matched them in the pipeline
+    actors = get_actor_index()
+    if (mode or NER_MODE) == "full":
+        people.update(actors.find_in_text(text, threshold=87))
 
     #Deduplicate similar names
-    clean_people = []
-    for p in sorted(people):
-        if not any(fuzz.ratio(p.lower(), existing.lower()) > 85 for existing in clean_people):
-            clean_people.append(p)
+    return {"people": actors.dedupe(people, threshold=85)}
 
-    return {"people": clean_people}
+
+@timed("ner")
+def extract_entities(text: str):
+    return _people_from_doc(registry.get("ner")(text), text)
+
+
+@timed("ner")
+def extract_entities_batch(texts: list, mode: str = None):
+    """People per text; `mode` "gazetteer" uses the ruler-only pipeline, anything else the configured one."""
+    if mode == "gazetteer":
+        nlp = registry.get("gazetteer")
+    else:
+        nlp, mode = registry.get("ner"), NER_MODE
+    docs = nlp.pipe(texts, batch_size=len(texts))
+    return [_people_from_doc(doc, text, mode) for doc, text in zip(docs, texts)]
 
 
 # Genre detection (hybrid)
-def classify_genre(text: str):
+def top_genres(result, threshold: float):
+    """Up to two labels from a classifier result that clear the confidence threshold."""
+    pairs = list(zip(result["labels"], result["scores"]))
+    top_two = sorted(pairs, key=lambda x: x[1], reverse=True)[:2]
+    return {label.lower() for label, score in top_two if score >= threshold}
+
+
+def _genres_from_result(result, text: str, threshold: float = 0.25):
     genres = set()
 
-    # Try zero-shot model
-    if genre_pipe:
-        print("🎬 Using BART zero-shot model for genre detection...")
-        result = genre_pipe(text, candidate_labels=GENRES, multi_label=True)
-        pairs = list(zip(result["labels"], result["scores"]))
-        top_two = sorted(pairs, key=lambda x: x[1], reverse=True)[:2]
-        for label, score in top_two:
-            if score >= 0.25:  # confidence threshold
-                genres.add(label.lower())
-    else:
-        print("⚠️ BART model not loaded — skipping to fallback.")
+    if result is not None:
+        genres = top_genres(result, threshold)
 
     # Fallback keyword method
     if not genres:
@@ -114,9 +287,27 @@ def classify_genre(text: str):
 
     return sorted(genres) or ["unspecified"]
 
+
+def classify_genre(text: str):
+    return classify_genre_batch([text])[0]
+
+
+@timed("genre")
+def classify_genre_batch(texts: list, use_model: bool = True):
+    if not use_model:
+        return [_genres_from_result(None, t) for t in texts]
+    genre_classifier = registry.get("genre")
+    if not genre_classifier:
+        print("⚠️ Genre model not loaded — skipping to fallback.")
+        return [_genres_from_result(None, t) for t in texts]
+
+    print(f"🎬 Using {genre_classifier.name} model for genre detection...")
+    results = genre_classifier.predict(texts)
+    return [_genres_from_result(r, t, genre_classifier.threshold) for r, t in zip(results, texts)]
+
+
 # Sentiment analysis function
-def analyze_sentiment(text: str):
-    res = sentiment_pipe(text[:512])[0]
+def _sentiment_from_result(res):
     label = res["label"].lower()
     sentiment = (
         "positive" if "pos" in label
@@ -125,8 +316,95 @@ def analyze_sentiment(text: str):
     )
     return {"sentiment": sentiment, "score": round(res["score"], 3)}
 
+
+@timed("sentiment")
+def analyze_sentiment(text: str):
+    return _sentiment_from_result(registry.get("sentiment")(text[:512])[0])
+
+
+@timed("sentiment")
+def analyze_sentiment_batch(texts: list):
+    results = registry.get("sentiment")([t[:512] for t in texts], batch_size=len(texts))
+    return [_sentiment_from_result(r) for r in results]
+
+
+# Analysis profiles: which method each stage uses, None = stage skipped.
+#   "fast"     - gazetteer people + keyword genres, no models beyond the EntityRuler
+#   "standard" - NER_MODE people + genre model; retrieval never reads sentiment
+#   "full"     - standard plus sentiment (the original behaviour)
+ANALYSIS_PROFILES = {
+    "fast": {"entities": "gazetteer", "genres": "keywords", "sentiment": None},
+    "standard": {"entities": NER_MODE, "genres": "model", "sentiment": None},
+    "full": {"entities": NER_MODE, "genres": "model", "sentiment": "model"},
+}
+ANALYSIS_PROFILE = os.getenv("ANALYSIS_PROFILE", "full")
+
+
+def resolve_profile(profile: str = None) -> str:
+    profile = profile or ANALYSIS_PROFILE
+    if profile not in ANALYSIS_PROFILES:
+        raise ValueError(f"Unknown analysis profile '{profile}' (expected one of {', '.join(ANALYSIS_PROFILES)})")
+    return profile
+
+
+# Batched model stage: each stage the profile needs runs once over all texts in the batch
+def run_models_batch(texts: list, profile: str = None):
+    """
+    Return (entities, genres, sentiment, stages) for each text. Skipped stages
+    give sentiment None and are left out of `stages`, which maps each stage
+    that ran to {"method", "batch_ms", "batch_size"}: the time is for the whole
+    pass over the batch, shared by every text in it.
+    """
+    plan = ANALYSIS_PROFILES[resolve_profile(profile)]
+    stages = {}
+
+    def run(stage, fn):
+        start = time.perf_counter()
+        out = fn()
+        stages[stage] = {"method": plan[stage], "batch_ms": round((time.perf_counter() - start) * 1000, 2),
+                         "batch_size": len(texts)}
+        return out
+
+    entities = run("entities", lambda: extract_entities_batch(texts, plan["entities"]))
+    genres = run("genres", lambda: classify_genre_batch(texts, plan["genres"] == "model"))
+    sentiments = (
+        run("sentiment", lambda: analyze_sentiment_batch(texts))
+        if plan["sentiment"] else [None] * len(texts)
+    )
+    return [(e, g, s, stages) for e, g, s in zip(entities, genres, sentiments)]
+
+
+def run_profile_batches(items: list):
+    """MicroBatcher entry point: items are (text, profile); one run_models_batch pass per profile."""
+    by_profile = {}
+    for i, (text, profile) in enumerate(items):
+        by_profile.setdefault(profile, []).append(i)
+    results = [None] * len(items)
+    for profile, indices in by_profile.items():
+        outputs = run_models_batch([items[i][0] for i in indices], profile)
+        for i, out in zip(indices, outputs):
+            results[i] = out
+    return results
+
+
+model_batcher = (
+    MicroBatcher(run_profile_batches, max_batch_size=BATCH_MAX_SIZE,
+                 max_wait_ms=BATCH_MAX_WAIT_MS, name="preference-models")
+    if BATCHING_ENABLED else None
+)
+
 # Main analyzer function
-def analyze_preferences(user_input: str):
+def normalize_input(text: str) -> str:
+    """Cache key for an input: lowercase with whitespace collapsed."""
+    return " ".join(text.lower().split())
+
+
+def _cache_key(user_input: str, profile: str) -> str:
+    return f"{profile}:{normalize_input(user_input)}"
+
+
+def _precheck(user_input: str, profile: str):
+    """Return an immediate response (error or cached analysis) for the input, or None."""
     if not user_input.strip():
         return {"error": "Empty input"}
 
@@ -136,21 +414,72 @@ def analyze_preferences(user_input: str):
             "error": "⚠️ Adult content detected. MovieRazzi cannot recommend explicit or NSFW movies. Please try again with family-safe preferences."
         }
 
-    entities = extract_entities(user_input)
-    genres = classify_genre(user_input)
-    sentiment = analyze_sentiment(user_input)
+    # Rejected inputs return above and never reach the cache; no stage runs on a hit
+    cached = analysis_cache.get(_cache_key(user_input, profile))
+    if cached is not None:
+        return {**copy.deepcopy(cached), "input_text": user_input, "stages": {}, "cached": True}
+    return None
 
-    summary = (
-        f"The user seems {sentiment['sentiment']} about movies. "
-        f"They prefer {', '.join(genres)}."
-    )
+
+def _build_result(user_input: str, profile: str, entities, genres, sentiment, stages):
+    summary = f"They prefer {', '.join(genres)}."
+    if sentiment is not None:
+        summary = f"The user seems {sentiment['sentiment']} about movies. " + summary
     if entities["people"]:
         summary += f" They mentioned {', '.join(entities['people'])}."
 
-    return {
+    result = {
         "input_text": user_input,
         "detected_genres": genres,
         "entities": entities,
         "sentiment": sentiment,
         "summary": summary,
+        "profile": profile,
+        "stages": stages,
     }
+    analysis_cache.set(_cache_key(user_input, profile), copy.deepcopy(result))
+    return result
+
+
+def _own_copy(result: dict, user_input: str) -> dict:
+    """Coalesced callers share one result object; each gets its own copy with its own input text."""
+    return {**copy.deepcopy(result), "input_text": user_input}
+
+
+@timed("analyze")
+def analyze_preferences(user_input: str, profile: str = None):
+    profile = resolve_profile(profile)
+    early = _precheck(user_input, profile)
+    if early is not None:
+        return early
+
+    def compute():
+        if model_batcher and ANALYSIS_PROFILES[profile]["genres"] == "model":
+            # concurrent /analyze and /orchestrate calls share one model pass
+            outputs = model_batcher((user_input, profile))
+        else:
+            outputs = run_models_batch([user_input], profile)[0]
+        return _build_result(user_input, profile, *outputs)
+
+    return _own_copy(analysis_flight.do(_cache_key(user_input, profile), compute), user_input)
+
+
+@timed("analyze")
+async def analyze_preferences_async(user_input: str, profile: str = None):
+    """Non-blocking analyze_preferences: model work runs off the event loop, within the in-flight limit."""
+    profile = resolve_profile(profile)
+    early = _precheck(user_input, profile)
+    if early is not None:
+        return early
+
+    async def compute():
+        if ANALYSIS_PROFILES[profile]["genres"] != "model":
+            # no transformer in the profile: skip the batcher and the in-flight limit
+            outputs = (await asyncio.to_thread(run_models_batch, [user_input], profile))[0]
+        elif model_batcher:
+            outputs = await run_batched(model_batcher, (user_input, profile))
+        else:
+            outputs = (await run_inference(run_models_batch, [user_input], profile))[0]
+        return _build_result(user_input, profile, *outputs)
+
+    return _own_copy(await analysis_flight.do_async(_cache_key(user_input, profile), compute), user_input)
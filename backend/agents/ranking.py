@@ -0,0 +1,126 @@
+import os
+import numpy as np
+
+# Vectorized candidate filtering and ranking for the IR agent. Every candidate
+# set is turned into NumPy arrays once (genre bitmask, popularity, vote
+# average, billing order, runtime) and scored in a single pass. Rows from the
+# popular pool and the local catalog carry a precomputed "genre_mask", so only
+# live TMDB results have their mask built per call.
+
+# All TMDB movie genre IDs, one bit each
+TMDB_GENRE_IDS = [
+    28, 12, 16, 35, 80, 99, 18, 10751, 14, 36,
+    27, 10402, 9648, 10749, 878, 10770, 53, 10752, 37,
+]
+GENRE_BITS = {gid: 1 << i for i, gid in enumerate(TMDB_GENRE_IDS)}
+
+# Weights of the scoring factors (each factor is scaled to 0..1)
+RANK_WEIGHTS = {
+    "genre_match": float(os.getenv("RANK_W_GENRE", "0.4")),
+    "popularity": float(os.getenv("RANK_W_POPULARITY", "0.25")),
+    "vote_average": float(os.getenv("RANK_W_VOTE", "0.2")),
+    "billing": float(os.getenv("RANK_W_BILLING", "0.1")),
+    "runtime_fit": float(os.getenv("RANK_W_RUNTIME", "0.05")),
+    "semantic": float(os.getenv("RANK_W_SEMANTIC", "0.3")),
+}
+
+
+def genre_mask(genre_ids) -> int:
+    mask = 0
+    for gid in genre_ids or ():
+        mask |= GENRE_BITS.get(gid, 0)
+    return mask
+
+
+def with_genre_mask(movie: dict) -> dict:
+    """Store the movie's genre bitmask on it (in place) so ranking can reuse it."""
+    movie["genre_mask"] = genre_mask(movie.get("genre_ids"))
+    return movie
+
+
+def genre_masks(movies) -> np.ndarray:
+    masks = (m["genre_mask"] if "genre_mask" in m else genre_mask(m.get("genre_ids")) for m in movies)
+    return np.fromiter(masks, dtype=np.int64, count=len(movies))
+
+
+def _popcount(a: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(a).astype(np.float64)
+    return np.unpackbits(a.astype(">i8").view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1).astype(np.float64)
+
+
+def filter_by_genre_ids(movies, genre_ids):
+    """Movies sharing at least one of `genre_ids`, in input order."""
+    wanted = genre_mask(genre_ids)
+    if not wanted or not movies:
+        return list(movies)
+    keep = (genre_masks(movies) & wanted) != 0
+    return [m for m, k in zip(movies, keep) if k]
+
+
+def _column(movies, key, default=np.nan) -> np.ndarray:
+    values = (m.get(key) for m in movies)
+    return np.fromiter((default if v is None else v for v in values), dtype=np.float64, count=len(movies))
+
+
+def score_candidates(movies, genre_ids=None, target_runtime: float = None, weights: dict = None):
+    """
+    Score every candidate in one vectorized pass.
+    Returns (scores, factors) where factors maps factor name -> per-movie array.
+    """
+    weights = weights or RANK_WEIGHTS
+    n = len(movies)
+    factors = {}
+
+    wanted = genre_mask(genre_ids)
+    if wanted:
+        overlap = _popcount(genre_masks(movies) & wanted)
+        factors["genre_match"] = overlap / _popcount(np.array([wanted], dtype=np.int64))[0]
+    else:
+        factors["genre_match"] = np.zeros(n)
+
+    popularity = np.log1p(np.nan_to_num(_column(movies, "popularity"), nan=0.0).clip(min=0))
+    top = popularity.max() if n else 0
+    factors["popularity"] = popularity / top if top > 0 else np.zeros(n)
+
+    factors["vote_average"] = np.nan_to_num(_column(movies, "vote_average"), nan=0.0).clip(0, 10) / 10
+
+    # billing order only exists for actor credits; lead roles score highest
+    order = np.abs(_column(movies, "order"))
+    factors["billing"] = np.where(np.isnan(order), 0.0, 1 / (1 + np.nan_to_num(order)))
+
+    runtime = _column(movies, "runtime")
+    if target_runtime:
+        fit = 1 - np.minimum(np.abs(runtime - target_runtime) / target_runtime, 1)
+        factors["runtime_fit"] = np.where(np.isnan(runtime), 0.5, fit)
+    else:
+        factors["runtime_fit"] = np.zeros(n)
+
+    # cosine similarity to the user's text, only present for semantic-index hits
+    similarity = _column(movies, "similarity")
+    if not np.isnan(similarity).all():
+        factors["semantic"] = np.nan_to_num(similarity, nan=0.0).clip(0, 1)
+
+    scores = np.zeros(n)
+    for name, values in factors.items():
+        scores += weights.get(name, 0) * values
+    return scores, factors
+
+
+def rank_movies(movies, genre_ids=None, top_k: int = None, target_runtime: float = None, weights: dict = None):
+    """
+    Return the top_k movies by score (ties keep input order). Each returned
+    movie is a copy carrying "score" and the weighted "factors" behind it.
+    """
+    if not movies:
+        return []
+    weights = weights or RANK_WEIGHTS
+    scores, factors = score_candidates(movies, genre_ids, target_runtime, weights)
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    ranked = []
+    for i in order:
+        m = dict(movies[i])
+        m["score"] = round(float(scores[i]), 4)
+        m["factors"] = {name: round(float(weights.get(name, 0) * values[i]), 4) for name, values in factors.items()}
+        ranked.append(m)
+    return ranked
@@ -0,0 +1,161 @@
+import os
+import time
+import logging
+import numpy as np
+
+logger = logging.getLogger("schedule_optimizer")
+
+# Multi-slot movie packing (a multiple-knapsack problem): every movie goes into
+# at most one slot, no slot is overfilled, and the total value is maximised.
+# A movie's value is its runtime weighted up by its relevance, so the solver
+# fills as much free time as it can and prefers better matches when choosing
+# between similar fills.
+#
+# Small inputs are solved exactly by DP over the tuple of per-slot loads.
+# Larger ones (or DP runs that exceed DP_MAX_STATES or half the time budget)
+# use best-fit decreasing followed by slot-by-slot exact knapsack re-packing,
+# stopping at SCHEDULE_TIME_BUDGET_MS.
+
+SCHEDULE_TIME_BUDGET_MS = float(os.getenv("SCHEDULE_TIME_BUDGET_MS", "200"))
+SCHEDULE_RELEVANCE_WEIGHT = float(os.getenv("SCHEDULE_RELEVANCE_WEIGHT", "1.0"))
+DP_MAX_ITEMS = int(os.getenv("SCHEDULE_DP_MAX_ITEMS", "24"))
+DP_MAX_STATES = int(os.getenv("SCHEDULE_DP_MAX_STATES", "50000"))
+HEURISTIC_POOL = 200  # best-density movies considered per slot re-pack
+
+
+def movie_values(runtimes, relevance=None, weight: float = None) -> np.ndarray:
+    """runtime * (1 + weight * relevance), relevance scaled to 0..1 by the best score."""
+    weight = SCHEDULE_RELEVANCE_WEIGHT if weight is None else weight
+    runtimes = np.asarray(runtimes, dtype=np.float64)
+    if relevance is None:
+        return runtimes
+    rel = np.nan_to_num(np.asarray(relevance, dtype=np.float64), nan=0.0).clip(min=0)
+    top = rel.max() if len(rel) else 0
+    return runtimes * (1 + weight * (rel / top if top > 0 else rel))
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+#  Exact: DP over per-slot loads
+
+def _solve_dp(runtimes, values, capacities, deadline):
+    """
+    Exact multiple-knapsack by DP over reachable (load per slot) states.
+    Returns the assignment (slot index or -1 per movie) or raises _OutOfBudget.
+    """
+    n, slots = len(runtimes), len(capacities)
+    # state -> (value, packed assignment: base slots+1 digit per movie, 0 = unused)
+    states = {tuple([0] * slots): (0.0, 0)}
+    base = slots + 1
+    for i in range(n):
+        r, v, digit = runtimes[i], values[i], base ** i
+        nxt = dict(states)
+        for loads, (val, code) in states.items():
+            for s in range(slots):
+                if loads[s] + r > capacities[s]:
+                    continue
+                new = loads[:s] + (loads[s] + r,) + loads[s + 1:]
+                cand = val + v
+                old = nxt.get(new)
+                if old is None or cand > old[0]:
+                    nxt[new] = (cand, code + (s + 1) * digit)
+        states = nxt
+        if len(states) > DP_MAX_STATES or time.perf_counter() > deadline:
+            raise _OutOfBudget()
+
+    _, code = max(states.values(), key=lambda x: x[0])
+    assignment = []
+    for _ in range(n):
+        code, d = divmod(code, base)
+        assignment.append(d - 1)
+    return assignment
+
+
+#  Heuristic: best-fit decreasing + per-slot knapsack re-packing
+
+def _knapsack(runtimes, values, capacity):
+    """Exact 0/1 knapsack (integer runtimes), vectorised over capacities. Returns chosen indices."""
+    dp = np.zeros(capacity + 1)
+    take = np.zeros((len(runtimes), capacity + 1), dtype=bool)
+    for i, (r, v) in enumerate(zip(runtimes, values)):
+        if r > capacity:
+            continue
+        cand = dp[:capacity + 1 - r] + v
+        better = cand > dp[r:]
+        take[i, r:] = better
+        dp[r:] = np.where(better, cand, dp[r:])
+    chosen, c = [], capacity
+    for i in range(len(runtimes) - 1, -1, -1):
+        if take[i, c]:
+            chosen.append(i)
+            c -= runtimes[i]
+    return chosen
+
+
+def _solve_heuristic(runtimes, values, capacities, deadline):
+    n = len(runtimes)
+    assignment = [-1] * n
+    remaining = list(capacities)
+
+    # best-fit decreasing by value density, then value
+    order = sorted(range(n), key=lambda i: (-values[i] / max(runtimes[i], 1), -values[i]))
+    for i in order:
+        fits = [s for s in range(len(remaining)) if runtimes[i] <= remaining[s]]
+        if fits:
+            s = min(fits, key=lambda s: remaining[s])
+            assignment[i] = s
+            remaining[s] -= runtimes[i]
+
+    # re-pack one slot at a time from its own movies + the unused ones, until stable
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+        for s, capacity in enumerate(capacities):
+            if time.perf_counter() > deadline:
+                break
+            mine = [i for i in range(n) if assignment[i] == s]
+            free = [i for i in order if assignment[i] == -1][:HEURISTIC_POOL]
+            pool = mine + free
+            chosen = [pool[j] for j in _knapsack([runtimes[i] for i in pool], [values[i] for i in pool], capacity)]
+            if sum(values[i] for i in chosen) > sum(values[i] for i in mine) + 1e-9:
+                for i in mine:
+                    assignment[i] = -1
+                for i in chosen:
+                    assignment[i] = s
+                improved = True
+    return assignment
+
+
+#  Entry point
+
+def optimize_schedule(runtimes, capacities, values=None, time_budget_ms: float = None):
+    """
+    Assign movies to slots. `runtimes` and `capacities` are minutes; `values`
+    defaults to the runtimes (pure fill). Returns (assignment, info) where
+    assignment[i] is the slot index of movie i or -1, and info reports the
+    method used, whether the result is provably optimal, and solve time.
+    """
+    start = time.perf_counter()
+    budget = SCHEDULE_TIME_BUDGET_MS if time_budget_ms is None else time_budget_ms
+    deadline = start + budget / 1000
+    runtimes = [int(r) for r in runtimes]
+    capacities = [int(c) for c in capacities]
+    values = [float(v) for v in (runtimes if values is None else values)]
+
+    method, optimal = "heuristic", False
+    if len(runtimes) <= DP_MAX_ITEMS:
+        try:
+            assignment = _solve_dp(runtimes, values, capacities, start + budget / 2000)
+            method, optimal = "dp", True
+        except _OutOfBudget:
+            logger.info("Schedule DP over budget, using heuristic.")
+    if not optimal:
+        assignment = _solve_heuristic(runtimes, values, capacities, deadline)
+
+    return assignment, {
+        "method": method,
+        "optimal": optimal,
+        "solve_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
@@ -0,0 +1,299 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+import numpy as np
+from agents.model_registry import registry
+
+logger = logging.getLogger("semantic_index")
+
+# Sentence-embedding index over catalog overviews. Vectors are L2-normalised
+# float16 rows in a flat file that is memory-mapped for search, with a parallel
+# int64 file of movie IDs. Adds append to both files, so the index can grow
+# incrementally without a rebuild.
+
+SEMANTIC_INDEX_PATH = os.getenv(
+    "SEMANTIC_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "semantic_index"),
+)
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+SEARCH_CHUNK = 4096  # rows converted to float32 and scored per matmul (stays in cache)
+
+# Approximate search (IVF): rows are bucketed by their nearest k-means centroid
+# and a query only scores the SEMANTIC_NPROBE closest buckets. Indexes smaller
+# than SEMANTIC_IVF_MIN vectors are searched exactly.
+SEMANTIC_NPROBE = int(os.getenv("SEMANTIC_NPROBE", "16"))
+SEMANTIC_IVF_MIN = int(os.getenv("SEMANTIC_IVF_MIN", "50000"))
+
+
+#  Embedding model (small, CPU friendly)
+
+class SentenceEmbedder:
+    """Mean-pooled, L2-normalised sentence embeddings from a transformers encoder."""
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+        self.torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name).eval()
+        self.model_name = model_name
+        self.dim = self.model.config.hidden_size
+
+    def encode(self, texts: list, batch_size: int = 64) -> np.ndarray:
+        out = []
+        for i in range(0, len(texts), batch_size):
+            enc = self.tokenizer(texts[i:i + batch_size], padding=True, truncation=True,
+                                 max_length=256, return_tensors="pt")
+            with self.torch.no_grad():
+                hidden = self.model(**enc).last_hidden_state
+            mask = enc["attention_mask"].unsqueeze(-1).float()
+            pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+            out.append(self.torch.nn.functional.normalize(pooled, dim=-1).numpy())
+        return np.vstack(out).astype(np.float32) if out else np.zeros((0, 0), dtype=np.float32)
+
+
+#  Index
+
+class SemanticIndex:
+    """
+    Append-only, memory-mapped float16 vector index with cosine search: exact
+    (chunked brute force) by default, approximate (IVF) once `train_ivf` has run.
+    """
+
+    def __init__(self, path: str = SEMANTIC_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.dim = self.meta["dim"]
+        self._load()
+
+    @classmethod
+    def create(cls, path: str, dim: int, model: str = EMBEDDING_MODEL):
+        os.makedirs(path, exist_ok=True)
+        for name in ("vectors.f16", "ids.i64", "lists.i32", "centroids.f32"):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+        for name in ("vectors.f16", "ids.i64"):
+            open(os.path.join(path, name), "wb").close()
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"dim": dim, "count": 0, "model": model}, f)
+        return cls(path)
+
+    def _load(self):
+        count = self.meta["count"]
+        if count:
+            self.vectors = np.memmap(os.path.join(self.path, "vectors.f16"), dtype=np.float16,
+                                     mode="r", shape=(count, self.dim))
+            self.ids = np.fromfile(os.path.join(self.path, "ids.i64"), dtype=np.int64, count=count)
+        else:
+            self.vectors = np.zeros((0, self.dim), dtype=np.float16)
+            self.ids = np.zeros(0, dtype=np.int64)
+
+        self.centroids = None
+        if self.meta.get("ivf_lists"):
+            n_lists = self.meta["ivf_lists"]
+            self.centroids = np.fromfile(os.path.join(self.path, "centroids.f32"),
+                                         dtype=np.float32).reshape(n_lists, self.dim)
+            lists = np.fromfile(os.path.join(self.path, "lists.i32"), dtype=np.int32, count=count)
+            # rows grouped by list: rows of list c are order[offsets[c]:offsets[c + 1]]
+            self._order = np.argsort(lists, kind="stable")
+            self._offsets = np.searchsorted(lists[self._order], np.arange(n_lists + 1))
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest centroid per row (vectors are unit length, so max dot product)."""
+        out = np.empty(len(vectors), dtype=np.int32)
+        for i in range(0, len(vectors), SEARCH_CHUNK):
+            out[i:i + SEARCH_CHUNK] = np.argmax(
+                np.asarray(vectors[i:i + SEARCH_CHUNK], dtype=np.float32) @ self.centroids.T, axis=1
+            )
+        return out
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def add(self, ids, vectors: np.ndarray):
+        """Append vectors (one row per id) and remap."""
+        vectors = np.asarray(vectors, dtype=np.float16)
+        ids = np.asarray(ids, dtype=np.int64)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"expected {len(ids)} x {self.dim} vectors, got {vectors.shape}")
+        with self._lock:
+            with open(os.path.join(self.path, "vectors.f16"), "ab") as f:
+                f.write(vectors.tobytes())
+            with open(os.path.join(self.path, "ids.i64"), "ab") as f:
+                f.write(ids.tobytes())
+            if self.centroids is not None:
+                with open(os.path.join(self.path, "lists.i32"), "ab") as f:
+                    f.write(self._assign(vectors).tobytes())
+            self.meta["count"] += len(ids)
+            with open(os.path.join(self.path, "meta.json"), "w") as f:
+                json.dump(self.meta, f)
+            self._load()
+
+    def train_ivf(self, n_lists: int = None, iters: int = 10, sample: int = 50000, seed: int = 0):
+        """Cluster the index with spherical k-means and bucket every row (enables nprobe search)."""
+        count = len(self)
+        n_lists = n_lists or max(1, int(np.sqrt(count)))
+        rng = np.random.default_rng(seed)
+        rows = np.sort(rng.choice(count, size=min(count, max(sample, n_lists)), replace=False))
+        train = np.asarray(self.vectors[rows], dtype=np.float32)
+        centroids = train[rng.choice(len(train), size=n_lists, replace=False)]
+        for _ in range(iters):
+            labels = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, train)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+
+        with self._lock:
+            self.centroids = centroids.astype(np.float32)
+            self.centroids.tofile(os.path.join(self.path, "centroids.f32"))
+            self._assign(self.vectors).tofile(os.path.join(self.path, "lists.i32"))
+            self.meta["ivf_lists"] = n_lists
+            with open(os.path.join(self.path, "meta.json"), "w") as f:
+                json.dump(self.meta, f)
+            self._load()
+        logger.info(f"Trained IVF with {n_lists} lists over {count} vectors")
+
+    def _top_k(self, rows, q: np.ndarray, k: int):
+        """Exact top-k over `rows` (a slice or sorted row indices), scored in chunks."""
+        vectors = self.vectors
+        n = rows.stop - rows.start if isinstance(rows, slice) else len(rows)
+        buf = np.empty((min(SEARCH_CHUNK, n), self.dim), dtype=np.float32)
+        best_scores, best_rows = [], []
+        for start in range(0, n, SEARCH_CHUNK):
+            if isinstance(rows, slice):
+                idx = np.arange(rows.start + start, rows.start + min(start + SEARCH_CHUNK, n))
+                chunk = vectors[idx[0]:idx[-1] + 1]
+            else:
+                idx = rows[start:start + SEARCH_CHUNK]
+                chunk = vectors[idx]
+            block = buf[:len(idx)]
+            block[...] = chunk
+            scores = block @ q
+            take = min(k, len(scores))
+            top = np.argpartition(-scores, take - 1)[:take]
+            best_scores.append(scores[top])
+            best_rows.append(idx[top])
+        if not best_scores:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+        scores, rows = np.concatenate(best_scores), np.concatenate(best_rows)
+        order = np.argsort(-scores, kind="stable")[:k]
+        return scores[order], rows[order]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = None):
+        """
+        Top-k (movie_id, cosine similarity) for one normalised query vector.
+        Uses the IVF buckets when trained and the index has at least
+        SEMANTIC_IVF_MIN rows; `nprobe=0` forces an exact search.
+        """
+        if not len(self):
+            return []
+        ids = self.ids
+        q = np.asarray(query, dtype=np.float32).reshape(-1)
+        nprobe = SEMANTIC_NPROBE if nprobe is None else nprobe
+
+        if self.centroids is not None and nprobe and len(self) >= SEMANTIC_IVF_MIN:
+            probe = np.argsort(-(self.centroids @ q))[:nprobe]
+            rows = np.sort(np.concatenate([self._order[self._offsets[c]:self._offsets[c + 1]] for c in probe]))
+            scores, rows = self._top_k(rows, q, k)
+        else:
+            scores, rows = self._top_k(slice(0, len(ids)), q, k)
+        return [(int(ids[r]), float(s)) for r, s in zip(rows, scores)]
+
+
+#  Shared instances
+#
+# The index loads on first use (or in the lifespan warm-up, see app/main.py),
+# never at import. The embedder is only registered once an index exists, so
+# deployments without one don't load (or wait on readiness for) an extra model.
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _register_embedder(model_name: str):
+    if "embedder" not in registry.status():
+        registry.register("embedder", lambda: SentenceEmbedder(model_name))
+
+
+def get_semantic_index():
+    """Shared SemanticIndex for SEMANTIC_INDEX_PATH, or None if it hasn't been built."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None and os.path.exists(os.path.join(SEMANTIC_INDEX_PATH, "meta.json")):
+                _index = SemanticIndex(SEMANTIC_INDEX_PATH)
+                _register_embedder(_index.meta["model"])
+                logger.info(f"✅ Loaded semantic index {SEMANTIC_INDEX_PATH} ({len(_index)} vectors)")
+    return _index
+
+
+def semantic_search(text: str, k: int = 10):
+    """Embed free text and return the k nearest (movie_id, similarity) pairs (blocking)."""
+    index = get_semantic_index()
+    if index is None or not len(index):
+        return []
+    query = registry.get("embedder").encode([text])[0]
+    return index.search(query, k)
+
+
+#  Build / incremental add from the local catalog
+
+def index_catalog(catalog_path: str, index_path: str = SEMANTIC_INDEX_PATH, batch: int = 256) -> int:
+    """Embed every catalog movie not yet in the index. Returns the number added."""
+    from agents.catalog import MovieCatalog
+
+    embedder = SentenceEmbedder()
+    if os.path.exists(os.path.join(index_path, "meta.json")):
+        index = SemanticIndex(index_path)
+    else:
+        index = SemanticIndex.create(index_path, embedder.dim, embedder.model_name)
+    known = set(index.ids.tolist())
+
+    catalog = MovieCatalog(catalog_path)
+    rows = catalog._query("SELECT id, title, overview FROM movies ORDER BY id")
+    todo = [r for r in rows if r["id"] not in known and (r["overview"] or r["title"])]
+    start = time.perf_counter()
+    for i in range(0, len(todo), batch):
+        chunk = todo[i:i + batch]
+        texts = [f"{r['title']}. {r['overview'] or ''}" for r in chunk]
+        index.add([r["id"] for r in chunk], embedder.encode(texts))
+        logger.info(f"Indexed {min(i + batch, len(todo))}/{len(todo)} movies")
+    logger.info(f"Added {len(todo)} vectors in {time.perf_counter() - start:.1f}s")
+    if index.centroids is None and len(index) >= SEMANTIC_IVF_MIN:
+        index.train_ivf()
+    return len(todo)
+
+
+#  CLI: python -m agents.semantic_index build --catalog catalog.db
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build or extend the semantic overview index")
+    parser.add_argument("command", choices=["build", "add", "train", "query"],
+                        help="build: fresh index, add: embed only new catalog movies, "
+                             "train: (re)cluster for approximate search, query: test search")
+    parser.add_argument("--catalog", default=None, help="Catalog DB (default: CATALOG_PATH)")
+    parser.add_argument("--index", default=SEMANTIC_INDEX_PATH)
+    parser.add_argument("--text", default=None, help="Query text for the query command")
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "query":
+        index = SemanticIndex(args.index)
+        vec = SentenceEmbedder(index.meta["model"]).encode([args.text])[0]
+        print(json.dumps(index.search(vec, args.k), indent=2))
+    elif args.command == "train":
+        SemanticIndex(args.index).train_ivf()
+    else:
+        from agents.catalog import CATALOG_PATH
+        if args.command == "build" and os.path.exists(args.index):
+            if os.path.exists(os.path.join(args.index, "meta.json")):
+                os.remove(os.path.join(args.index, "meta.json"))
+        n = index_catalog(args.catalog or CATALOG_PATH, args.index)
+        print(f"✅ Indexed {n} movies into {args.index}")
@@ -1,15 +1,18 @@
 
 import os
-import re
+import asyncio
 import logging
-import requests
+from datetime import datetime
+from agents.tmdb_client import tmdb, TMDB_API_KEY
+from agents.schedule_optimizer import optimize_schedule, movie_values
+from agents.free_time_parser import parse_free_time
+from agents.metrics import timed
 
 logger = logging.getLogger("schedule_agent")
 
-TMDB_API_KEY = os.getenv("TMDB_API_KEY")
-TMDB_BASE = "https://api.themoviedb.org/3"
-
-DAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+# "optimal" (each movie at most once, slots packed by agents/schedule_optimizer.py)
+# or "greedy" (shortest-first per slot, the original behaviour)
+SCHEDULE_STRATEGY = os.getenv("SCHEDULE_STRATEGY", "optimal")
 
 
 
@@ -19,13 +22,20 @@ def get_movie_runtime(movie_id: int) -> int:
     try:
         if not TMDB_API_KEY:
             return 120
-        res = requests.get(
-            f"{TMDB_BASE}/movie/{movie_id}",
-            params={"api_key": TMDB_API_KEY},
-            timeout=10,
-        )
-        if res.ok:
-            return int(res.json().get("runtime") or 120)
+        # same key as ir_agent's runtime lookups, so enriched movies are never refetched
+        data = tmdb.get_json("movie", f"movie/{movie_id}", {"language": "en-US"})
+        return int(data.get("runtime") or 120)
+    except Exception as e:
+        logger.warning(f"Runtime fetch failed for {movie_id}: {e}")
+    return 120
+
+
+async def get_movie_runtime_async(movie_id: int) -> int:
+    try:
+        if not TMDB_API_KEY:
+            return 120
+        data = await tmdb.aget_json("movie", f"movie/{movie_id}", {"language": "en-US"})
+        return int(data.get("runtime") or 120)
     except Exception as e:
         logger.warning(f"Runtime fetch failed for {movie_id}: {e}")
     return 120
@@ -34,67 +44,26 @@ def get_movie_runtime(movie_id: int) -> int:
 
 #Parse user free time
 
-def parse_user_free_time(text: str):
+def parse_user_free_time(text: str, now: datetime = None):
     """
     Parse free time phrases like:
       "I am free for 3 hours on monday and 4 hours on friday after 6pm"
+      "Sat 7–10pm, weekends after 8 for a couple of hours"
+    (grammar in agents/free_time_parser.py). One slot per day, each with
+    day, available_minutes, start_hour, start_time and end_time.
     """
-    text = text.lower()
-    slots = []
-
-    for phrase in re.split(r"[,\;]? and |,|\;", text):
-        phrase = phrase.strip()
-        if not phrase:
-            continue
-
-        # mixed format: 1h30min / 1 hour and 30 min
-        mixed = re.search(
-            r"(\d+)\s*(?:h|hour|hours)[^\d](\d{1,2})?\s(?:m|min|minutes)?", phrase
-        )
-        if mixed:
-            hours = int(mixed.group(1))
-            mins = int(mixed.group(2) or 0)
-            total = hours * 60 + mins
-        else:
-            hours = sum(float(x) for x in re.findall(r"(\d+(?:\.\d+)?)\s*(?:hours|hour)", phrase))
-            mins = sum(float(x) for x in re.findall(r"(\d+(?:\.\d+)?)\s*(?:minutes|min)", phrase))
-            total = int(hours * 60 + mins)
-
-        if total <= 0:
-            continue
-
-        # detect start time (after 6pm)
-        time_match = re.search(r"(after|from)\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", phrase)
-        start_hour = 18
-        if time_match:
-            hour = int(time_match.group(2))
-            if time_match.group(4) and time_match.group(4).lower() == "pm" and hour < 12:
-                hour += 12
-            start_hour = hour
-
-        # detect day(s)
-        found_days = [d for d in DAYS if d in phrase]
-        if not found_days:
-            found_days = [d for d in DAYS if d in text]
-
-        for d in found_days:
-            total = round(total / 5) * 5
-            slots.append({"day": d.capitalize(), "available_minutes": int(total), "start_hour": start_hour})
+    slots = parse_free_time(text, now)
 
     if not slots:
-        slots = [{"day": "Friday", "available_minutes": 120, "start_hour": 18}]
+        slots = [{"day": "Friday", "available_minutes": 120, "start_hour": 18,
+                  "start_time": "18:00", "end_time": "20:00"}]
 
-    # merge duplicate days
+    # merge duplicate days, keeping the longest slot
     merged = {}
     for s in slots:
         key = s["day"]
-        if key not in merged:
+        if key not in merged or s["available_minutes"] > merged[key]["available_minutes"]:
             merged[key] = s
-        else:
-            merged[key]["available_minutes"] = max(
-                merged[key]["available_minutes"], s["available_minutes"]
-            )
-            merged[key]["start_hour"] = s["start_hour"]
 
     return list(merged.values())
 
@@ -102,10 +71,43 @@ def parse_user_free_time(text: str):
 # 
 # Create grouped schedule (1 per day)
 #
-def create_schedule(movies: list, user_text: str):
+def greedy_slots(movies: list, slots: list):
+    """Shortest-first fill of every slot from the full movie list (movies may repeat across days)."""
+    movies_sorted = sorted(movies, key=lambda x: x["runtime"])
+    picks = []
+    for slot in slots:
+        remaining = slot["available_minutes"]
+        chosen = []
+        for m in movies_sorted:
+            if m["runtime"] <= remaining:
+                chosen.append(m)
+                remaining -= m["runtime"]
+            if remaining < 30:
+                break
+        picks.append(chosen)
+    return picks, {"method": "greedy", "optimal": False}
+
+
+def optimal_slots(movies: list, slots: list, time_budget_ms: float = None):
+    """Pack movies into slots maximising filled time weighted by relevance ("score"), each movie once."""
+    runtimes = [m["runtime"] for m in movies]
+    values = movie_values(runtimes, [m.get("score") or 0 for m in movies])
+    assignment, info = optimize_schedule(runtimes, [s["available_minutes"] for s in slots], values, time_budget_ms)
+    picks = [[] for _ in slots]
+    for m, s in zip(movies, assignment):
+        if s >= 0:
+            picks[s].append(m)
+    for chosen in picks:
+        chosen.sort(key=lambda m: -(m.get("score") or 0))
+    return picks, info
+
+
+@timed("schedule")
+def create_schedule(movies: list, user_text: str, strategy: str = None):
     """
     Group movies within one slot per free day.
     Ensures combined runtime ≤ available time.
+    `strategy` is "optimal" (default, see SCHEDULE_STRATEGY) or "greedy".
     """
     try:
         slots = parse_user_free_time(user_text)
@@ -119,43 +121,52 @@ def create_schedule(movies: list, user_text: str):
             except Exception:
                 m["runtime"] = 120
 
-        movies_sorted = sorted(movies, key=lambda x: x["runtime"])
-        schedule = []
-
-        for slot in slots:
-            remaining = slot["available_minutes"]
-            chosen = []
-            total_used = 0
-
-            for m in movies_sorted:
-                runtime = m["runtime"]
-                if runtime <= remaining:
-                    chosen.append({
-                        "title": m["title"],
-                        "runtime": runtime
-                    })
-                    remaining -= runtime
-                    total_used += runtime
-                if remaining < 30:
-                    break
+        strategy = strategy or SCHEDULE_STRATEGY
+        if strategy == "greedy":
+            picks, info = greedy_slots(movies, slots)
+        elif strategy == "optimal":
+            picks, info = optimal_slots(movies, slots)
+        else:
+            return {"error": f"Unknown schedule strategy '{strategy}'."}
 
+        schedule = []
+        for slot, chosen in zip(slots, picks):
+            total_used = sum(m["runtime"] for m in chosen)
             schedule.append({
                 "day": slot["day"],
                 "slot_duration": slot["available_minutes"],
                 "start_hour": slot["start_hour"],
-                "movies": chosen,
+                "start_time": slot["start_time"],
+                "end_time": slot["end_time"],
+                "movies": [{"title": m["title"], "runtime": m["runtime"]} for m in chosen],
                 "total_runtime": total_used,
                 "reason": f"{len(chosen)} movie(s) perfectly fill your {slot['available_minutes']} min slot on {slot['day']}."
             })
 
+        available = sum(s["available_minutes"] for s in slots)
+        watched = sum(s["total_runtime"] for s in schedule)
         summary = {
             "total_slots": len(slots),
             "total_movies": sum(len(s["movies"]) for s in schedule),
-            "total_watch_time": f"{sum(s['total_runtime'] for s in schedule)} min",
+            "total_watch_time": f"{watched} min",
+            "fill_ratio": round(watched / available, 3) if available else 0,
+            "strategy": info,
         }
 
         return {"slots": slots, "schedule": schedule, "summary": summary}
 
     except Exception as e:
         logger.error(f"Schedule generation failed: {e}")
-        return {"error": f"Schedule generation failed: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Schedule generation failed: {str(e)}"}
+
+async def create_schedule_async(movies: list, user_text: str, strategy: str = None):
+    """
+    create_schedule for async callers: missing runtimes are fetched
+    concurrently without blocking, then the schedule is solved in a worker
+    thread (the optimizer may use up to SCHEDULE_TIME_BUDGET_MS of CPU).
+    """
+    missing = [m for m in movies if not m.get("runtime") and m.get("id")]
+    runtimes = await asyncio.gather(*(get_movie_runtime_async(m["id"]) for m in missing))
+    for m, runtime in zip(missing, runtimes):
+        m["runtime"] = runtime
+    return await asyncio.to_thread(create_schedule, movies, user_text, strategy)
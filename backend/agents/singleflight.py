@@ -0,0 +1,108 @@
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger("singleflight")
+
+# Request coalescing: while a computation for a key is in flight, identical
+# calls wait for it instead of starting their own. Sync and async callers (and
+# different event loops) share the same in-flight entry, so a /movie/{id} fetch
+# started by run_sync and one awaited on the server loop still hit TMDB once.
+# Set COALESCE_REQUESTS=0 to disable.
+COALESCE_ENABLED = os.getenv("COALESCE_REQUESTS", "1") == "1"
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls per key. The first caller (the leader) runs
+    the work; callers arriving before it finishes get its result or exception.
+    Nothing is kept afterwards - caching is the TTLCache's job.
+    """
+
+    def __init__(self, name: str, enabled: bool = None):
+        self.name = name
+        self.enabled = COALESCE_ENABLED if enabled is None else enabled
+        self._inflight = {}  # key -> concurrent.futures.Future
+        self._lock = threading.Lock()
+        self._tasks = set()  # leader tasks; the loop only holds them weakly
+        self.leaders = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def _join(self, key):
+        """(future, is_leader) for `key`."""
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                self.coalesced += 1
+                return fut, False
+            fut = Future()
+            self._inflight[key] = fut
+            self.leaders += 1
+            return fut, True
+
+    def _finish(self, key, fut: Future, result=None, error: BaseException = None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if error is not None:
+                self.errors += 1
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    def do(self, key, fn):
+        """Return fn(), sharing one call among concurrent callers with the same key."""
+        if not self.enabled:
+            return fn()
+        fut, leader = self._join(key)
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, fut, error=e)
+            raise
+        self._finish(key, fut, result)
+        return result
+
+    async def do_async(self, key, fn):
+        """
+        Async do(): `fn` is a coroutine function. The shared work runs as its
+        own task, so a caller that is cancelled (e.g. by a branch timeout) does
+        not cancel it for the others.
+        """
+        if not self.enabled:
+            return await fn()
+        fut, leader = self._join(key)
+        if leader:
+            async def lead():
+                try:
+                    result = await fn()
+                except asyncio.CancelledError as e:
+                    # e.g. loop shutdown: followers get the cancellation instead of waiting forever
+                    self._finish(key, fut, error=e)
+                    raise
+                except BaseException as e:
+                    self._finish(key, fut, error=e)
+                    return
+                self._finish(key, fut, result)
+            task = asyncio.ensure_future(lead())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "in_flight": len(self._inflight),
+                "executions": self.leaders,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "coalesced_ratio": round(self.coalesced / calls, 3) if calls else 0.0,
+            }
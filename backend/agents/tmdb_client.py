@@ -0,0 +1,291 @@
+import os
+import time
+import asyncio
+import logging
+import weakref
+import threading
+import contextvars
+from contextlib import contextmanager
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from agents.cache import tmdb_cache, tmdb_flight, tmdb_cached, tmdb_cached_async
+from agents.metrics import tmdb_request
+
+load_dotenv()
+logger = logging.getLogger("tmdb_client")
+
+TMDB_API_KEY = os.getenv("TMDB_API_KEY")
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "20"))
+TMDB_MAX_RETRIES = int(os.getenv("TMDB_MAX_RETRIES", "3"))
+TMDB_BACKOFF = float(os.getenv("TMDB_BACKOFF", "0.5"))
+TMDB_TIMEOUT = float(os.getenv("TMDB_TIMEOUT", "10"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TMDBError(Exception):
+    """Raised when TMDB keeps failing after all retries, or returns a client error."""
+
+
+#  Per-request call counting
+
+# {"calls", "upstream"} for the current context; tasks started inside
+# count_calls() inherit it. "upstream" excludes cache hits and coalesced calls.
+_call_counter = contextvars.ContextVar("tmdb_call_counter", default=None)
+
+
+@contextmanager
+def count_calls():
+    """Count the TMDB lookups made inside the block (including by tasks it starts)."""
+    counter = {"calls": 0, "upstream": 0}
+    token = _call_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        try:
+            _call_counter.reset(token)
+        except ValueError:
+            # an async generator finalized from another context (e.g. aclose() at
+            # loop shutdown); that context never saw this counter
+            pass
+
+
+def _count_call(kind: str):
+    counter = _call_counter.get()
+    if counter is not None:
+        counter[kind] += 1
+
+
+#  Pooled TMDB client
+
+class TMDBClient:
+    """
+    Single TMDB client shared by all agents.
+
+    Owns a keep-alive connection pool, retries 429/5xx with exponential
+    backoff (honouring Retry-After), pauses when TMDB's rate-limit headers say
+    the window is exhausted, and serves repeated lookups from the shared
+    response cache.
+
+    Sync callers use `get_json` (requests.Session). Async callers use
+    `aget_json`, backed by one httpx.AsyncClient per event loop. `run_sync`
+    lets sync code drive the async API on a private background loop.
+    """
+
+    def __init__(self, base_url: str = TMDB_BASE_URL, api_key: str = TMDB_API_KEY,
+                 pool_size: int = TMDB_POOL_SIZE, max_retries: int = TMDB_MAX_RETRIES,
+                 backoff: float = TMDB_BACKOFF, timeout: float = TMDB_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        self.pool_size = pool_size
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+        self._background_loop = None
+
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self.counters = {"requests": 0, "retries": 0, "errors": 0, "rate_limited": 0}
+
+    #  Rate limiting
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _rate_limit_delay(self) -> float:
+        delay = self._blocked_until - time.time()
+        if delay > 0:
+            logger.warning(f"TMDB rate limit window exhausted, waiting {delay:.2f}s")
+        return max(0.0, delay)
+
+    def _update_rate_limit(self, headers):
+        """Read Retry-After / X-RateLimit-* headers and return the advised delay (seconds)."""
+        delay = 0.0
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = 0.0
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) <= 0:
+                    delay = max(delay, float(reset) - time.time())
+            except ValueError:
+                pass
+        if delay > 0:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, time.time() + delay)
+        return delay
+
+    def _backoff_delay(self, attempt: int, advised: float = 0.0) -> float:
+        return max(advised, self.backoff * (2 ** attempt))
+
+    #  Requests
+
+    def request_json(self, path: str, params: dict = None) -> dict:
+        """GET `path` (relative to the API root) and return the decoded JSON body."""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        query = {"api_key": self.api_key, **(params or {})}
+
+        for attempt in range(self.max_retries + 1):
+            time.sleep(self._rate_limit_delay())
+            self._count("requests")
+            try:
+                res = self.session.get(url, params=query, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt >= self.max_retries:
+                    self._count("errors")
+                    raise TMDBError(f"{path}: {e}") from e
+                self._count("retries")
+                time.sleep(self._backoff_delay(attempt))
+                continue
+
+            advised = self._update_rate_limit(res.headers)
+            if res.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                if res.status_code == 429:
+                    self._count("rate_limited")
+                self._count("retries")
+                time.sleep(self._backoff_delay(attempt, advised))
+                continue
+            if not res.ok:
+                self._count("errors")
+                raise TMDBError(f"{path}: HTTP {res.status_code}")
+            return res.json()
+
+        raise TMDBError(f"{path}: retries exhausted")
+
+    def get_json(self, endpoint: str, path: str, params: dict = None) -> dict:
+        """
+        Cached GET. `endpoint` is the path template used to pick the cache TTL
+        (e.g. "movie" for movie/{id}).
+        """
+        params = params or {}
+        _count_call("calls")
+
+        def fetch():
+            _count_call("upstream")
+            with tmdb_request(endpoint):
+                return self.request_json(path, params)
+        return tmdb_cached(endpoint, path, params, fetch)
+
+    #  Async requests
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+            self._async_clients[loop] = client
+        return client
+
+    async def arequest_json(self, path: str, params: dict = None) -> dict:
+        """Async GET of `path`, with the same retry and rate-limit handling as request_json."""
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        query = {"api_key": self.api_key, **(params or {})}
+        client = self._async_client()
+
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._rate_limit_delay())
+            self._count("requests")
+            try:
+                res = await client.get(url, params=query)
+            except httpx.HTTPError as e:
+                if attempt >= self.max_retries:
+                    self._count("errors")
+                    raise TMDBError(f"{path}: {e}") from e
+                self._count("retries")
+                await asyncio.sleep(self._backoff_delay(attempt))
+                continue
+
+            advised = self._update_rate_limit(res.headers)
+            if res.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                if res.status_code == 429:
+                    self._count("rate_limited")
+                self._count("retries")
+                await asyncio.sleep(self._backoff_delay(attempt, advised))
+                continue
+            if res.is_error:
+                self._count("errors")
+                raise TMDBError(f"{path}: HTTP {res.status_code}")
+            return res.json()
+
+        raise TMDBError(f"{path}: retries exhausted")
+
+    async def aget_json(self, endpoint: str, path: str, params: dict = None) -> dict:
+        """Async, cached GET (see get_json)."""
+        params = params or {}
+        _count_call("calls")
+
+        async def fetch():
+            _count_call("upstream")
+            with tmdb_request(endpoint):
+                return await self.arequest_json(path, params)
+        return await tmdb_cached_async(endpoint, path, params, fetch)
+
+    async def aclose(self):
+        """Close the AsyncClient bound to the running event loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    #  Sync bridge
+
+    def _ensure_background_loop(self):
+        with self._lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="tmdb-loop", daemon=True).start()
+                self._background_loop = loop
+            return self._background_loop
+
+    def run_sync(self, coro):
+        """Run a coroutine to completion from synchronous code (not from inside an event loop)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_background_loop()).result()
+
+    #  Stats
+
+    def pool_stats(self) -> dict:
+        pools = []
+        try:
+            manager = self._adapter.poolmanager
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools.append({
+                    "host": pool.host,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    "idle": pool.pool.qsize() if pool.pool else 0,
+                })
+        except Exception as e:
+            logger.debug(f"Could not read pool stats: {e}")
+        # httpx has no public pool introspection; report the clients (one per event loop)
+        return {"maxsize": self.pool_size, "pools": pools, "async_clients": len(self._async_clients)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, "pool": self.pool_stats(), "cache": tmdb_cache.stats(),
+                "coalescing": tmdb_flight.stats()}
+
+
+tmdb = TMDBClient()
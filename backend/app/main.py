@@ -1,12 +1,18 @@
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.database import Base, engine
 from auth import auth_routes
 from core.dependencies import get_current_user
 from routes import agent_routes
+from agents.model_registry import registry
+from agents.tmdb_client import tmdb
+from agents.metrics import render_metrics
+from agents.popular_pool import start_popular_pool, stop_popular_pool
+from agents.semantic_index import get_semantic_index
 from dotenv import load_dotenv
 import os
 import uvicorn
@@ -14,10 +20,28 @@ import uvicorn
 # Load environment variables
 load_dotenv()
 
+# Models load lazily on first use. Set MODEL_WARMUP=1 on workers that serve the
+# agent routes to load them in the background right after startup instead.
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "0") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MODEL_WARMUP:
+        get_semantic_index()  # memmaps the index if built and registers its embedder for the warm-up
+        registry.warm_up(background=True)
+    # popular / trending / per-genre lists for the retrieval fallbacks (POPULAR_POOL=0 to disable)
+    start_popular_pool()
+    yield
+    await stop_popular_pool()
+    await tmdb.aclose()
+
+
 app = FastAPI(
     title="MovieRazzi Auth API (Secure Edition)",
     description="An Agentic AI Movie Recommendation & Scheduling System with Secure API Access",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Create DB tables
@@ -70,6 +94,32 @@ def home():
     }
 
 
+#Health checks
+
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+def readiness():
+    """
+    Ready once warm-up has loaded every model (when MODEL_WARMUP=1);
+    lazy workers are always ready. Reports per-model load status either way.
+    """
+    ready = registry.all_loaded() if MODEL_WARMUP else True
+    body = {"ready": ready, "warming_up": registry.warming_up, "models": registry.status()}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+#Prometheus metrics (stage / TMDB latency, cache hit ratios, batch sizes)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 #Run the app (Local HTTPS optional)
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+# ===============================================================
+# MovieRazzi - Free-time parser accuracy / throughput benchmark
+# ===============================================================
+# Generates a corpus of a few thousand phrasings with known answers (days,
+# minutes, start time) from templates, then reports exact-match accuracy per
+# template and parse throughput. Usage (from backend/):
+#   python benchmarks/bench_free_time_parser.py
+#   python benchmarks/bench_free_time_parser.py --size 5000 --show-failures 10
+#   python benchmarks/bench_free_time_parser.py --parser mymodule:parse   # compare another parser
+#   python benchmarks/bench_free_time_parser.py --min-accuracy 0.99         # exit 1 below 99%
+# The corpus shares its phrasings with the grammar's design, so it measures
+# coverage and speed; hand-written cases are in tests/test_free_time_parser.py.
+# ===============================================================
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import importlib
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+ABBR = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+NOW = datetime(2026, 10, 14, 12, 0)  # a Wednesday, for relative days
+
+
+#  Surface forms
+
+def say_day(rng, d):
+    return rng.choice([DAYS[d], DAYS[d].lower(), ABBR[d], ABBR[d].capitalize(), DAYS[d] + "s"])
+
+
+def say_duration(rng, minutes):
+    h, m = divmod(minutes, 60)
+    forms = [f"{minutes} minutes", f"{minutes} min"]
+    if m == 0:
+        forms += [f"{h} hours" if h > 1 else "1 hour", f"{h}h", f"{h} hrs"]
+        if h == 2:
+            forms += ["a couple of hours", "a couple hours"]
+    elif m == 30:
+        forms += [f"{h}.5 hours", f"{h}h30", f"{h} hours and 30 minutes", f"{h} and a half hours"]
+        if h == 1:
+            forms += ["an hour and a half"]
+    else:
+        forms += [f"{h}h{m:02d}", f"{h} hours {m} minutes", f"{h} hour and {m} min"]
+    return rng.choice(forms)
+
+
+def say_window(rng, start_h, end_h):
+    """start_h/end_h are evening hours (13..23)."""
+    s, e = start_h - 12, end_h - 12
+    return rng.choice([
+        f"{s}-{e}pm", f"{s}–{e}pm", f"{s}pm to {e}pm", f"from {s} to {e}pm", f"between {s} and {e}pm",
+        f"{start_h}:00-{end_h}:00", f"from {start_h}:00 to {end_h}:00", f"{s}pm-{e}pm",
+    ])
+
+
+def hm(h):
+    return f"{h:02d}:00"
+
+
+#  Templates: each returns (text, [(day, minutes, start_time), ...])
+
+def t_duration_on_day(rng):
+    d, mins = rng.randrange(7), rng.choice(range(60, 300, 15))
+    lead = rng.choice(["I am free for", "I'm free", "I have", "got", "free for"])
+    return f"{lead} {say_duration(rng, mins)} on {say_day(rng, d)}", [(DAYS[d], mins, "18:00")]
+
+
+def t_day_window(rng):
+    d = rng.randrange(7)
+    s = rng.randrange(17, 21)
+    e = rng.randrange(s + 1, 24)
+    return f"{say_day(rng, d)} {say_window(rng, s, e)}", [(DAYS[d], (e - s) * 60, hm(s))]
+
+
+def t_two_days_two_durations(rng):
+    d1, d2 = rng.sample(range(7), 2)
+    m1, m2 = rng.choice(range(60, 240, 30)), rng.choice(range(60, 240, 30))
+    h = rng.randrange(5, 10)
+    text = (f"free for {say_duration(rng, m1)} on {say_day(rng, d1)} and "
+            f"{say_duration(rng, m2)} on {say_day(rng, d2)} after {h}pm")
+    return text, [(DAYS[d1], m1, "18:00"), (DAYS[d2], m2, hm(h + 12))]
+
+
+def t_shared_duration(rng):
+    d1, d2 = sorted(rng.sample(range(7), 2))
+    mins = rng.choice(range(60, 240, 30))
+    return (f"{say_day(rng, d1)} and {say_day(rng, d2)} for {say_duration(rng, mins)}",
+            [(DAYS[d1], mins, "18:00"), (DAYS[d2], mins, "18:00")])
+
+
+def t_day_range_window(rng):
+    first = rng.randrange(5)
+    last = rng.randrange(first + 1, 7)
+    s = rng.randrange(18, 21)
+    e = rng.randrange(s + 1, 24)
+    sep = rng.choice(["-", " to ", " through ", "–"])
+    text = f"{say_day(rng, first).rstrip('s')}{sep}{say_day(rng, last).rstrip('s')} {say_window(rng, s, e)}"
+    return text, [(DAYS[d], (e - s) * 60, hm(s)) for d in range(first, last + 1)]
+
+
+def t_weekends(rng):
+    h = rng.randrange(6, 10)
+    mins = rng.choice(range(90, 240, 30))
+    return (f"{rng.choice(['weekends', 'on weekends', 'this weekend'])} after {h}pm for {say_duration(rng, mins)}",
+            [("Saturday", mins, hm(h + 12)), ("Sunday", mins, hm(h + 12))])
+
+
+def t_weekdays(rng):
+    s = rng.randrange(19, 22)
+    e = rng.randrange(s + 1, 24)
+    return (f"{rng.choice(['weekdays', 'weeknights'])} {say_window(rng, s, e)}",
+            [(DAYS[d], (e - s) * 60, hm(s)) for d in range(5)])
+
+
+def t_relative(rng):
+    offset, word = rng.choice([(0, "tonight"), (0, "today"), (1, "tomorrow"), (2, "the day after tomorrow")])
+    mins = rng.choice(range(60, 240, 30))
+    return f"{word} {say_duration(rng, mins)}", [(DAYS[(NOW.weekday() + offset) % 7], mins, "18:00")]
+
+
+def t_day_after(rng):
+    d, h = rng.randrange(7), rng.randrange(6, 11)
+    return f"{say_day(rng, d)} after {h}pm", [(DAYS[d], 120, hm(h + 12))]
+
+
+def t_two_windows(rng):
+    d1, d2 = rng.sample(range(7), 2)
+    s1, s2 = rng.randrange(17, 21), rng.randrange(13, 21)
+    e1, e2 = rng.randrange(s1 + 1, 24), rng.randrange(s2 + 1, 24)
+    return (f"{say_day(rng, d1)} {say_window(rng, s1, e1)}, {say_day(rng, d2)} {say_window(rng, s2, e2)}",
+            [(DAYS[d1], (e1 - s1) * 60, hm(s1)), (DAYS[d2], (e2 - s2) * 60, hm(s2))])
+
+
+def t_until(rng):
+    d, e = rng.randrange(7), rng.randrange(20, 24)
+    return f"{say_day(rng, d)} until {e - 12}pm", [(DAYS[d], (e - 18) * 60, "18:00")]
+
+
+def t_evening(rng):
+    d, mins = rng.randrange(7), rng.choice(range(60, 240, 30))
+    return f"{say_duration(rng, mins)} on {say_day(rng, d)} evening", [(DAYS[d], mins, "18:00")]
+
+
+TEMPLATES = [t_duration_on_day, t_day_window, t_two_days_two_durations, t_shared_duration, t_day_range_window,
+             t_weekends, t_weekdays, t_relative, t_day_after, t_two_windows, t_until, t_evening]
+
+
+def build_corpus(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [(t.__name__, *t(rng)) for t in (TEMPLATES[i % len(TEMPLATES)] for i in range(size))]
+
+
+def normalize(slots):
+    """(day, minutes, start_time) per slot; parsers without start_time fall back to start_hour."""
+    return [(s["day"], s["available_minutes"], s.get("start_time") or hm(s["start_hour"])) for s in slots]
+
+
+def load_parser(spec: str):
+    module, _, name = spec.partition(":")
+    fn = getattr(importlib.import_module(module), name)
+
+    def parse(text):
+        try:
+            return fn(text, now=NOW)
+        except TypeError:  # parsers without relative-day support
+            return fn(text)
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Free-time parser accuracy and throughput")
+    parser.add_argument("--size", type=int, default=3000)
+    parser.add_argument("--parser", default="agents.free_time_parser:parse_free_time")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing passes over the corpus")
+    parser.add_argument("--show-failures", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    parser.add_argument("--min-accuracy", type=float, default=None, help="Exit 1 if accuracy is below this (0..1)")
+    args = parser.parse_args()
+
+    parse = load_parser(args.parser)
+    corpus = build_corpus(args.size)
+
+    per_template = defaultdict(lambda: [0, 0])
+    failures = []
+    for name, text, expected in corpus:
+        ok = normalize(parse(text)) == expected
+        per_template[name][0] += ok
+        per_template[name][1] += 1
+        if not ok:
+            failures.append((text, expected))
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for _, text, _ in corpus:
+            parse(text)
+    elapsed = time.perf_counter() - start
+
+    correct = sum(c for c, _ in per_template.values())
+    results = {
+        "parser": args.parser,
+        "phrasings": len(corpus),
+        "accuracy": round(correct / len(corpus), 4),
+        "per_template": {k: round(c / n, 3) for k, (c, n) in per_template.items()},
+        "phrases_per_s": round(len(corpus) * args.repeat / elapsed),
+        "us_per_phrase": round(elapsed / (len(corpus) * args.repeat) * 1e6, 1),
+    }
+    for name, acc in results["per_template"].items():
+        print(f"  {name:<28} {acc:6.1%}")
+    print(f"accuracy {results['accuracy']:.1%} over {len(corpus)} phrasings | "
+          f"{results['phrases_per_s']} phrases/s ({results['us_per_phrase']} µs each)")
+    for text, expected in failures[:args.show_failures]:
+        print(f"  ✗ {text!r}\n      expected {expected}\n      got      {normalize(parse(text))}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+    if args.min_accuracy is not None and results["accuracy"] < args.min_accuracy:
+        print(f"⚠️ Accuracy {results['accuracy']:.1%} is below --min-accuracy {args.min_accuracy:.1%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
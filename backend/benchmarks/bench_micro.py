@@ -0,0 +1,127 @@
+# ===============================================================
+# MovieRazzi - Micro-benchmarks for the hot agent helpers
+# ===============================================================
+# Times parse_user_free_time, filter_movies_by_genre, correct_name,
+# extract_entities and create_schedule in-process (no network: schedule
+# inputs already carry runtimes). Each benchmark is repeated --repeat times
+# over a fixed input set; per-call latency percentiles go to JSON.
+# Usage (from backend/):
+#   python benchmarks/bench_micro.py
+#   python benchmarks/bench_micro.py --only correct_name,parse_user_free_time --output micro.json
+#   python benchmarks/bench_micro.py --output micro.json --baseline micro_prev.json   # flag regressions
+# ===============================================================
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.report import latency_summary, write_results, compare  # noqa: E402
+
+FREE_TIME_TEXTS = [
+    "I am free for 3 hours on monday and 4 hours on friday after 6pm",
+    "Sat 7–10pm, Sun 2-5pm",
+    "weekends after 8 for a couple of hours",
+    "mon-thu from 19:30 to 22:00",
+    "tonight until midnight",
+    "I have 2.5 hours on Wednesday evening",
+]
+USER_TEXTS = [
+    "I love sci-fi movies with Leonardo DiCaprio and Tom Hardy",
+    "Something funny with Jim Carey for a family night",
+    "dark thrillers like the ones Christian Bale does",
+    "romantic dramas, maybe with Emma Stone or Ryan Gosling",
+]
+NAMES = ["leonardo dicapro", "tom hanx", "scarlet johanson", "keanu reves", "unknown person", "Brad Pitt"]
+GENRES = [["action"], ["sci-fi", "thriller"], ["comedy", "romance"], ["horror"]]
+GENRE_POOL = [28, 12, 16, 35, 80, 18, 14, 27, 10749, 878, 53]
+
+
+def make_movies(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [{"id": i, "title": f"Movie {i}", "runtime": rng.randint(80, 180), "score": rng.random(),
+             "genre_ids": rng.sample(GENRE_POOL, rng.randint(1, 3))} for i in range(n)]
+
+
+def bench_parse_user_free_time():
+    from agents.shedule_creator_agent import parse_user_free_time
+    return [lambda t=t: parse_user_free_time(t) for t in FREE_TIME_TEXTS]
+
+
+def bench_filter_movies_by_genre():
+    from agents.ir_agent import filter_movies_by_genre
+    movies = make_movies(200)
+    return [lambda g=g: filter_movies_by_genre(movies, g) for g in GENRES]
+
+
+def bench_correct_name():
+    from agents.ir_agent import correct_name
+    return [lambda n=n: correct_name(n) for n in NAMES]
+
+
+def bench_extract_entities():
+    from agents.preference_analyzer import extract_entities
+    extract_entities(USER_TEXTS[0])  # load the spaCy model outside the timed region
+    return [lambda t=t: extract_entities(t) for t in USER_TEXTS]
+
+
+def bench_create_schedule():
+    from agents.shedule_creator_agent import create_schedule
+    movies = make_movies(30)
+    # create_schedule mutates runtimes in place; copies keep every call identical
+    return [lambda t=t: create_schedule([dict(m) for m in movies], t) for t in FREE_TIME_TEXTS]
+
+
+BENCHMARKS = {
+    "parse_user_free_time": bench_parse_user_free_time,
+    "filter_movies_by_genre": bench_filter_movies_by_genre,
+    "correct_name": bench_correct_name,
+    "extract_entities": bench_extract_entities,
+    "create_schedule": bench_create_schedule,
+}
+
+
+def run(calls, repeat: int, warmup: int = 3):
+    for _ in range(warmup):
+        for call in calls:
+            call()
+    samples = []
+    for _ in range(repeat):
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for the agent helpers")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over each benchmark's inputs")
+    parser.add_argument("--only", default=None, help="Comma-separated benchmark names")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier --output file to compare p50 against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p50 growth vs baseline")
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    results = {}
+    for name in names:
+        try:
+            calls = BENCHMARKS[name]()
+        except Exception as e:  # e.g. spaCy model not installed
+            print(f"  {name:<24} skipped: {e}")
+            results[name] = {"skipped": str(e)}
+            continue
+        results[name] = latency_summary(run(calls, args.repeat))
+        r = results[name]
+        print(f"  {name:<24} p50 {r['p50_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms")
+
+    if args.output:
+        write_results(args.output, "micro", results)
+    if args.baseline and compare(results, args.baseline, tolerance=args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
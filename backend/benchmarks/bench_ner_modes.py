@@ -0,0 +1,144 @@
+# ===============================================================
+# MovieRazzi - Person extraction: full vs ner vs gazetteer modes
+# ===============================================================
+# Builds a labelled corpus from the known-actor list (exact, lowercase and
+# misspelled mentions, plus sentences with people who are not on the list and
+# sentences with nobody) and runs it through each NER_MODE. Reports recall and
+# precision against the known actors, load time and per-text latency.
+# Misspelled mentions count as found when the extracted name is within
+# fuzz.ratio 85 of the actor (the IR agent's correct_name fixes the rest).
+# Usage (from backend/):
+#   python benchmarks/bench_ner_modes.py
+#   python benchmarks/bench_ner_modes.py --size 1000 --modes ner,gazetteer --output ner_modes.json
+# ===============================================================
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.actor_index import get_actor_index, fuzz  # noqa: E402
+from agents.catalog import normalize_name  # noqa: E402
+from agents.preference_analyzer import load_nlp, _people_from_doc, NER_MODES  # noqa: E402
+from benchmarks.report import latency_summary, write_results  # noqa: E402
+
+TEMPLATES = [
+    "I want a {genre} movie with {a}",
+    "something like the films {a} did, maybe with {b} too",
+    "{a} and {b} in a {genre} please",
+    "my friend {other} said {a} is great in {genre} movies",
+    "any {genre} starring {a}?",
+    "we loved {a}'s last movie, more of that",
+]
+NOBODY = ["a cozy {genre} for tonight", "something {genre} and not too long", "surprise me with a {genre}"]
+OTHERS = ["John Carter", "Maria Lopez", "my uncle Dave", "Priya Sharma", "Tom from work"]
+GENRES = ["action", "sci-fi", "comedy", "romantic", "thriller", "horror"]
+
+
+def misspell(rng, name: str) -> str:
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1:] if name[i] != " " else name
+
+
+def mention(rng, name: str):
+    form = rng.random()
+    if form < 0.5:
+        return name
+    if form < 0.8:
+        return name.lower()
+    return misspell(rng, name)
+
+
+def build_corpus(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    actors = get_actor_index().names
+    corpus = []
+    for i in range(size):
+        genre = rng.choice(GENRES)
+        if i % 5 == 4:
+            corpus.append((rng.choice(NOBODY).format(genre=genre), []))
+            continue
+        a, b = rng.sample(actors, 2)
+        template = rng.choice(TEMPLATES)
+        text = template.format(a=mention(rng, a), b=mention(rng, b), genre=genre, other=rng.choice(OTHERS))
+        corpus.append((text, [a, b] if "{b}" in template else [a]))
+    return corpus
+
+
+def matches(found: str, expected: str) -> bool:
+    f, e = normalize_name(found), normalize_name(expected)
+    return f == e or fuzz.ratio(f, e) >= 85
+
+
+def score(corpus, extracted):
+    tp = fn = fp = 0
+    for (_, expected), found in zip(corpus, extracted):
+        hit = {e for e in expected if any(matches(f, e) for f in found)}
+        tp += len(hit)
+        fn += len(expected) - len(hit)
+        # names that match no expected actor (the unlisted "other" people count here)
+        fp += sum(1 for f in found if not any(matches(f, e) for e in expected))
+    return {
+        "recall": round(tp / (tp + fn), 4) if tp + fn else 1.0,
+        "precision": round(tp / (tp + fp), 4) if tp + fp else 1.0,
+        "extra_names": fp,
+    }
+
+
+def run_mode(mode: str, corpus, repeat: int):
+    start = time.perf_counter()
+    nlp = load_nlp(mode)
+    load_s = time.perf_counter() - start
+
+    texts = [t for t, _ in corpus]
+    extracted = [_people_from_doc(nlp(t), t, mode)["people"] for t in texts[:10]]  # warm-up
+    latencies = []
+    for _ in range(repeat):
+        extracted = []
+        for t in texts:
+            t0 = time.perf_counter()
+            extracted.append(_people_from_doc(nlp(t), t, mode)["people"])
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    docs = nlp.pipe(texts, batch_size=64)
+    [_people_from_doc(d, t, mode) for d, t in zip(docs, texts)]
+    batch_ms = (time.perf_counter() - t0) * 1000 / len(texts)
+
+    return {
+        **score(corpus, extracted),
+        **latency_summary(latencies),
+        "batched_ms_per_text": round(batch_ms, 3),
+        "load_s": round(load_s, 2),
+        "pipes": list(nlp.pipe_names),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare NER modes for actor extraction")
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--modes", default=",".join(NER_MODES))
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.size)
+    results = {}
+    for mode in args.modes.split(","):
+        try:
+            results[mode] = r = run_mode(mode, corpus, args.repeat)
+        except Exception as e:  # e.g. spaCy model not installed
+            print(f"  {mode:<10} skipped: {e}")
+            results[mode] = {"skipped": str(e)}
+            continue
+        print(f"  {mode:<10} recall {r['recall']:.3f}  precision {r['precision']:.3f}  "
+              f"p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms  batched {r['batched_ms_per_text']:6.2f} ms/text  "
+              f"load {r['load_s']:5.1f}s  pipes {r['pipes']}")
+
+    if args.output:
+        write_results(args.output, "ner_modes", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# ===============================================================
+# MovieRazzi - TMDB calls per /retrieve: search vs discover backend
+# ===============================================================
+# Runs the same preference sets through ir_agent with RETRIEVAL_BACKEND
+# "tmdb" (search/person + movie_credits + per-genre search/movie + one
+# /movie/{id} per result) and "discover" (/discover/movie + the same
+# /movie/{id} runtime call per result), against the local TMDB stand-in with a
+# cold cache per request. Reports lookups and upstream HTTP requests per
+# retrieval, and latency.
+# Usage (from backend/):
+#   python benchmarks/bench_retrieval_calls.py
+#   python benchmarks/bench_retrieval_calls.py --latency-ms 80 --output retrieval_calls.json
+# ===============================================================
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.fake_tmdb import start_fake_tmdb  # noqa: E402
+from benchmarks.report import latency_summary, write_results  # noqa: E402
+
+PREFERENCES = [
+    {"detected_genres": ["sci-fi"], "entities": {"people": ["Leonardo DiCaprio"]}},
+    {"detected_genres": ["action", "thriller"], "entities": {"people": ["Tom Hardy", "Christian Bale"]}},
+    {"detected_genres": ["comedy"], "entities": {"people": []}},
+    {"detected_genres": ["drama", "romance", "comedy"], "entities": {"people": []}},
+    {"detected_genres": [], "entities": {"people": []}},
+]
+TARGET_RUNTIMES = [None, 150]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TMDB calls per retrieval by backend")
+    parser.add_argument("--backends", default="tmdb,discover")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake TMDB latency per request")
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    server = start_fake_tmdb(latency_ms=args.latency_ms)
+    # the TMDB client reads these at import time
+    os.environ["TMDB_BASE_URL"] = server.url
+    os.environ["TMDB_API_KEY"] = os.getenv("TMDB_API_KEY") or "fake"
+    from agents.ir_agent import retrieve_movies, retrieval_stats
+    from agents.cache import tmdb_cache
+
+    results = {}
+    try:
+        for backend in args.backends.split(","):
+            latencies, movies = [], 0
+            http_before = server.counters["requests"]
+            for prefs in PREFERENCES:
+                for target in TARGET_RUNTIMES:
+                    tmdb_cache.clear()
+                    start = time.perf_counter()
+                    movies += len(retrieve_movies({**prefs, "input_text": ""}, target, backend=backend))
+                    latencies.append((time.perf_counter() - start) * 1000)
+            stats = retrieval_stats()[backend]
+            runs = len(latencies)
+            results[backend] = {
+                **latency_summary(latencies),
+                "calls_per_request": stats["calls_per_request"],
+                "upstream_per_request": stats["upstream_per_request"],
+                "http_requests_per_request": round((server.counters["requests"] - http_before) / runs, 2),
+                "movies_per_request": round(movies / runs, 2),
+            }
+            r = results[backend]
+            print(f"  {backend:<9} {r['calls_per_request']:6.1f} lookups  {r['upstream_per_request']:6.1f} upstream  "
+                  f"{r['movies_per_request']:5.1f} movies  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms")
+    finally:
+        server.shutdown()
+
+    if args.output:
+        write_results(args.output, "retrieval_calls", results)
+
+
+if __name__ == "__main__":
+    main()
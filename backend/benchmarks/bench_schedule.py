@@ -0,0 +1,89 @@
+# ===============================================================
+# MovieRazzi - Schedule packing benchmark: greedy vs optimizer
+# ===============================================================
+# Random candidate sets (runtimes ~ real movie lengths, relevance scores) are
+# packed into random free-time slots by both strategies. Reports fill ratio,
+# relevance of the scheduled movies, duplicate bookings and solve time.
+# Usage (from backend/):
+#   python benchmarks/bench_schedule.py
+#   python benchmarks/bench_schedule.py --trials 200 --output schedule_bench.json
+# ===============================================================
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.shedule_creator_agent import greedy_slots, optimal_slots  # noqa: E402
+
+# (movies, slots) per scenario: the first two usually go to the DP, the rest to the heuristic
+SCENARIOS = [(8, 2), (15, 3), (40, 4), (200, 7), (1000, 7)]
+
+
+def make_case(rng, n_movies: int, n_slots: int):
+    runtimes = np.clip(rng.normal(110, 25, n_movies), 75, 200).astype(int)
+    movies = [{"id": i, "title": f"Movie {i}", "runtime": int(r), "score": round(float(rng.random()), 4)}
+              for i, r in enumerate(runtimes)]
+    slots = [{"day": f"Day{s}", "available_minutes": int(rng.choice([90, 120, 150, 180, 210, 240, 300])),
+              "start_hour": 18} for s in range(n_slots)]
+    return movies, slots
+
+
+def measure(fn, movies, slots):
+    start = time.perf_counter()
+    picks, info = fn(movies, slots)
+    elapsed = (time.perf_counter() - start) * 1000
+    chosen = [m for p in picks for m in p]
+    available = sum(s["available_minutes"] for s in slots)
+    return {
+        "fill": sum(m["runtime"] for m in chosen) / available,
+        "relevance": sum(m["score"] for m in chosen),
+        "duplicates": len(chosen) - len({m["id"] for m in chosen}),
+        "ms": elapsed,
+        "method": info["method"],
+    }
+
+
+def summarize(rows):
+    ms = np.array([r["ms"] for r in rows])
+    return {
+        "fill_ratio": round(float(np.mean([r["fill"] for r in rows])), 3),
+        "relevance": round(float(np.mean([r["relevance"] for r in rows])), 3),
+        "duplicate_bookings": int(sum(r["duplicates"] for r in rows)),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "methods": sorted({r["method"] for r in rows}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare greedy and optimized schedule packing")
+    parser.add_argument("--trials", type=int, default=50)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n_movies, n_slots in SCENARIOS:
+        greedy, optimal = [], []
+        for _ in range(args.trials):
+            movies, slots = make_case(rng, n_movies, n_slots)
+            greedy.append(measure(greedy_slots, movies, slots))
+            optimal.append(measure(optimal_slots, movies, slots))
+        res = {"movies": n_movies, "slots": n_slots, "greedy": summarize(greedy), "optimal": summarize(optimal)}
+        results.append(res)
+        g, o = res["greedy"], res["optimal"]
+        print(f"{n_movies:>5} movies / {n_slots} slots | greedy fill {g['fill_ratio']:.3f} dup {g['duplicate_bookings']:>4} "
+              f"p50 {g['p50_ms']:6.2f} ms | optimal fill {o['fill_ratio']:.3f} dup {o['duplicate_bookings']} "
+              f"p50 {o['p50_ms']:6.2f} ms p95 {o['p95_ms']:6.2f} ms ({'/'.join(o['methods'])})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
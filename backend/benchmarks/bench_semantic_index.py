@@ -0,0 +1,115 @@
+# ===============================================================
+# MovieRazzi - Semantic index search latency benchmark
+# ===============================================================
+# Fills a temporary index with clustered unit vectors (no model needed) and times
+# exact and IVF top-k search, IVF recall@k against exact, and incremental adds
+# at each size. Usage (from backend/):
+#   python benchmarks/bench_semantic_index.py
+#   python benchmarks/bench_semantic_index.py --sizes 10000 100000 --output bench.json
+# The 1M size writes ~770 MB (dim 384, float16) to the temp directory.
+# ===============================================================
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.semantic_index import SemanticIndex, SEMANTIC_NPROBE  # noqa: E402
+
+
+def unit_vectors(rng, n: int, dim: int, centers: np.ndarray = None) -> np.ndarray:
+    """Random unit vectors; around `centers` if given (real embeddings are clustered too)."""
+    v = rng.standard_normal((n, dim), dtype=np.float32)
+    if centers is not None:
+        v = centers[rng.integers(0, len(centers), n)] + v / np.sqrt(dim)
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def time_search(index, queries, k, nprobe):
+    latencies, results = [], []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(index.search(q, k, nprobe=nprobe))
+        latencies.append((time.perf_counter() - start) * 1000)
+    lat = np.array(latencies)
+    return results, {
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+    }
+
+
+def bench_size(n: int, dim: int, k: int, queries: int, nprobe: int, workdir: str, rng) -> dict:
+    path = os.path.join(workdir, f"index_{n}")
+    index = SemanticIndex.create(path, dim, "random")
+    centers = unit_vectors(rng, 2048, dim)
+
+    chunk = 100_000
+    start = time.perf_counter()
+    for i in range(0, n, chunk):
+        m = min(chunk, n - i)
+        index.add(np.arange(i, i + m), unit_vectors(rng, m, dim, centers))
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.train_ivf()
+    train_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.add(np.arange(n, n + 100), unit_vectors(rng, 100, dim, centers))
+    add_ms = (time.perf_counter() - start) * 1000
+
+    qs = unit_vectors(rng, queries, dim, centers)
+    index.search(qs[0], k, nprobe=0)  # page the file in
+    exact, exact_lat = time_search(index, qs, k, nprobe=0)
+    ivf, ivf_lat = time_search(index, qs, k, nprobe=nprobe)
+    recall = np.mean([len({i for i, _ in a} & {i for i, _ in b}) / k for a, b in zip(exact, ivf)])
+
+    return {
+        "vectors": len(index),
+        "file_mb": round(os.path.getsize(os.path.join(path, "vectors.f16")) / 1e6, 1),
+        "build_s": round(build_s, 2),
+        "ivf_train_s": round(train_s, 2),
+        "add_100_ms": round(add_ms, 2),
+        "exact": exact_lat,
+        "ivf": {**ivf_lat, "nprobe": nprobe, "lists": index.meta["ivf_lists"], f"recall@{k}": round(float(recall), 3)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SemanticIndex search latency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--nprobe", type=int, default=SEMANTIC_NPROBE)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp(prefix="semantic_bench_")
+    results = []
+    try:
+        for n in args.sizes:
+            res = bench_size(n, args.dim, args.k, args.queries, args.nprobe, workdir, rng)
+            results.append(res)
+            ex, ivf = res["exact"], res["ivf"]
+            print(f"{n:>9} vectors | exact p50 {ex['p50_ms']:8.2f} ms p95 {ex['p95_ms']:8.2f} ms | "
+                  f"ivf p50 {ivf['p50_ms']:7.2f} ms p95 {ivf['p95_ms']:7.2f} ms recall@{args.k} {ivf[f'recall@{args.k}']} | "
+                  f"train {res['ivf_train_s']:.1f}s | add 100 {res['add_100_ms']:.1f} ms")
+            shutil.rmtree(os.path.join(workdir, f"index_{n}"))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+# ===============================================================
+# MovieRazzi - Local TMDB stand-in for benchmarks and load tests
+# ===============================================================
+# Serves TMDB-shaped JSON from a fixture file, falling back to deterministic
+# synthetic responses for anything not recorded, with configurable latency and
+# error injection. Point the backend at it with TMDB_BASE_URL.
+# Usage (from backend/):
+#   python benchmarks/fake_tmdb.py --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+#   TMDB_BASE_URL=http://127.0.0.1:8765/3 TMDB_API_KEY=fake uvicorn app.main:app
+#   # capture real responses as fixtures (misses are proxied to TMDB and saved on exit):
+#   TMDB_API_KEY=... python benchmarks/fake_tmdb.py --record --fixtures benchmarks/fixtures/tmdb.json
+# ===============================================================
+import os
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from urllib.request import urlopen
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+UPSTREAM = "https://api.themoviedb.org/3"
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "tmdb.json")
+
+GENRE_IDS = [28, 12, 16, 35, 80, 18, 14, 27, 10749, 878, 53]
+WORDS = ["Night", "Star", "Last", "Silent", "Iron", "Lost", "Dark", "Golden", "Hidden", "Wild",
+         "City", "Storm", "River", "Shadow", "Echo", "Empire", "Dream", "Fire", "Ocean", "Code"]
+
+
+def fixture_key(path: str, params: dict) -> str:
+    """Recorded responses are keyed by path plus sorted query (api_key excluded)."""
+    query = urlencode(sorted((k, v) for k, v in params.items() if k != "api_key"))
+    return f"{path}?{query}" if query else path
+
+
+#  Synthetic TMDB
+
+def _rng(*parts) -> random.Random:
+    seed = hashlib.md5("|".join(map(str, parts)).encode()).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+
+def _movie(movie_id: int) -> dict:
+    rng = _rng("movie", movie_id)
+    return {
+        "id": movie_id,
+        "title": " ".join(rng.sample(WORDS, 2)) + f" {movie_id % 97}",
+        "overview": "A synthetic movie served by the local TMDB stand-in.",
+        "genre_ids": rng.sample(GENRE_IDS, rng.randint(1, 3)),
+        "release_date": f"{rng.randint(1980, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "vote_average": round(rng.uniform(4.5, 8.9), 1),
+        "vote_count": rng.randint(50, 30000),
+        "popularity": round(rng.uniform(5, 400), 2),
+        "poster_path": f"/fake{movie_id}.jpg",
+    }
+
+
+def _page(seed, page: int, size: int = 20, total_pages: int = 5) -> dict:
+    rng = _rng(seed, page)
+    ids = [rng.randint(1, 900000) for _ in range(size)]
+    return {"page": page, "results": [_movie(i) for i in ids],
+            "total_pages": total_pages, "total_results": total_pages * size}
+
+
+def synthetic(path: str, params: dict):
+    """A deterministic TMDB-like body for `path`, or None for unknown endpoints."""
+    parts = path.strip("/").split("/")
+    page = int(params.get("page", 1))
+    if parts == ["search", "person"]:
+        query = params.get("query", "")
+        return {"page": 1, "results": [{"id": _rng("person", query.lower()).randint(1, 5000000), "name": query}],
+                "total_pages": 1, "total_results": 1}
+    if len(parts) == 3 and parts[0] == "person" and parts[2] == "movie_credits":
+        rng = _rng("credits", parts[1])
+        cast = [{**_movie(rng.randint(1, 900000)), "character": rng.choice(WORDS), "order": rng.randint(0, 20)}
+                for _ in range(40)]
+        return {"id": int(parts[1]), "cast": cast, "crew": []}
+    if parts in (["search", "movie"], ["discover", "movie"]):
+        return _page(f"{path}|{sorted(params.items())}", page)
+    if parts[0] == "trending" or parts in (["movie", "popular"], ["movie", "top_rated"]):
+        return _page(path, page)
+    if len(parts) == 2 and parts[0] == "movie" and parts[1].isdigit():
+        movie = _movie(int(parts[1]))
+        movie["runtime"] = _rng("runtime", parts[1]).randint(80, 180)
+        movie["genres"] = [{"id": g, "name": str(g)} for g in movie.pop("genre_ids")]
+        if "credits" in params.get("append_to_response", ""):
+            movie["credits"] = {"cast": [], "crew": []}
+        return movie
+    return None
+
+
+#  Server
+
+class FakeTMDB(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures: dict = None, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_share: float = 0.5, record: bool = False, seed: int = 0):
+        super().__init__(address, _Handler)
+        self.fixtures = fixtures or {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_share = rate_limit_share
+        self.record = record
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "fixture": 0, "synthetic": 0, "recorded": 0, "injected_errors": 0, "not_found": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/3"
+
+    def count(self, name: str):
+        with self.lock:
+            self.counters[name] += 1
+
+    def lookup(self, path: str, params: dict):
+        key = fixture_key(path, params)
+        body = self.fixtures.get(key, self.fixtures.get(path))
+        if body is not None:
+            self.count("fixture")
+            return body
+        if self.record:
+            body = self._fetch_upstream(path, params)
+            with self.lock:
+                self.fixtures[key] = body
+            self.count("recorded")
+            return body
+        body = synthetic(path, params)
+        if body is not None:
+            self.count("synthetic")
+        return body
+
+    def _fetch_upstream(self, path: str, params: dict):
+        query = urlencode({**params, "api_key": os.getenv("TMDB_API_KEY", "")})
+        with urlopen(f"{UPSTREAM}/{path}?{query}", timeout=10) as res:
+            return json.load(res)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeTMDB
+
+    def do_GET(self):
+        srv = self.server
+        srv.count("requests")
+        url = urlsplit(self.path)
+        path = url.path.strip("/")
+        if path.startswith("3/"):
+            path = path[2:]
+        params = dict(parse_qsl(url.query))
+
+        with srv.lock:
+            delay = max(0.0, srv.latency_ms + srv.rng.uniform(-srv.jitter_ms, srv.jitter_ms)) / 1000
+            fail = srv.rng.random() < srv.error_rate
+            rate_limited = fail and srv.rng.random() < srv.rate_limit_share
+        time.sleep(delay)
+
+        if fail:
+            srv.count("injected_errors")
+            if rate_limited:
+                return self._send(429, {"status_code": 25, "status_message": "Rate limit exceeded."}, {"Retry-After": "1"})
+            return self._send(500, {"status_code": 11, "status_message": "Internal error."})
+
+        body = srv.lookup(path, params)
+        if body is None:
+            srv.count("not_found")
+            return self._send(404, {"status_code": 34, "status_message": "The resource could not be found."})
+        self._send(200, body)
+
+    def _send(self, status: int, body, headers: dict = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def load_fixtures(path: str) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_fixtures(path: str, fixtures: dict):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(fixtures, f, indent=1, sort_keys=True)
+
+
+def start_fake_tmdb(port: int = 0, fixtures_path: str = DEFAULT_FIXTURES, **options) -> FakeTMDB:
+    """Start the stand-in on a daemon thread (port 0 = any free port); stop it with .shutdown()."""
+    server = FakeTMDB(("127.0.0.1", port), load_fixtures(fixtures_path), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local TMDB stand-in with latency and error injection")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES, help="Recorded responses (JSON: key -> body)")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 429/500")
+    parser.add_argument("--rate-limit-share", type=float, default=0.5, help="Share of injected errors that are 429s")
+    parser.add_argument("--record", action="store_true", help="Proxy misses to TMDB and save them as fixtures")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_fake_tmdb(args.port, args.fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                             error_rate=args.error_rate, rate_limit_share=args.rate_limit_share,
+                             record=args.record, seed=args.seed)
+    print(f"🎬 Fake TMDB on {server.url} ({len(server.fixtures)} fixtures, "
+          f"{args.latency_ms}±{args.jitter_ms} ms, error rate {args.error_rate})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(json.dumps(server.counters))
+        if args.record:
+            save_fixtures(args.fixtures, server.fixtures)
+            print(f"✅ {len(server.fixtures)} fixtures written to {args.fixtures}")
+
+
+if __name__ == "__main__":
+    main()
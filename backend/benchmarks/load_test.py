@@ -0,0 +1,175 @@
+# ===============================================================
+# MovieRazzi - Fixed-RPS load driver for the agent API
+# ===============================================================
+# Open-loop load: each endpoint gets requests on a fixed schedule (--rps per
+# endpoint) whether or not earlier ones have finished, and latency is measured
+# from the scheduled send time, so a slow server cannot hide its queueing.
+# Reports per-endpoint p50/p95/p99, throughput and error counts as JSON.
+# Usage (from backend/):
+#   # against a running server
+#   python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --rps 5 --duration 30
+#   # self-contained: fake TMDB (benchmarks/fake_tmdb.py) + a uvicorn worker pointed at it
+#   python benchmarks/load_test.py --spawn --tmdb-latency-ms 80 --tmdb-error-rate 0.02 --output load.json
+#   python benchmarks/load_test.py --spawn --output load.json --baseline load_prev.json --metric p95_ms
+# ===============================================================
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from collections import Counter
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+from benchmarks.report import latency_summary, write_results, compare  # noqa: E402
+from benchmarks.fake_tmdb import start_fake_tmdb  # noqa: E402
+from benchmarks.bench_micro import USER_TEXTS, FREE_TIME_TEXTS, make_movies  # noqa: E402
+
+ENDPOINTS = ["analyze", "retrieve", "schedule", "orchestrate"]
+PREFERENCES = [
+    {"input_text": USER_TEXTS[0], "detected_genres": ["sci-fi"], "entities": {"people": ["Leonardo DiCaprio"]}},
+    {"input_text": USER_TEXTS[1], "detected_genres": ["comedy"], "entities": {"people": []}},
+    {"input_text": USER_TEXTS[2], "detected_genres": ["thriller", "action"], "entities": {"people": ["Christian Bale"]}},
+    {"input_text": "", "detected_genres": [], "entities": {"people": []}},
+]
+
+
+def payload(endpoint: str, rng: random.Random) -> dict:
+    if endpoint == "analyze":
+        return {"user_input": rng.choice(USER_TEXTS)}
+    if endpoint == "retrieve":
+        return {"preferences": rng.choice(PREFERENCES)}
+    if endpoint == "schedule":
+        return {"movies": make_movies(12, rng.randrange(1000)), "schedule_text": rng.choice(FREE_TIME_TEXTS)}
+    return {"user_input": rng.choice(USER_TEXTS), "schedule_text": rng.choice(FREE_TIME_TEXTS)}
+
+
+#  Load generation
+
+async def drive(client: httpx.AsyncClient, endpoint: str, rps: float, duration: float, seed: int):
+    rng = random.Random(seed)
+    latencies, statuses = [], Counter()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def one(scheduled: float, body: dict):
+        try:
+            res = await client.post(f"/{endpoint}", json=body)
+            statuses[res.status_code] += 1
+            if res.status_code == 200:
+                latencies.append((loop.time() - scheduled) * 1000)
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+
+    tasks = []
+    for i in range(int(rps * duration)):
+        scheduled = start + i / rps
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        tasks.append(asyncio.ensure_future(one(scheduled, payload(endpoint, rng))))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+
+    ok = statuses.get(200, 0)
+    return {
+        **latency_summary(latencies),
+        "sent": len(tasks),
+        "ok": ok,
+        "errors": {str(k): v for k, v in statuses.items() if k != 200},
+        "error_rate": round(1 - ok / len(tasks), 4) if tasks else 0.0,
+        "target_rps": rps,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def run_load(base_url: str, endpoints: list, rps: float, duration: float, timeout: float, max_in_flight: int):
+    limits = httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        results = await asyncio.gather(*(drive(client, ep, rps, duration, seed=i) for i, ep in enumerate(endpoints)))
+        try:
+            stats = (await client.get("/stats")).json()
+        except (httpx.HTTPError, ValueError):
+            stats = None
+    return dict(zip(endpoints, results)), stats
+
+
+#  Self-contained mode: fake TMDB + uvicorn
+
+def spawn_server(port: int, tmdb_url: str, startup_timeout: float):
+    env = {**os.environ, "TMDB_BASE_URL": tmdb_url, "TMDB_API_KEY": os.getenv("TMDB_API_KEY") or "fake"}
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                            cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"uvicorn did not become live within {startup_timeout}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed-RPS load test for /analyze, /retrieve, /schedule, /orchestrate")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS))
+    parser.add_argument("--rps", type=float, default=2.0, help="Requests per second, per endpoint")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per endpoint")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--max-in-flight", type=int, default=200)
+    parser.add_argument("--spawn", action="store_true", help="Start a fake TMDB and a uvicorn worker for the run")
+    parser.add_argument("--port", type=int, default=8099, help="uvicorn port with --spawn")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--tmdb-latency-ms", type=float, default=50.0)
+    parser.add_argument("--tmdb-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--tmdb-error-rate", type=float, default=0.0)
+    parser.add_argument("--output", default=None, help="Write results as JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier --output file to compare against")
+    parser.add_argument("--metric", default="p95_ms")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    endpoints = [e.strip().strip("/") for e in args.endpoints.split(",") if e.strip()]
+    fake, proc, base_url = None, None, args.base_url
+    if args.spawn:
+        fake = start_fake_tmdb(latency_ms=args.tmdb_latency_ms, jitter_ms=args.tmdb_jitter_ms,
+                               error_rate=args.tmdb_error_rate)
+        print(f"🎬 Fake TMDB on {fake.url}")
+        proc, base_url = spawn_server(args.port, fake.url, args.startup_timeout)
+        print(f"🚀 API on {base_url}")
+
+    try:
+        print(f"Driving {', '.join(endpoints)} at {args.rps} rps each for {args.duration}s ...")
+        results, stats = asyncio.run(run_load(base_url, endpoints, args.rps, args.duration,
+                                              args.timeout, args.max_in_flight))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+        if fake:
+            fake.shutdown()
+
+    for ep, r in results.items():
+        if r.get("count"):
+            print(f"  /{ep:<12} p50 {r['p50_ms']:8.1f} ms  p95 {r['p95_ms']:8.1f} ms  p99 {r['p99_ms']:8.1f} ms  "
+                  f"{r['throughput_rps']:6.2f} rps  errors {r['error_rate']:.1%}")
+        else:
+            print(f"  /{ep:<12} no successful requests, errors {r['errors']}")
+
+    if args.output:
+        extra = {"tmdb_stub": fake.counters if fake else None, "server_stats": stats}
+        write_results(args.output, "load", {**results, "_run": {
+            "rps": args.rps, "duration_s": args.duration, "base_url": base_url, **extra}})
+    if args.baseline and compare(results, args.baseline, metric=args.metric, tolerance=args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
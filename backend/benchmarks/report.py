@@ -0,0 +1,68 @@
+# ===============================================================
+# MovieRazzi - Shared result helpers for bench_micro.py / load_test.py
+# ===============================================================
+# Latency summaries, JSON result files with run metadata, and comparison
+# against a baseline file to catch regressions between releases:
+#   python benchmarks/bench_micro.py --output micro.json --baseline micro_v1.json
+# ===============================================================
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+
+
+def latency_summary(samples_ms) -> dict:
+    a = np.asarray(samples_ms, dtype=np.float64)
+    if not len(a):
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(a, [50, 95, 99])
+    return {
+        "count": int(len(a)),
+        "mean_ms": round(float(a.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(a.max()), 3),
+    }
+
+
+def run_metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+
+
+def write_results(path: str, kind: str, results: dict):
+    with open(path, "w") as f:
+        json.dump({"kind": kind, "meta": run_metadata(), "results": results}, f, indent=2)
+    print(f"✅ Results written to {path}")
+
+
+def compare(results: dict, baseline_path: str, metric: str = "p50_ms", tolerance: float = 0.2) -> list:
+    """
+    Names whose `metric` grew by more than `tolerance` (fraction) over the
+    baseline file; benchmarks missing on either side are ignored.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressions = []
+    for name, cur in results.items():
+        old = baseline.get(name, {}).get(metric)
+        new = cur.get(metric) if isinstance(cur, dict) else None
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append({"name": name, "metric": metric, "baseline": old, "current": new,
+                                "change": round(new / old - 1, 3)})
+    for r in regressions:
+        print(f"  ⚠️ {r['name']}: {r['metric']} {r['baseline']} -> {r['current']} (+{r['change']:.0%})")
+    if not regressions:
+        print(f"✅ No {metric} regressions above {tolerance:.0%} vs {baseline_path}")
+    return regressions
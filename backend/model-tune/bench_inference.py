@@ -0,0 +1,134 @@
+# ===============================================================
+# MovieRazzi - Latency / memory benchmark: PyTorch vs ONNX Runtime
+# ===============================================================
+# Each mode runs in a fresh subprocess so RSS numbers are not polluted by the
+# other runtime. Usage (from backend/model-tune, after export_onnx.py):
+#   python bench_inference.py
+#   python bench_inference.py --genre-backend zero-shot --output bench.json
+# ===============================================================
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import numpy as np
+import pandas as pd
+import psutil
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ["torch", "onnx", "onnx-fp32"]
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / 1e6
+
+
+def time_calls(fn, texts, batch_size):
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        fn([text])
+        latencies.append((time.perf_counter() - start) * 1000)
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        fn(texts[i:i + batch_size])
+    batch_seconds = time.perf_counter() - start
+    return {
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+        "throughput_per_s": round(len(texts) / batch_seconds, 2),
+    }
+
+
+# ---------------------------------------------------------------
+# Worker: load one mode and measure it
+# ---------------------------------------------------------------
+def load_models(pa, mode: str, genre_backend: str):
+    """
+    Build the models for `mode` directly. The analyzer's loaders fall back to
+    PyTorch when ONNX is unavailable, which would put PyTorch timings under an
+    ONNX label, so ONNX load errors are raised here instead.
+    """
+    if mode == "torch":
+        return pa.load_sentiment_pipe(), pa.GENRE_BACKENDS[genre_backend]()
+
+    from agents.onnx_models import OnnxTextClassificationPipeline, OnnxZeroShotGenreClassifier, OnnxFineTunedGenreClassifier
+    quantized = mode != "onnx-fp32"
+    sentiment = OnnxTextClassificationPipeline(os.path.join(pa.ONNX_MODEL_DIR, "sentiment"), quantized)
+    cls = {"zero-shot": OnnxZeroShotGenreClassifier, "finetuned": OnnxFineTunedGenreClassifier}[genre_backend]
+    genre = cls(os.path.join(pa.ONNX_MODEL_DIR, f"genre-{genre_backend}"), pa.GENRES, quantized)
+    return sentiment, genre
+
+
+def run_worker(mode: str, genre_backend: str, texts: list, batch_size: int):
+    # configure before importing the analyzer, which reads these at import time
+    os.environ["INFERENCE_BACKEND"] = "torch" if mode == "torch" else "onnx"
+    os.environ["ONNX_QUANTIZED"] = "0" if mode == "onnx-fp32" else "1"
+    sys.path.insert(0, BACKEND_DIR)
+    from agents import preference_analyzer as pa
+
+    baseline = rss_mb()
+    start = time.perf_counter()
+    sentiment, genre = load_models(pa, mode, genre_backend)
+    load_seconds = time.perf_counter() - start
+    loaded = rss_mb()
+
+    sentiment(texts[:2])
+    genre.predict(texts[:2])
+    result = {
+        "mode": mode,
+        "genre_backend": genre_backend,
+        "loaded": {"sentiment": type(sentiment).__name__, "genre": type(genre).__name__},
+        "samples": len(texts),
+        "load_seconds": round(load_seconds, 2),
+        "rss_mb_baseline": round(baseline, 1),
+        "rss_mb_loaded": round(loaded, 1),
+        "sentiment": time_calls(lambda b: sentiment(b), texts, batch_size),
+        "genre": time_calls(genre.predict, texts, batch_size),
+    }
+    result["rss_mb_peak"] = round(rss_mb(), 1)
+    print(json.dumps(result))
+
+
+# ---------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analyzer inference on PyTorch vs ONNX Runtime")
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--genre-backend", default="finetuned", choices=["finetuned", "zero-shot"])
+    parser.add_argument("--data", default="genre_train.csv")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.data)["text"].tolist()[:args.samples]
+
+    if args.worker:
+        run_worker(args.worker, args.genre_backend, texts, args.batch_size)
+        return
+
+    results = []
+    for mode in args.modes:
+        print(f"🚀 Benchmarking {mode}...")
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", mode,
+               "--genre-backend", args.genre_backend, "--data", args.data,
+               "--samples", str(args.samples), "--batch-size", str(args.batch_size)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"⚠️ {mode} failed:\n{proc.stderr[-2000:]}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        print(json.dumps(results[-1], indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# ===============================================================
+# MovieRazzi - Compare genre classifier backends (accuracy + latency)
+# ===============================================================
+# Usage (from backend/model-tune):
+#   python compare_genre_backends.py                      # all backends, full CSV
+#   python compare_genre_backends.py --holdout            # only the 20% eval split used in training
+#   python compare_genre_backends.py --backends finetuned --model-dir ./genre_model
+# ===============================================================
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from sklearn.metrics import precision_recall_fscore_support
+from sklearn.preprocessing import MultiLabelBinarizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.preference_analyzer import GENRES, GENRE_BACKENDS, top_genres  # noqa: E402
+
+
+# ---------------------------------------------------------------
+# 1. Data
+# ---------------------------------------------------------------
+def load_dataset(path: str, holdout: bool):
+    df = pd.read_csv(path)
+    df["labels"] = df["labels"].apply(lambda x: [g.strip() for g in x.split(",")])
+    if holdout:
+        # Reproduce the exact split from train_genre_model.py
+        from datasets import Dataset
+        split = Dataset.from_dict({"text": df["text"].tolist(), "labels": df["labels"].tolist()})
+        split = split.train_test_split(test_size=0.2, seed=42)["test"]
+        return split["text"], split["labels"]
+    return df["text"].tolist(), df["labels"].tolist()
+
+
+# ---------------------------------------------------------------
+# 2. Evaluation
+# ---------------------------------------------------------------
+def evaluate(classifier, texts, labels, batch_size: int):
+    # Single-text latency (what one request pays without batching)
+    latencies = []
+    predictions = []
+    for text in texts:
+        start = time.perf_counter()
+        result = classifier.predict([text])[0]
+        latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(sorted(top_genres(result, classifier.threshold)))
+
+    # Batched throughput
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        classifier.predict(texts[i:i + batch_size])
+    batch_seconds = time.perf_counter() - start
+
+    mlb = MultiLabelBinarizer(classes=GENRES)
+    y_true = mlb.fit_transform(labels)
+    y_pred = mlb.transform(predictions)
+    p, r, f1, _ = precision_recall_fscore_support(y_true, y_pred, average="micro", zero_division=0)
+    exact = float(np.mean([set(a) == set(b) for a, b in zip(labels, predictions)]))
+
+    return {
+        "backend": classifier.name,
+        "samples": len(texts),
+        "precision": round(float(p), 4),
+        "recall": round(float(r), 4),
+        "f1": round(float(f1), 4),
+        "exact_match": round(exact, 4),
+        "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2),
+        "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2),
+        "batch_size": batch_size,
+        "throughput_per_s": round(len(texts) / batch_seconds, 2) if batch_seconds else None,
+    }
+
+
+# ---------------------------------------------------------------
+# 3. Main
+# ---------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Compare genre classifier backends on genre_train.csv")
+    parser.add_argument("--data", default="genre_train.csv")
+    parser.add_argument("--backends", nargs="+", default=list(GENRE_BACKENDS))
+    parser.add_argument("--model-dir", default=None, help="Fine-tuned model directory (default: GENRE_MODEL_DIR)")
+    parser.add_argument("--holdout", action="store_true", help="Evaluate on the training eval split only")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.data):
+        raise FileNotFoundError(f"❌ {args.data} not found!")
+    texts, labels = load_dataset(args.data, args.holdout)
+    print(f"📂 Loaded {len(texts)} samples from {args.data}")
+
+    results = []
+    for name in args.backends:
+        cls = GENRE_BACKENDS[name]
+        print(f"⚙️ Loading backend: {name}")
+        try:
+            classifier = cls(args.model_dir) if (name == "finetuned" and args.model_dir) else cls()
+        except Exception as e:
+            print(f"⚠️ Skipping {name}: {e}")
+            continue
+        classifier.predict(texts[:2])  # warm-up
+        results.append(evaluate(classifier, texts, labels, args.batch_size))
+        print(json.dumps(results[-1], indent=2))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
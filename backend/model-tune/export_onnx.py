@@ -0,0 +1,165 @@
+# ===============================================================
+# MovieRazzi - Export analyzer models to ONNX (+ dynamic int8 quantization)
+# ===============================================================
+# Usage (from backend/model-tune):
+#   python export_onnx.py                                   # sentiment + fine-tuned genre model
+#   python export_onnx.py --models sentiment genre-zero-shot
+#   python export_onnx.py --check                           # export, then parity check vs PyTorch
+#   python export_onnx.py --check-only                      # parity check existing exports
+#
+# Serve with INFERENCE_BACKEND=onnx (and ONNX_MODEL_DIR if --out-dir was changed).
+# ===============================================================
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.preference_analyzer import (  # noqa: E402
+    GENRES, GENRE_BACKENDS, top_genres, _sentiment_from_result,
+)
+from agents.onnx_models import (  # noqa: E402
+    OnnxTextClassificationPipeline, OnnxFineTunedGenreClassifier, OnnxZeroShotGenreClassifier,
+)
+
+# ---------------------------------------------------------------
+# Export targets: output sub-directory -> source model
+# ---------------------------------------------------------------
+MODELS = {
+    "sentiment": "distilbert-base-uncased-finetuned-sst-2-english",
+    "genre-finetuned": "./genre_model",
+    "genre-zero-shot": "facebook/bart-large-mnli",
+}
+
+
+class LogitsOnly(torch.nn.Module):
+    """Wrap a HF model so the exported graph has plain (input_ids, attention_mask) -> logits."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+
+# ---------------------------------------------------------------
+# 1. Export + quantize
+# ---------------------------------------------------------------
+def export(name: str, source: str, out_dir: str, opset: int):
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    target = os.path.join(out_dir, name)
+    os.makedirs(target, exist_ok=True)
+    print(f"⚙️ Exporting {source} -> {target}")
+
+    tokenizer = AutoTokenizer.from_pretrained(source)
+    model = AutoModelForSequenceClassification.from_pretrained(source).eval()
+    sample = tokenizer(["a sample sentence", "a longer sample sentence for export"],
+                       padding=True, return_tensors="pt")
+
+    fp32_path = os.path.join(target, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            LogitsOnly(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=opset,
+        )
+
+    int8_path = os.path.join(target, "model.int8.onnx")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(target)
+    model.config.save_pretrained(target)
+    for path in (fp32_path, int8_path):
+        print(f"   {os.path.basename(path)}: {os.path.getsize(path) / 1e6:.1f} MB")
+
+
+# ---------------------------------------------------------------
+# 2. Parity check (ONNX vs PyTorch)
+# ---------------------------------------------------------------
+def predict_chunked(classifier, texts: list, size: int = 16):
+    out = []
+    for i in range(0, len(texts), size):
+        out.extend(classifier.predict(texts[i:i + size]))
+    return out
+
+
+def parity(name: str, out_dir: str, texts: list, quantized: bool):
+    target = os.path.join(out_dir, name)
+    if name == "sentiment":
+        ref = pipeline("sentiment-analysis", model=MODELS["sentiment"], device=-1)
+        onnx = OnnxTextClassificationPipeline(target, quantized)
+        ref_out = [_sentiment_from_result(r) for r in ref(texts)]
+        onnx_out = [_sentiment_from_result(r) for r in onnx(texts)]
+        same = [a["sentiment"] == b["sentiment"] for a, b in zip(ref_out, onnx_out)]
+        diffs = [abs(a["score"] - b["score"]) for a, b in zip(ref_out, onnx_out)]
+    else:
+        backend = name.split("-", 1)[1]
+        ref = GENRE_BACKENDS[backend]() if backend != "finetuned" else GENRE_BACKENDS[backend](MODELS[name])
+        onnx_cls = OnnxFineTunedGenreClassifier if backend == "finetuned" else OnnxZeroShotGenreClassifier
+        onnx = onnx_cls(target, GENRES, quantized)
+        ref_out, onnx_out = predict_chunked(ref, texts), predict_chunked(onnx, texts)
+        same = [top_genres(a, ref.threshold) == top_genres(b, onnx.threshold)
+                for a, b in zip(ref_out, onnx_out)]
+        diffs = []
+        for a, b in zip(ref_out, onnx_out):
+            sa, sb = dict(zip(a["labels"], a["scores"])), dict(zip(b["labels"], b["scores"]))
+            diffs.extend(abs(sa[g] - sb[g]) for g in GENRES)
+
+    return {
+        "model": name,
+        "quantized": quantized,
+        "samples": len(texts),
+        "label_agreement": round(float(np.mean(same)), 4),
+        "score_abs_diff_mean": round(float(np.mean(diffs)), 5),
+        "score_abs_diff_max": round(float(np.max(diffs)), 5),
+    }
+
+
+# ---------------------------------------------------------------
+# 3. Main
+# ---------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Export analyzer models to ONNX and check parity")
+    parser.add_argument("--models", nargs="+", default=["sentiment", "genre-finetuned"], choices=list(MODELS))
+    parser.add_argument("--out-dir", default="./onnx")
+    parser.add_argument("--opset", type=int, default=17)
+    parser.add_argument("--check", action="store_true", help="Run the parity check after exporting")
+    parser.add_argument("--check-only", action="store_true", help="Only run the parity check")
+    parser.add_argument("--fp32", action="store_true", help="Check the fp32 export instead of int8")
+    parser.add_argument("--data", default="genre_train.csv", help="Texts used for the parity check")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    if not args.check_only:
+        for name in args.models:
+            export(name, MODELS[name], args.out_dir, args.opset)
+        print("\n✅ Export completed!")
+
+    if args.check or args.check_only:
+        texts = pd.read_csv(args.data)["text"].tolist()
+        failed = False
+        for name in args.models:
+            report = parity(name, args.out_dir, texts, quantized=not args.fp32)
+            print(json.dumps(report, indent=2))
+            if report["label_agreement"] < args.min_agreement:
+                print(f"❌ {name}: label agreement below {args.min_agreement}")
+                failed = True
+        sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,90 @@
 # app/routes/agent_routes.py
+import json
 from fastapi import APIRouter, HTTPException
-from agents.preference_analyzer import analyze_preferences
-from agents.ir_agent import retrieve_movies
-from agents.orchestrator_agent import orchestrate_user_request
-from agents.shedule_creator_agent import create_schedule
+from fastapi.responses import StreamingResponse
+from agents.preference_analyzer import analyze_preferences_async, model_batcher, analysis_cache, analysis_flight
+from agents.ir_agent import retrieve_movies_async, retrieval_stats
+from agents.popular_pool import pool_stats
+from agents.orchestrator_agent import orchestrate_user_request_async, orchestrate_user_request_stream
+from agents.shedule_creator_agent import create_schedule_async
+from agents.inference import InferenceOverloaded, inference_stats
+from agents.tmdb_client import tmdb
 from schemas.agent_schema import AnalyzeRequest, RetrieveRequest, OrchestrateRequest, ScheduleRequest
 
 router = APIRouter()
 
+
+def overloaded(e: InferenceOverloaded):
+    return HTTPException(status_code=503, detail=f"Analyzer busy: {str(e)}", headers={"Retry-After": "1"})
+
 @router.post("/analyze")
-def analyze_agent(data: AnalyzeRequest):
+async def analyze_agent(data: AnalyzeRequest):
     try:
-        return analyze_preferences(data.user_input)
+        return await analyze_preferences_async(data.user_input, data.profile)
+    except InferenceOverloaded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Analyzer failed: {str(e)}")
 
 @router.post("/retrieve")
-def retrieve_agent(data: RetrieveRequest):
+async def retrieve_agent(data: RetrieveRequest):
     try:
-        return retrieve_movies(data.preferences)
+        return await retrieve_movies_async(data.preferences)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Retriever failed: {str(e)}")
 
 @router.post("/orchestrate")
-def orchestrator_route(data: OrchestrateRequest):
+async def orchestrator_route(data: OrchestrateRequest):
     try:
-        return orchestrate_user_request(data.user_input, data.schedule_text)
+        return await orchestrate_user_request_async(data.user_input, data.schedule_text, data.profile)
+    except InferenceOverloaded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Orchestrator failed: {str(e)}")
 
+@router.post("/orchestrate/stream")
+async def orchestrator_stream_route(data: OrchestrateRequest):
+    """
+    NDJSON variant of /orchestrate: one JSON event per line - the analysis,
+    then each movie as soon as it is resolved, then the schedule.
+    """
+    events = orchestrate_user_request_stream(data.user_input, data.schedule_text, data.profile)
+    try:
+        first = await events.__anext__()
+    except InferenceOverloaded as e:
+        raise overloaded(e)
+    except StopAsyncIteration:
+        first = None
+
+    async def body():
+        if first is not None:
+            yield json.dumps(first) + "\n"
+        async for event in events:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @router.post("/schedule")
-def schedule_agent(data: ScheduleRequest):
+async def schedule_agent(data: ScheduleRequest):
     """
     Schedule creator agent route.
-    Expects: { movies: [...], schedule_text: "I am free for 2 hours on Monday..." }
+    Expects: { movies: [...], schedule_text: "I am free for 2 hours on Monday...", strategy?: "optimal" | "greedy" }
     """
     try:
-        return create_schedule(data.movies, data.schedule_text)
+        return await create_schedule_async(data.movies, data.schedule_text, data.strategy)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Schedule creation failed: {str(e)}")
+
+@router.get("/stats")
+def agent_stats():
+    """TMDB client pool/cache/coalescing statistics, analyzer batching/cache/coalescing/inference statistics, TMDB calls per retrieval and the popular pool snapshot."""
+    return {
+        "tmdb": tmdb.stats(),
+        "analyzer_batching": model_batcher.stats() if model_batcher else None,
+        "analysis_cache": analysis_cache.stats(),
+        "analysis_coalescing": analysis_flight.stats(),
+        "inference": inference_stats(),
+        "retrieval": retrieval_stats(),
+        "popular_pool": pool_stats(),
+    }
@@ -1,11 +1,14 @@
 
 from pydantic import BaseModel, Field, constr
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 
 NonEmptyStr = constr(strip_whitespace=True, min_length=1)
 
+AnalysisProfile = Literal["fast", "standard", "full"]
+
 class AnalyzeRequest(BaseModel):
     user_input: NonEmptyStr = Field(..., description="User's natural language input about movies.")
+    profile: Optional[AnalysisProfile] = Field(None, description="Analysis stages to run (default: ANALYSIS_PROFILE).")
 
 class RetrieveRequest(BaseModel):
     preferences: Dict[str, Any] = Field(..., description="Preference data generated by the analyzer.")
@@ -13,7 +16,9 @@ class RetrieveRequest(BaseModel):
 class OrchestrateRequest(BaseModel):
     user_input: NonEmptyStr
     schedule_text: Optional[str] = Field(None, description="User's schedule or availability text.")
+    profile: Optional[AnalysisProfile] = Field(None, description="Analysis stages to run (default: ORCHESTRATE_PROFILE, else ANALYSIS_PROFILE).")
 
 class ScheduleRequest(BaseModel):
     movies: List[Dict[str, Any]] = Field(..., description="List of movie data dictionaries.")
     schedule_text: NonEmptyStr
+    strategy: Optional[Literal["optimal", "greedy"]] = Field(None, description="Slot packing strategy (default: SCHEDULE_STRATEGY).")
@@ -0,0 +1,67 @@
+# ===============================================================
+# MovieRazzi - Free-time parser: hand-written phrasings
+# ===============================================================
+# Fixed phrasings with exact expected slots, written independently of the
+# benchmark's templates. Usage (from backend/):
+#   python -m pytest tests/test_free_time_parser.py -q
+# ===============================================================
+from datetime import datetime
+import pytest
+
+from agents.free_time_parser import parse_free_time
+from agents.shedule_creator_agent import parse_user_free_time
+
+NOW = datetime(2026, 10, 14, 12, 0)  # a Wednesday, for relative days
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+# text -> [(day, available_minutes, start_time, end_time), ...]
+CASES = [
+    # day + window
+    ("Sat 7–10pm", [("Saturday", 180, "19:00", "22:00")]),
+    ("Sat 7-10pm, Sun 2-5pm", [("Saturday", 180, "19:00", "22:00"), ("Sunday", 180, "14:00", "17:00")]),
+    ("mon-thu from 19:30 to 22:00",
+     [(d, 150, "19:30", "22:00") for d in ["Monday", "Tuesday", "Wednesday", "Thursday"]]),
+    ("weekdays 8-11pm", [(d, 180, "20:00", "23:00") for d in WEEKDAYS]),
+    # day groups
+    ("weekends", [("Saturday", 120, "18:00", "20:00"), ("Sunday", 120, "18:00", "20:00")]),
+    ("weekends after 8 for a couple of hours",
+     [("Saturday", 120, "20:00", "22:00"), ("Sunday", 120, "20:00", "22:00")]),
+    # windows past midnight
+    ("friday 10pm to 1am", [("Friday", 180, "22:00", "01:00")]),
+    ("sat 11pm-2am", [("Saturday", 180, "23:00", "02:00")]),
+    ("saturday from 22:30 until 01:00", [("Saturday", 150, "22:30", "01:00")]),
+    ("tonight until midnight", [("Wednesday", 360, "18:00", "00:00")]),
+    # durations
+    ("I am free for 3 hours on monday and 4 hours on friday after 6pm",
+     [("Monday", 180, "18:00", "21:00"), ("Friday", 240, "18:00", "22:00")]),
+    ("2.5 hours on wednesday", [("Wednesday", 150, "18:00", "20:30")]),
+    ("an hour and a half on thursday", [("Thursday", 90, "18:00", "19:30")]),
+    ("90 minutes on sunday", [("Sunday", 90, "18:00", "19:30")]),
+    ("1h45 on tuesday", [("Tuesday", 105, "18:00", "19:45")]),
+    ("half an hour on monday", [("Monday", 30, "18:00", "18:30")]),
+    ("sunday afternoon 2 hours", [("Sunday", 120, "13:00", "15:00")]),
+    # relative days
+    ("tomorrow 2 hours", [("Thursday", 120, "18:00", "20:00")]),
+]
+
+
+def slots(parsed):
+    return [(s["day"], s["available_minutes"], s["start_time"], s["end_time"]) for s in parsed]
+
+
+@pytest.mark.parametrize("text,expected", CASES, ids=[t for t, _ in CASES])
+def test_parse_free_time(text, expected):
+    assert slots(parse_free_time(text, now=NOW)) == expected
+
+
+def test_no_time_information():
+    assert parse_free_time("nothing here", now=NOW) == []
+
+
+def test_parse_user_free_time_falls_back_to_friday_evening():
+    assert slots(parse_user_free_time("nothing here")) == [("Friday", 120, "18:00", "20:00")]
+
+
+def test_parse_user_free_time_keeps_longest_slot_per_day():
+    parsed = parse_user_free_time("monday 1 hour, monday 3 hours", now=NOW)
+    assert [(s["day"], s["available_minutes"]) for s in parsed] == [("Monday", 180)]